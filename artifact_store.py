@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Content-addressed Artifact Store for test screenshots, traces and videos
+Deduplicates blobs by SHA-256, records a per-run manifest of test -> artifacts and evicts least-recently-used blobs
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+
+
+DEFAULT_ARTIFACT_DIR = "artifacts"
+DEFAULT_MAX_MB = 500
+
+# Text-like and trace artifacts compress well; images and videos are already compressed
+COMPRESSED_KINDS = {"trace", "har", "log", "json", "html"}
+
+
+def new_run_id() -> str:
+    """Sortable, collision-free id for one test run"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+class ArtifactStore:
+    """Blobs under objects/<sha[:2]>/<sha>.<ext>[.gz] plus runs/<run_id>/manifest.jsonl
+
+    Every write goes to a unique temporary file and is renamed into place, and manifest
+    records are single O_APPEND writes, so any number of processes can share one store.
+    """
+
+    def __init__(self, root: str = DEFAULT_ARTIFACT_DIR, run_id: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.root = root
+        self.run_id = run_id or new_run_id()
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls) -> "ArtifactStore":
+        """Store configured by ARTIFACT_DIR / ARTIFACT_RUN_ID / ARTIFACT_MAX_MB"""
+        return cls(
+            os.environ.get("ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR),
+            run_id=os.environ.get("ARTIFACT_RUN_ID"),
+            max_bytes=int(float(os.environ.get("ARTIFACT_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+        )
+
+    def object_path(self, digest: str, ext: str, compressed: bool) -> str:
+        """Relative path of a blob"""
+        name = f"{digest}.{ext}" + (".gz" if compressed else "")
+        return os.path.join("objects", digest[:2], name)
+
+    def manifest_path(self, run_id: Optional[str] = None) -> str:
+        """Absolute path of a run's manifest"""
+        return os.path.join(self.root, "runs", run_id or self.run_id, "manifest.jsonl")
+
+    def put(self, data: bytes, kind: str, test: str, name: str, ext: Optional[str] = None,
+            compress: Optional[bool] = None) -> Dict:
+        """Store a blob (once per distinct content) and record it against a test in this run's manifest"""
+        ext = ext or {"screenshot": "png", "video": "webm", "trace": "zip"}.get(kind, "bin")
+        compress = kind in COMPRESSED_KINDS if compress is None else compress
+        digest = hashlib.sha256(data).hexdigest()
+        relative = self.object_path(digest, ext, compress)
+        path = os.path.join(self.root, relative)
+
+        deduplicated = False
+        if os.path.exists(path):
+            try:
+                # Already stored: mark it recently used so eviction keeps it
+                os.utime(path)
+                stored_size = os.path.getsize(path)
+                deduplicated = True
+            except FileNotFoundError:
+                # Another run evicted it since the check, so it is written again below
+                pass
+        if not deduplicated:
+            payload = gzip.compress(data, compresslevel=6) if compress else data
+            write_atomic(path, payload)
+            stored_size = len(payload)
+
+        record = {
+            "test": test,
+            "name": name,
+            "kind": kind,
+            "sha256": digest,
+            "size": len(data),
+            "stored_size": stored_size,
+            "path": relative,
+            "deduplicated": deduplicated,
+            "time": time.time(),
+        }
+        self._append_manifest(record)
+        return record
+
+    def put_file(self, source: str, kind: str, test: str, name: Optional[str] = None,
+                 remove: bool = True) -> Dict:
+        """Store a file produced by the browser (trace zip, video) and optionally delete the original"""
+        with open(source, "rb") as f:
+            data = f.read()
+        ext = os.path.splitext(source)[1].lstrip(".") or None
+        record = self.put(data, kind, test, name or os.path.basename(source), ext=ext)
+        if remove:
+            os.remove(source)
+        return record
+
+    def read(self, record: Dict) -> bytes:
+        """Original bytes of a stored artifact"""
+        path = os.path.join(self.root, record["path"])
+        with open(path, "rb") as f:
+            data = f.read()
+        return gzip.decompress(data) if path.endswith(".gz") else data
+
+    def export(self, record: Dict, destination: str) -> str:
+        """Write an artifact back out as a normal file (e.g. to open a trace in the viewer)"""
+        write_atomic(destination, self.read(record))
+        return destination
+
+    def _append_manifest(self, record: Dict):
+        path = self.manifest_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        line = (json.dumps(record, sort_keys=True) + "\n").encode()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def manifest(self, run_id: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """test -> artifact records for a run"""
+        path = self.manifest_path(run_id)
+        grouped: Dict[str, List[Dict]] = {}
+        if not os.path.exists(path):
+            return grouped
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    grouped.setdefault(record["test"], []).append(record)
+        return grouped
+
+    def runs(self) -> List[str]:
+        """Run ids with a manifest, oldest first"""
+        runs_dir = os.path.join(self.root, "runs")
+        if not os.path.isdir(runs_dir):
+            return []
+        return sorted(name for name in os.listdir(runs_dir) if os.path.exists(self.manifest_path(name)))
+
+    def usage(self) -> Dict:
+        """Blob count and bytes on disk"""
+        blobs = self._blobs()
+        return {"objects": len(blobs), "bytes": sum(size for _, _, size in blobs)}
+
+    def _blobs(self) -> List[tuple]:
+        """(last used, path, size) for every stored blob"""
+        blobs = []
+        objects_dir = os.path.join(self.root, "objects")
+        for directory, _, files in os.walk(objects_dir):
+            for name in files:
+                if ".tmp-" in name:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, path, stat.st_size))
+        return blobs
+
+    def evict(self, max_bytes: Optional[int] = None, keep_runs: int = 50) -> Dict:
+        """Delete least-recently-used blobs until the store fits max_bytes; this run's blobs are kept"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        lock = os.path.join(self.root, ".evict.lock")
+        os.makedirs(self.root, exist_ok=True)
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # Another process is evicting; a lock older than ten minutes is from a crashed one
+            try:
+                if time.time() - os.path.getmtime(lock) < 600:
+                    return {"removed": 0, "freed": 0, "skipped": True}
+                os.remove(lock)
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except (FileExistsError, FileNotFoundError):
+                # Another process took the stale lock over (or released it) first; it does the evicting
+                return {"removed": 0, "freed": 0, "skipped": True}
+        os.close(fd)
+
+        removed = freed = 0
+        try:
+            in_use = {
+                os.path.normpath(os.path.join(self.root, record["path"]))
+                for records in self.manifest().values() for record in records
+            }
+            blobs = sorted(self._blobs())
+            total = sum(size for _, _, size in blobs)
+            for _, path, size in blobs:
+                if total <= max_bytes:
+                    break
+                if os.path.normpath(path) in in_use:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                total -= size
+                removed += 1
+                freed += size
+
+            for old_run in self.runs()[:-keep_runs] if keep_runs else []:
+                shutil.rmtree(os.path.join(self.root, "runs", old_run), ignore_errors=True)
+        finally:
+            os.remove(lock)
+        return {"removed": removed, "freed": freed, "skipped": False}
+
+    def format_report(self) -> str:
+        """One-line summary of this run's artifacts (empty when nothing was stored)"""
+        records = [record for records in self.manifest().values() for record in records]
+        if not records:
+            return ""
+        deduplicated = sum(1 for record in records if record["deduplicated"])
+        stored = sum(record["stored_size"] for record in records if not record["deduplicated"])
+        return (f"🗄️  Artifacts: {len(records)} from {len({record['test'] for record in records})} tests "
+                f"({deduplicated} deduplicated, {stored / 1024:.0f} KB written) → {self.manifest_path()}")
+
+
+def write_atomic(path: str, data: bytes):
+    """Write via a uniquely named temporary file so concurrent writers never collide"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the test artifact store")
+    parser.add_argument("--dir", default=DEFAULT_ARTIFACT_DIR, help="Artifact store root")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("runs", help="List runs with stored artifacts")
+    show_parser = commands.add_parser("show", help="List a run's artifacts per test")
+    show_parser.add_argument("run_id", nargs="?", help="Run id (default: latest)")
+    export_parser = commands.add_parser("export", help="Copy a run's artifacts out as normal files")
+    export_parser.add_argument("run_id")
+    export_parser.add_argument("destination")
+    evict_parser = commands.add_parser("evict", help="Shrink the store to a size cap")
+    evict_parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB)
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.dir)
+    if args.command == "runs":
+        for run_id in store.runs():
+            manifest = store.manifest(run_id)
+            print(f"{run_id}  {sum(len(records) for records in manifest.values())} artifacts, {len(manifest)} tests")
+        usage = store.usage()
+        print(f"💾 {usage['objects']} blobs, {usage['bytes'] / 1024 / 1024:.1f} MB")
+    elif args.command == "show":
+        run_id = args.run_id or (store.runs() or [None])[-1]
+        if run_id is None:
+            print("No runs recorded")
+            return 1
+        for test, records in store.manifest(run_id).items():
+            print(f"🧪 {test}")
+            for record in records:
+                print(f"   {record['kind']:<10} {record['name']:<30} {record['size'] / 1024:>8.1f} KB  {record['path']}")
+    elif args.command == "export":
+        for test, records in store.manifest(args.run_id).items():
+            for record in records:
+                extension = os.path.basename(record["path"]).split(".")[1]
+                filename = f"{record['name']}-{record['sha256'][:8]}.{extension}"
+                target = os.path.join(args.destination, *test.split("/"), filename)
+                store.export(record, target)
+                print(f"📤 {target}")
+    else:
+        result = store.evict(int(args.max_mb * 1024 * 1024), keep_runs=0)
+        print(f"🧹 Removed {result['removed']} blobs, freed {result['freed'] / 1024 / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
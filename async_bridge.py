@@ -0,0 +1,139 @@
+"""
+Blocking Bridge over async Playwright
+Gives sync test code a blocking view of async Playwright objects owned by an event loop in another thread
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+
+from playwright.async_api import expect as async_expect
+from playwright.sync_api import expect as sync_expect
+
+
+# Methods whose callback argument (by position) may call back into Playwright, e.g. route.abort().
+# Those run on a worker thread and are awaited; every other callback runs on the loop and may only read properties.
+THREADED_CALLBACKS = {"route": 1, "unroute": 1}
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class BlockingBridge:
+    """Runs awaitables on the loop that owns the async Playwright objects, on behalf of other threads"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.loop_thread = threading.get_ident()
+        self._lock = threading.Lock()
+
+    def call(self, awaitable):
+        """Wait for an awaitable on the loop and return its result"""
+        if threading.get_ident() == self.loop_thread:
+            # The loop would wait on itself; event handlers run here, so they may only read properties
+            raise RuntimeError("A bridged Playwright call can't block the event loop it runs on")
+        return asyncio.run_coroutine_threadsafe(_await(awaitable), self.loop).result()
+
+    def wrap(self, value):
+        """Blocking view of an async Playwright object (the same view every time), other values as they are"""
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        if not type(value).__module__.startswith("playwright."):
+            return value
+        with self._lock:
+            view = getattr(value, "_blocking_view", None)
+            if view is None:
+                view = Blocking(value, self)
+                value._blocking_view = view
+        return view
+
+    def unwrap(self, value):
+        """The async objects behind blocking views, for passing back into Playwright"""
+        if isinstance(value, Blocking):
+            return value._target
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.unwrap(item) for item in value)
+        if isinstance(value, dict):
+            return {key: self.unwrap(item) for key, item in value.items()}
+        return value
+
+    def callback(self, function, threaded: bool = False):
+        """Callback Playwright can call on the loop; the same one per function, so remove_listener() matches"""
+        key = "_bridged_threaded" if threaded else "_bridged"
+        if inspect.ismethod(function):
+            owner, name = function.__self__, f"{key}_{function.__name__}"
+        else:
+            owner, name = function, key
+        wrapper = getattr(owner, name, None)
+        if wrapper is not None:
+            return wrapper
+
+        # functools.wraps keeps the signature, which Playwright reads to decide how many arguments to pass
+        if threaded:
+            @functools.wraps(function)
+            def wrapper(*args):
+                return self.loop.run_in_executor(None, lambda: function(*[self.wrap(arg) for arg in args]))
+        else:
+            @functools.wraps(function)
+            def wrapper(*args):
+                return function(*[self.wrap(arg) for arg in args])
+        setattr(owner, name, wrapper)
+        return wrapper
+
+
+class Blocking:
+    """Sync view of one async Playwright object: what its methods and properties await is waited for"""
+
+    def __init__(self, target, bridge: BlockingBridge):
+        self._target = target
+        self._bridge = bridge
+
+    def __getattr__(self, name):
+        if name in ("_target", "_bridge"):
+            raise AttributeError(name)
+        value = getattr(self._target, name)
+        if inspect.ismethod(value):
+            return self._method(name, value)
+        if inspect.isawaitable(value):
+            # Async properties, such as the value of expect_popup()
+            value = self._bridge.call(value)
+        return self._bridge.wrap(value)
+
+    def _method(self, name: str, method):
+        bridge = self._bridge
+        threaded_position = THREADED_CALLBACKS.get(name)
+
+        def call(*args, **kwargs):
+            args = [
+                bridge.callback(arg, threaded=position == threaded_position) if callable(arg) else bridge.unwrap(arg)
+                for position, arg in enumerate(args)
+            ]
+            kwargs = {
+                key: bridge.callback(arg, threaded=key == "handler" and threaded_position is not None)
+                if callable(arg) else bridge.unwrap(arg)
+                for key, arg in kwargs.items()
+            }
+            result = method(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = bridge.call(result)
+            return bridge.wrap(result)
+
+        return call
+
+    def __enter__(self):
+        return self._bridge.wrap(self._bridge.call(self._target.__aenter__()))
+
+    def __exit__(self, *exc_info):
+        return self._bridge.call(self._target.__aexit__(*exc_info))
+
+    def __repr__(self):
+        return f"Blocking({self._target!r})"
+
+
+def expect(actual, message=None):
+    """Playwright's expect for sync objects and blocking views alike"""
+    if isinstance(actual, Blocking):
+        return actual._bridge.wrap(async_expect(actual._target, message))
+    return sync_expect(actual, message)
@@ -0,0 +1,89 @@
+"""
+Async Test Runner for FriendFilter.com
+Runs the suite's test methods concurrently from one event loop, sharing a single browser per engine
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+import test_friendfilter_comprehensive as suite
+from async_bridge import BlockingBridge
+
+
+class AsyncBrowserHub:
+    """Shares one browser per engine and caps how many contexts are open at once"""
+
+    SUPPORTED_ENGINES = ("chromium", "firefox", "webkit")
+
+    def __init__(self, playwright, concurrency: int = 8, headless: bool = False):
+        self.playwright = playwright
+        self.headless = headless
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bridge = BlockingBridge(asyncio.get_running_loop())
+        self._browsers = {}
+        self._launch_locks = {engine: asyncio.Lock() for engine in self.SUPPORTED_ENGINES}
+
+    async def get_browser(self, browser_type: str = "chromium"):
+        """Return the shared browser for an engine, launching it once"""
+        if browser_type not in self.SUPPORTED_ENGINES:
+            raise ValueError(f"Unsupported browser type: {browser_type}")
+        async with self._launch_locks[browser_type]:
+            browser = self._browsers.get(browser_type)
+            if browser is None or not browser.is_connected():
+                engine = getattr(self.playwright, browser_type)
+                browser = await engine.launch(headless=self.headless)
+                self._browsers[browser_type] = browser
+            return browser
+
+    def browser(self, browser_type: str = "chromium"):
+        """The shared browser as a blocking view, for a test running on a worker thread"""
+        return self.bridge.wrap(self.bridge.call(self.get_browser(browser_type)))
+
+    async def close(self):
+        """Close every shared browser"""
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers = {}
+
+
+async def _run_concurrent(tests: List[str], concurrency: int, max_failures: Optional[int]) -> Dict[str, Dict]:
+    loop = asyncio.get_running_loop()
+    finished = {}
+    failures = 0
+
+    async with async_playwright() as p:
+        hub = AsyncBrowserHub(p, concurrency=concurrency, headless=suite.FriendFilterTestSuite.headless)
+        # Test bodies are the sync suite's own; each runs on a thread and drives the hub's browser through the bridge
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="async-test")
+
+        async def run_one(test: str):
+            nonlocal failures
+            class_name, method_name = test.split(".")
+            # The semaphore wakes waiters in order, so tests start in the order given
+            async with hub.semaphore:
+                if max_failures and failures >= max_failures:
+                    return
+                test_instance = getattr(suite, class_name)()
+                test_instance.hub = hub
+                result = await loop.run_in_executor(executor, suite.run_test_with_retries, test_instance, method_name)
+            finished[test] = result
+            failures += result["status"] == "FAILED"
+
+        try:
+            await asyncio.gather(*(run_one(test) for test in tests))
+        finally:
+            executor.shutdown(wait=False)
+            await hub.close()
+    return finished
+
+
+def run_concurrent(tests: List[str], concurrency: int = 8, max_failures: Optional[int] = None) -> Dict[str, Dict]:
+    """Run ClassName.test_method ids with up to concurrency contexts open in one browser per engine"""
+    print(f"\n⚡ Running {len(tests)} tests with up to {concurrency} concurrent contexts...")
+    return asyncio.run(_run_concurrent(tests, concurrency, max_failures))
@@ -0,0 +1,126 @@
+"""
+Shared Browser Pool for FriendFilter.com tests
+Launches each browser engine once per run and hands every test a fresh context
+"""
+
+import time
+from typing import Dict, Optional
+
+from playwright.sync_api import sync_playwright
+
+
+class BrowserPool:
+    """Keeps one running browser per engine and recycles it after max_uses tests"""
+
+    SUPPORTED_ENGINES = ("chromium", "firefox", "webkit")
+
+    def __init__(self, max_uses: int = 50, launch_options: Optional[Dict] = None):
+        self.max_uses = max_uses
+        self.launch_options = launch_options or {}
+        self.playwright = None
+        self._browsers = {}
+        self._uses = {}
+        self._acquired_at = {}
+
+        # Timing and lifecycle counters for the pool report
+        self.launch_count = 0
+        self.launch_time = 0.0
+        self.test_count = 0
+        self.test_time = 0.0
+        self.recycle_count = 0
+        self.crash_count = 0
+
+    def acquire(self, browser_type: str = "chromium", headless: bool = False):
+        """Return a running browser for the engine, launching it if needed"""
+        if browser_type not in self.SUPPORTED_ENGINES:
+            raise ValueError(f"Unsupported browser type: {browser_type}")
+
+        key = (browser_type, headless)
+        browser = self._browsers.get(key)
+        if browser is not None and not browser.is_connected():
+            self.crash_count += 1
+            self._discard(key)
+            browser = None
+
+        if browser is None:
+            browser = self._launch(browser_type, headless)
+            self._browsers[key] = browser
+            self._uses[key] = 0
+
+        self._uses[key] += 1
+        self._acquired_at[key] = time.perf_counter()
+        return browser
+
+    def release(self, browser_type: str = "chromium", headless: bool = False, crashed: bool = False):
+        """Hand a browser back after a test, recycling it when worn out or broken"""
+        key = (browser_type, headless)
+        browser = self._browsers.get(key)
+        if browser is None:
+            return
+
+        acquired_at = self._acquired_at.pop(key, None)
+        if acquired_at is not None:
+            self.test_count += 1
+            self.test_time += time.perf_counter() - acquired_at
+
+        if crashed or not browser.is_connected():
+            self.crash_count += 1
+            self._discard(key)
+        elif self._uses[key] >= self.max_uses:
+            self.recycle_count += 1
+            self._discard(key)
+
+    def close(self):
+        """Close every pooled browser and stop the Playwright driver"""
+        for key in list(self._browsers):
+            self._discard(key)
+        if self.playwright:
+            self.playwright.stop()
+            self.playwright = None
+
+    def stats(self) -> Dict:
+        """Summarise launch cost against time spent inside tests"""
+        average_launch = self.launch_time / self.launch_count if self.launch_count else 0.0
+        avoided_launches = max(self.test_count - self.launch_count, 0)
+        return {
+            "launches": self.launch_count,
+            "launch_time": round(self.launch_time, 3),
+            "tests": self.test_count,
+            "test_time": round(self.test_time, 3),
+            "recycled": self.recycle_count,
+            "crashed": self.crash_count,
+            "estimated_saving": round(average_launch * avoided_launches, 3),
+        }
+
+    def format_report(self) -> str:
+        """Render the pool stats as a one-line summary"""
+        stats = self.stats()
+        return (
+            f"🏊 Browser pool: {stats['launches']} launches ({stats['launch_time']:.2f}s), "
+            f"{stats['tests']} tests ({stats['test_time']:.2f}s), "
+            f"{stats['recycled']} recycled, {stats['crashed']} crashed, "
+            f"~{stats['estimated_saving']:.2f}s of launches saved"
+        )
+
+    def _launch(self, browser_type: str, headless: bool):
+        """Start the driver if needed and launch a browser, timing both"""
+        started = time.perf_counter()
+        if self.playwright is None:
+            self.playwright = sync_playwright().start()
+        engine = getattr(self.playwright, browser_type)
+        browser = engine.launch(headless=headless, **self.launch_options)
+        self.launch_time += time.perf_counter() - started
+        self.launch_count += 1
+        return browser
+
+    def _discard(self, key):
+        """Close and forget a pooled browser, ignoring errors from dead ones"""
+        browser = self._browsers.pop(key, None)
+        self._uses.pop(key, None)
+        self._acquired_at.pop(key, None)
+        if browser is None:
+            return
+        try:
+            browser.close()
+        except Exception:
+            pass
@@ -0,0 +1,137 @@
+"""
+JS/CSS Coverage for FriendFilter.com pages
+Uses Chromium's precise script coverage and CSS rule usage over CDP to measure shipped-but-unused bytes
+"""
+
+from typing import Dict, List
+
+
+def _used_js_bytes(functions: List[Dict]) -> tuple:
+    """(total, used) bytes of one script from its block-coverage ranges"""
+    ranges = [r for function in functions for r in function["ranges"]]
+    if not ranges:
+        return 0, 0
+    total = max(r["endOffset"] for r in ranges)
+    used = bytearray(total)
+    # Outer ranges first so nested (more specific) block counts overwrite them
+    for r in sorted(ranges, key=lambda r: (r["startOffset"], -r["endOffset"])):
+        length = r["endOffset"] - r["startOffset"]
+        used[r["startOffset"]:r["endOffset"]] = (b"\x01" if r["count"] > 0 else b"\x00") * length
+    return total, sum(used)
+
+
+def _merged_length(ranges: List[tuple]) -> int:
+    """Length covered by a set of possibly overlapping (start, end) ranges"""
+    covered = 0
+    current_start = current_end = None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        covered += current_end - current_start
+    return covered
+
+
+class CoverageRecorder:
+    """Precise JS and CSS coverage for one page via a CDP session (Chromium only)"""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.session = None
+        self.stylesheets: Dict[str, Dict] = {}
+
+    def start(self):
+        """Begin collecting; call before navigating so startup code is counted"""
+        self.session = self.context.new_cdp_session(self.page)
+        self.session.on("CSS.styleSheetAdded", self._on_stylesheet)
+        self.session.send("Profiler.enable")
+        self.session.send("Profiler.startPreciseCoverage", {"callCount": False, "detailed": True})
+        self.session.send("DOM.enable")
+        self.session.send("CSS.enable")
+        self.session.send("CSS.startRuleUsageTracking")
+        return self
+
+    def _on_stylesheet(self, event):
+        header = event["header"]
+        self.stylesheets[header["styleSheetId"]] = {
+            "url": header.get("sourceURL") or "(inline style)",
+            "length": header.get("length", 0),
+        }
+
+    def take(self) -> Dict:
+        """Coverage since the last take(); call before leaving a page, as navigation discards its scripts"""
+        js = self.session.send("Profiler.takePreciseCoverage")["result"]
+        css = self.session.send("CSS.takeCoverageDelta")["coverage"]
+        return build_coverage_report(js, css, self.stylesheets)
+
+    def stop(self):
+        """Stop collecting and detach the session"""
+        if self.session:
+            try:
+                self.session.send("CSS.stopRuleUsageTracking")
+                self.session.send("Profiler.stopPreciseCoverage")
+                self.session.detach()
+            except Exception:
+                pass
+            self.session = None
+
+
+def build_coverage_report(js_coverage: List[Dict], css_usage: List[Dict], stylesheets: Dict[str, Dict]) -> Dict:
+    """Per-resource and total shipped/used/unused bytes from raw CDP coverage"""
+    resources: Dict[str, Dict] = {}
+
+    def add(url: str, kind: str, total: int, used: int):
+        entry = resources.setdefault(url, {"url": url, "type": kind, "total_bytes": 0, "used_bytes": 0})
+        entry["total_bytes"] += total
+        entry["used_bytes"] += used
+
+    for script in js_coverage:
+        # Scripts without a URL are eval'd code or Playwright's own injected helpers
+        if not script["url"] or script["url"].startswith("__playwright"):
+            continue
+        total, used = _used_js_bytes(script["functions"])
+        add(script["url"], "js", total, used)
+
+    used_css: Dict[str, List[tuple]] = {}
+    for rule in css_usage:
+        if rule["used"]:
+            used_css.setdefault(rule["styleSheetId"], []).append((rule["startOffset"], rule["endOffset"]))
+    for sheet_id, sheet in stylesheets.items():
+        add(sheet["url"], "css", sheet["length"], _merged_length(used_css.get(sheet_id, [])))
+
+    rows = []
+    for entry in resources.values():
+        entry["unused_bytes"] = entry["total_bytes"] - entry["used_bytes"]
+        entry["unused_ratio"] = round(entry["unused_bytes"] / entry["total_bytes"], 3) if entry["total_bytes"] else 0.0
+        rows.append(entry)
+    rows.sort(key=lambda entry: entry["unused_bytes"], reverse=True)
+
+    totals = {}
+    for kind in ("js", "css"):
+        shipped = sum(entry["total_bytes"] for entry in rows if entry["type"] == kind)
+        unused = sum(entry["unused_bytes"] for entry in rows if entry["type"] == kind)
+        totals[f"{kind}_bytes"] = shipped
+        totals[f"unused_{kind}_bytes"] = unused
+        totals[f"unused_{kind}_ratio"] = round(unused / shipped, 3) if shipped else 0.0
+    return {"resources": rows, "totals": totals}
+
+
+def format_coverage(report: Dict, label: str = "", limit: int = 5) -> str:
+    """Totals plus the resources with the most unused bytes"""
+    totals = report["totals"]
+    lines = [
+        f"🧮 {label or 'Page'}: JS {totals['unused_js_bytes'] / 1024:.1f}/{totals['js_bytes'] / 1024:.1f} KB unused "
+        f"({totals['unused_js_ratio'] * 100:.0f}%), CSS {totals['unused_css_bytes'] / 1024:.1f}/"
+        f"{totals['css_bytes'] / 1024:.1f} KB unused ({totals['unused_css_ratio'] * 100:.0f}%)"
+    ]
+    for entry in report["resources"][:limit]:
+        lines.append(
+            f"   {entry['type']:<3} {entry['unused_bytes'] / 1024:>7.1f} KB unused of "
+            f"{entry['total_bytes'] / 1024:>7.1f} KB  {entry['url'][-70:]}"
+        )
+    return "\n".join(lines)
@@ -5,7 +5,11 @@ A basic test to verify the setup works and demonstrate key functionality
 """
 
 from playwright.sync_api import sync_playwright, expect
-import time
+
+from artifact_store import ArtifactStore
+from emulation_profiles import apply_profile, profile_from_env
+from page_objects import BasePage
+from performance_metrics import budgets_for, collect_metrics, format_metrics, load_budgets, metric_value
 
 
 def demo_test():
@@ -18,6 +22,14 @@ def demo_test():
         browser = p.chromium.launch(headless=True)  # Running in headless mode
         context = browser.new_context(viewport={'width': 1920, 'height': 1080})
         page = context.new_page()
+        site = BasePage(page)
+        store = ArtifactStore.from_env()
+        
+        # EMULATION_PROFILE=slow-3g (etc.) throttles the demo like a mobile device
+        profile = profile_from_env()
+        if profile:
+            apply_profile(context, page, profile)
+            print(f"📶 Emulating {profile}")
         
         try:
             print("1. Loading website...")
@@ -30,8 +42,8 @@ def demo_test():
             print(f"   📄 Page title: {title}")
             
             print("3. Taking screenshot...")
-            page.screenshot(path="friendfilter_homepage.png")
-            print("   📸 Screenshot saved as 'friendfilter_homepage.png'")
+            record = store.put(page.screenshot(), "screenshot", "demo_test", "homepage")
+            print(f"   📸 Screenshot saved as '{store.root}/{record['path']}'")
             
             print("4. Looking for Chrome extension button...")
             chrome_button = page.locator('text="Add to Chrome"')
@@ -62,9 +74,9 @@ def demo_test():
             print("6. Testing responsive design...")
             # Test mobile viewport
             page.set_viewport_size({"width": 375, "height": 667})
-            time.sleep(1)
-            page.screenshot(path="friendfilter_mobile.png")
-            print("   📱 Mobile screenshot saved as 'friendfilter_mobile.png'")
+            site.wait_for_dom_settled()
+            record = store.put(page.screenshot(), "screenshot", "demo_test", "mobile")
+            print(f"   📱 Mobile screenshot saved as '{store.root}/{record['path']}'")
             
             # Reset to desktop
             page.set_viewport_size({"width": 1920, "height": 1080})
@@ -76,15 +88,16 @@ def demo_test():
             print(f"   ⌨️  Input fields found: {inputs.count()}")
             
             print("8. Measuring page load performance...")
-            start_time = time.time()
             page.reload()
-            page.wait_for_load_state("domcontentloaded")
-            load_time = time.time() - start_time
-            print(f"   ⚡ Page load time: {load_time:.2f} seconds")
+            metrics = collect_metrics(page)
+            print(f"   ⚡ {format_metrics(metrics)}")
             
-            if load_time < 3.0:
+            # Judge by the browser-reported load event, not wall-clock around reload()
+            load_time = (metric_value(metrics, "navigation.load") or 0) / 1000
+            load_budget = budgets_for(load_budgets(), "/", profile).get("navigation.load", 5000) / 1000
+            if load_time < load_budget * 0.6:
                 print("   ✅ Good page load performance")
-            elif load_time < 5.0:
+            elif load_time < load_budget:
                 print("   ⚠️  Acceptable page load performance")
             else:
                 print("   ❌ Slow page load performance")
@@ -0,0 +1,73 @@
+"""
+Network and CPU Emulation Profiles for FriendFilter.com tests
+Throttles a page through a Chromium DevTools Protocol session so load budgets reflect real devices
+"""
+
+import os
+from typing import Dict, Optional
+
+
+# Throughputs are bytes per second and latency is added round-trip milliseconds.
+# The network numbers match Chrome DevTools' presets.
+PROFILES = {
+    "slow-3g": {
+        "network": {"latency": 2000, "download": 50000, "upload": 50000},
+    },
+    "fast-3g": {
+        "network": {"latency": 562.5, "download": 180000, "upload": 84375},
+    },
+    "fast-4g": {
+        "network": {"latency": 165, "download": 1012500, "upload": 168750},
+    },
+    "4x-cpu-slowdown": {
+        "cpu_rate": 4,
+    },
+    "mid-tier-mobile": {
+        "network": {"latency": 562.5, "download": 180000, "upload": 84375},
+        "cpu_rate": 4,
+    },
+}
+
+
+def get_profile(name: str) -> Dict:
+    """Look up a profile by name"""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown emulation profile: {name} (available: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def profile_from_env() -> Optional[str]:
+    """Profile named by $EMULATION_PROFILE, if any"""
+    return os.environ.get("EMULATION_PROFILE") or None
+
+
+def _commands(name: str):
+    """CDP (method, params) pairs that apply a profile"""
+    profile = get_profile(name)
+    commands = []
+    if "network" in profile:
+        network = profile["network"]
+        commands.append(("Network.enable", {}))
+        commands.append(("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": network["latency"],
+            "downloadThroughput": network["download"],
+            "uploadThroughput": network["upload"],
+        }))
+    if "cpu_rate" in profile:
+        commands.append(("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_rate"]}))
+    return commands
+
+
+def apply_profile(context, page, name: str, browser_type: str = "chromium"):
+    """Throttle one page; returns the CDP session, or None when the engine has no CDP (Firefox, WebKit)"""
+    get_profile(name)
+    if browser_type != "chromium":
+        print(f"⚠️  Emulation profile '{name}' needs Chromium, {browser_type} runs unthrottled")
+        return None
+    # Sessions are per page, so popups opened later are not throttled
+    session = context.new_cdp_session(page)
+    for method, params in _commands(name):
+        session.send(method, params)
+    return session
+
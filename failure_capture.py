@@ -0,0 +1,243 @@
+"""
+Failure-only Capture for FriendFilter.com tests
+Keeps a bounded in-memory ring of recent actions and page events per context and writes it out only when a test fails
+"""
+
+import json
+import os
+import time
+import weakref
+import zlib
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from artifact_store import ArtifactStore
+
+
+# Page-object methods recorded as actions (BasePage primitives included)
+CAPTURED_PREFIXES = (
+    "click_", "select_", "toggle_", "filter_", "search_", "submit_", "fill_", "navigate_", "load", "login", "signup"
+)
+
+# page -> FailureCapture, so page objects built inside a test find their context's ring
+_CAPTURES = weakref.WeakKeyDictionary()
+
+
+def capture_for(page) -> Optional["FailureCapture"]:
+    """The capture watching a page, if any"""
+    try:
+        return _CAPTURES.get(page)
+    except TypeError:
+        return None
+
+
+class ActionRing:
+    """Newest-last ring of trace entries bounded by entry count and approximate bytes"""
+
+    def __init__(self, max_entries: int = 50, max_bytes: int = 2 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = deque()
+        self.bytes = 0
+        self.dropped = 0
+
+    def add(self, entry: Dict, snapshot: Optional[bytes] = None):
+        """Append an entry (with an optional compressed DOM snapshot), dropping the oldest to stay in bounds"""
+        if snapshot is not None and len(snapshot) > self.max_bytes // 2:
+            # One huge document must not flush the whole history
+            entry["snapshot_skipped"] = len(snapshot)
+            snapshot = None
+        size = len(repr(entry)) + (len(snapshot) if snapshot else 0)
+        self.entries.append((entry, snapshot, size))
+        self.bytes += size
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, _, dropped_size = self.entries.popleft()
+            self.bytes -= dropped_size
+            self.dropped += 1
+
+    def export(self) -> List[Dict]:
+        """Entries with their snapshots decompressed"""
+        exported = []
+        for entry, snapshot, _ in self.entries:
+            entry = dict(entry)
+            if snapshot:
+                entry["dom"] = zlib.decompress(snapshot).decode("utf-8", "replace")
+            exported.append(entry)
+        return exported
+
+    def clear(self):
+        """Forget everything (a passing test's ring is simply discarded)"""
+        self.entries.clear()
+        self.bytes = 0
+        self.dropped = 0
+
+
+class FailureCapture:
+    """Rolling trace for one browser context; nothing touches the disk unless save() is called"""
+
+    def __init__(self, context, max_entries: int = 50, max_bytes: int = 2 * 1024 * 1024, snapshots: bool = False):
+        self.context = context
+        self.ring = ActionRing(max_entries, max_bytes)
+        # DOM after every action; off by default, so passing tests never pay for page.content()
+        self.snapshots = snapshots
+        self.started = time.perf_counter()
+        self.failed = False
+        self.pages: List = []
+        self._videos: List = []
+        self._depth = 0
+
+    def attach(self):
+        """Watch the context's current and future pages"""
+        for page in self.context.pages:
+            self._watch_page(page)
+        self.context.on("page", self._watch_page)
+        return self
+
+    def _watch_page(self, page):
+        index = len(self.pages)
+        self.pages.append(page)
+        try:
+            _CAPTURES[page] = self
+        except TypeError:
+            pass
+        if page.video:
+            self._videos.append(page.video)
+
+        def on_navigation(frame):
+            if frame == page.main_frame:
+                self.record("navigation", page=index, url=frame.url)
+
+        def on_console(message):
+            if message.type in ("error", "warning"):
+                self.record("console", page=index, level=message.type, text=message.text[:500])
+
+        def on_response(response):
+            if response.status >= 400:
+                self.record("http_error", page=index, url=response.url, status=response.status)
+
+        # No "dialog" listener: registering one stops Playwright from auto-dismissing dialogs
+        page.on("framenavigated", on_navigation)
+        page.on("console", on_console)
+        page.on("response", on_response)
+        page.on("pageerror", lambda error: self.record("pageerror", page=index, error=str(error)[:1000]))
+        page.on("requestfailed", lambda request: self.record(
+            "requestfailed", page=index, url=request.url, failure=request.failure))
+        page.on("crash", lambda _: self.record("crash", page=index))
+
+    def record(self, kind: str, snapshot: Optional[bytes] = None, **fields):
+        """Add one entry to the ring"""
+        entry = {"t": round(time.perf_counter() - self.started, 3), "type": kind}
+        entry.update(fields)
+        self.ring.add(entry, snapshot)
+
+    def wrap(self, page_object):
+        """Record every action method of a page object, with a DOM snapshot after failed (or, opted in, all) ones"""
+        for name in dir(type(page_object)):
+            if not name.startswith(CAPTURED_PREFIXES):
+                continue
+            method = getattr(page_object, name)
+            if callable(method):
+                setattr(page_object, name, self._wrap_method(page_object, f"{type(page_object).__name__}.{name}", method))
+        return page_object
+
+    def _wrap_method(self, page_object, action: str, method: Callable) -> Callable:
+        def captured(*args, **kwargs):
+            # Only the outermost action is recorded when one action calls another
+            if self._depth:
+                return method(*args, **kwargs)
+            self._depth += 1
+            started = time.perf_counter()
+            error = None
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                error = str(e)[:1000]
+                raise
+            finally:
+                self._depth -= 1
+                self.record(
+                    "action",
+                    snapshot=self._snapshot(page_object.page) if self.snapshots or error else None,
+                    action=action,
+                    args=[repr(arg)[:200] for arg in args],
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                    url=page_object.page.url,
+                    error=error,
+                )
+        return captured
+
+    def _snapshot(self, page) -> Optional[bytes]:
+        """Compressed DOM of a page, kept in memory only"""
+        try:
+            return zlib.compress(page.content().encode("utf-8"), 1)
+        except Exception:
+            return None
+
+    def bundle(self, test: str, error) -> Dict:
+        """The trace written for a failing test"""
+        return {
+            "test": test,
+            "error": str(error) if error is not None else None,
+            "elapsed": round(time.perf_counter() - self.started, 3),
+            "dropped_entries": self.ring.dropped,
+            "entries": self.ring.export(),
+        }
+
+    def save(self, store: ArtifactStore, test: str, error=None) -> List[Dict]:
+        """Write the ring plus a final screenshot and DOM of each open page to the artifact store"""
+        self.failed = True
+        bundle = self.bundle(test, error)
+        records = []
+        for index, page in enumerate(self.pages):
+            if page.is_closed():
+                continue
+            try:
+                records.append(store.put(page.screenshot(), "screenshot", test, f"failure-page{index}"))
+                bundle.setdefault("final_dom", {})[index] = page.content()[:self.ring.max_bytes // 2]
+            except Exception:
+                pass
+        records.append(self._put_bundle(store, test, bundle))
+        return records
+
+    async def save_async(self, store: ArtifactStore, test: str, error=None) -> List[Dict]:
+        """save() for async Playwright pages"""
+        self.failed = True
+        bundle = self.bundle(test, error)
+        records = []
+        for index, page in enumerate(self.pages):
+            if page.is_closed():
+                continue
+            try:
+                records.append(store.put(await page.screenshot(), "screenshot", test, f"failure-page{index}"))
+                bundle.setdefault("final_dom", {})[index] = (await page.content())[:self.ring.max_bytes // 2]
+            except Exception:
+                pass
+        records.append(self._put_bundle(store, test, bundle))
+        return records
+
+    def _put_bundle(self, store: ArtifactStore, test: str, bundle: Dict) -> Dict:
+        data = json.dumps(bundle, default=str).encode("utf-8")
+        return store.put(data, "trace", test, "failure-trace", ext="json")
+
+    def finish(self, store: Optional[ArtifactStore] = None, test: str = "adhoc") -> List[Dict]:
+        """After the context closed: keep videos of a failed test, delete the rest and drop the ring"""
+        records = []
+        for video in self._videos:
+            try:
+                path = video.path()
+            except Exception:
+                continue
+            if not os.path.exists(path):
+                continue
+            if self.failed and store is not None:
+                records.append(store.put_file(path, "video", test, "failure-video"))
+            else:
+                os.remove(path)
+        self._videos = []
+        self.ring.clear()
+        return records
+
+
+def format_capture(records: List[Dict], root: str) -> str:
+    """Where a failing test's capture went"""
+    return "\n".join(f"   📼 {record['kind']}: {os.path.join(root, record['path'])}" for record in records)
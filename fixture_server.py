@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Local FriendFilter.com Stand-in Server
+Serves landing, pricing, dashboard, 404 and /api pages with the selectors page_objects.py expects
+"""
+
+import argparse
+import json
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+
+HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <meta name="description" content="FriendFilter helps you manage your Facebook connections.">
+  <meta property="og:title" content="FriendFilter">
+  <meta property="og:description" content="Filter, search and whitelist your Facebook friends.">
+  <title>{title}</title>
+  <style>
+    body {{ font-family: sans-serif; margin: 0; }}
+    nav a {{ margin-right: 12px; }}
+    .hamburger {{ display: none; }}
+    @media (max-width: 768px) {{ nav .links {{ display: none; }} .hamburger {{ display: block; }} }}
+    .pricing-card {{ display: inline-block; border: 1px solid #ccc; padding: 16px; margin: 8px; }}
+  </style>
+</head>
+<body>
+  <header role="banner">
+    <nav role="navigation">
+      <span class="links">
+        <a href="/">Home</a>
+        <a href="/#features">Features</a>
+        <a href="/pricing">Pricing</a>
+        <a href="/#about">About</a>
+        <a href="/#contact">Contact</a>
+        <a href="/login">Log In</a>
+        <a href="/signup">Sign Up</a>
+      </span>
+      <button class="hamburger" data-testid="mobile-menu" aria-label="Menu">&#9776;</button>
+    </nav>
+  </header>
+  <main role="main">
+"""
+
+FOOT = """  </main>
+  <footer role="contentinfo"><a href="/#privacy" class="privacy">Privacy</a></footer>
+  <!-- {padding} -->
+</body>
+</html>
+"""
+
+LANDING = """
+    <h1>Take control of your Facebook friends</h1>
+    <a href="https://chrome.google.com/webstore/detail/friendfilter" target="_blank" rel="noopener">Add to Chrome</a>
+    <a href="/signup">Get Started</a>
+    <img src="/static/hero.png" alt="FriendFilter dashboard preview" width="64" height="64">
+    <img src="/static/divider.png" alt="" width="64" height="8">
+    <section class="features" id="features">
+      <h2>Features</h2>
+      <p>Auto friend requests, smart search and whitelist management.</p>
+    </section>
+    <section class="permissions" id="about">
+      <h2>Permissions</h2>
+      <p>The extension only reads your friends list.</p>
+    </section>
+    <section id="contact">
+      <h2>Stay in touch</h2>
+      <form action="/signup" method="get">
+        <input type="email" name="email" placeholder="you@example.com" required>
+        <button type="submit">Notify me</button>
+      </form>
+      <a href="/login#forgot">Forgot Password</a>
+    </section>
+"""
+
+PRICING = """
+    <h1>Pricing</h1>
+    <label><input type="checkbox" class="billing-toggle"> Yearly billing</label>
+    <div class="pricing-card free-plan" data-testid="pricing-plan">
+      <h2>Free</h2><p class="price">$0</p>
+      <a href="/signup?plan=free">Select Plan</a>
+    </div>
+    <div class="pricing-card premium-plan" data-testid="pricing-plan">
+      <h2>Premium</h2><p class="price">$9</p>
+      <a href="/signup?plan=premium">Select Plan</a>
+    </div>
+    <div class="pricing-card" data-testid="pricing-plan">
+      <h2>Pro</h2><p class="price">$19</p>
+      <a href="/checkout?plan=pro">Select Plan</a>
+    </div>
+"""
+
+DASHBOARD = """
+    <div class="dashboard" data-testid="dashboard">
+      <h1>Dashboard</h1>
+      <div class="metrics" data-testid="metrics">
+        <span class="connections-count stats">0 connections</span>
+      </div>
+      <input type="search" placeholder="search connections">
+      <button data-filter="active">Active</button>
+      <button data-filter="archived">Archived</button>
+      <button data-filter="">All</button>
+      <button data-filter="">All Connections</button>
+      <ul class="connections"></ul>
+      <section class="whitelist whitelist-section" data-testid="whitelist"><h2>Whitelist</h2></section>
+      <button data-testid="settings">Settings</button>
+    </div>
+    <script>
+      let filter = "";
+      let query = "";
+      async function refresh() {
+        const response = await fetch(`/api/connections?filter=${filter}&q=${encodeURIComponent(query)}`);
+        const data = await response.json();
+        document.querySelector(".connections").innerHTML =
+          data.connections.map(c => `<li class="${c.status}">${c.name}</li>`).join("");
+        document.querySelector(".connections-count").textContent = `${data.connections.length} connections`;
+      }
+      document.querySelectorAll("[data-filter]").forEach(button =>
+        button.addEventListener("click", () => { filter = button.dataset.filter; refresh(); }));
+      document.querySelector("input[type=search]").addEventListener("keydown", event => {
+        if (event.key === "Enter") { query = event.target.value; refresh(); }
+      });
+      refresh();
+    </script>
+"""
+
+AUTH_FORM = """
+    <h1>{heading}</h1>
+    <form action="/dashboard" method="get">
+      <input type="email" name="email" required>
+      <input type="password" name="password" required>
+      {extra}
+      <button type="submit">{heading}</button>
+    </form>
+    <a href="/login#forgot">Forgot Password</a>
+    <a href="/{other}">{other_label}</a>
+"""
+
+NOT_FOUND = """
+    <h1>404 Not Found</h1>
+    <p>The page you are looking for does not exist.</p>
+"""
+
+
+def _png(width: int, height: int, rgb=(66, 133, 244)) -> bytes:
+    """Encode a solid-colour PNG so the fixture images have real byte sizes"""
+    row = b"\x00" + bytes(rgb) * width
+    raw = zlib.compress(row * height)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", raw) + chunk(b"IEND", b"")
+
+
+class FixtureServer:
+    """Threaded HTTP server standing in for friendfilter.com"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: int = 0,
+                 api_latency_ms: int = 0, payload_kb: int = 0, connections: int = 50):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.api_latency_ms = api_latency_ms
+        self.payload_kb = payload_kb
+        self.connections = self._build_connections(connections)
+        self.images = {"/static/hero.png": _png(64, 64), "/static/divider.png": _png(64, 8)}
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """URL tests should use as their base_url"""
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Shut the server down"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def render(self, path: str):
+        """Return (status, content type, body) for a page or API path"""
+        parsed = urlparse(path)
+        route = parsed.path.rstrip("/") or "/"
+
+        if route.startswith("/api/"):
+            return self._render_api(route, parse_qs(parsed.query))
+        if route in self.images:
+            return 200, "image/png", self.images[route]
+
+        pages = {
+            "/": ("FriendFilter - Manage your Facebook friends", LANDING),
+            "/pricing": ("Pricing - FriendFilter", PRICING),
+            "/dashboard": ("Dashboard - FriendFilter", DASHBOARD),
+            "/login": ("Log In - FriendFilter", AUTH_FORM.format(
+                heading="Log In", extra="", other="signup", other_label="Sign Up")),
+            "/signup": ("Sign Up - FriendFilter", AUTH_FORM.format(
+                heading="Sign Up", extra='<input type="password" name="confirm_password" required>',
+                other="login", other_label="Log In")),
+            "/checkout": ("Checkout - FriendFilter", "<h1>Checkout</h1>"),
+        }
+        status, (title, content) = (200, pages[route]) if route in pages else (404, ("404 Not Found", NOT_FOUND))
+        body = HEAD.format(title=title) + content + FOOT.format(padding="x" * (self.payload_kb * 1024))
+        return status, "text/html; charset=utf-8", body.encode()
+
+    def _render_api(self, route: str, query: Dict):
+        """Serve the JSON endpoints the dashboard uses"""
+        if route == "/api/connections":
+            status_filter = query.get("filter", [""])[0]
+            search = query.get("q", [""])[0].lower()
+            connections = [
+                c for c in self.connections
+                if (not status_filter or c["status"] == status_filter) and search in c["name"].lower()
+            ]
+            payload = {"connections": connections}
+        elif route == "/api/metrics":
+            active = sum(1 for c in self.connections if c["status"] == "active")
+            payload = {"total": len(self.connections), "active": active, "archived": len(self.connections) - active}
+        else:
+            return 404, "application/json", json.dumps({"error": "Not Found"}).encode()
+        return 200, "application/json", json.dumps(payload).encode()
+
+    def _build_connections(self, count: int) -> List[Dict]:
+        """Generate a deterministic connections list for the API"""
+        return [
+            {"id": i, "name": f"Friend {i}", "status": "active" if i % 3 else "archived"}
+            for i in range(1, count + 1)
+        ]
+
+    def _handler_class(self):
+        """Build a request handler bound to this server's settings"""
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                is_api = self.path.startswith("/api/")
+                delay = fixture.api_latency_ms if is_api else fixture.latency_ms
+                if delay:
+                    time.sleep(delay / 1000)
+                status, content_type, body = fixture.render(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for friendfilter.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every page response")
+    parser.add_argument("--api-latency-ms", type=int, default=0, help="Delay added to every /api response")
+    parser.add_argument("--payload-kb", type=int, default=0, help="Extra padding added to every page")
+    parser.add_argument("--connections", type=int, default=50, help="Number of connections the API returns")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, args.latency_ms, args.api_latency_ms,
+                           args.payload_kb, args.connections)
+    print(f"🧪 FriendFilter fixture server running at {server.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+HAR Record/Replay for FriendFilter.com and AceStreamz tests
+Records each test's traffic to its own HAR file and serves it back offline via route_from_har
+"""
+
+import os
+from typing import Dict, Optional
+
+
+class HarArchive:
+    """Per-test HAR archives in record or replay mode"""
+
+    MODES = ("record", "replay")
+
+    def __init__(self, mode: str, directory: str = "hars", strict: bool = True, url_pattern: Optional[str] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported HAR mode: {mode}")
+        self.mode = mode
+        self.directory = directory
+        self.strict = strict
+        self.url_pattern = url_pattern
+
+    @classmethod
+    def from_env(cls) -> Optional["HarArchive"]:
+        """Build an archive from HAR_MODE / HAR_DIR / HAR_STRICT, or None when unset"""
+        mode = os.environ.get("HAR_MODE")
+        if not mode:
+            return None
+        strict = os.environ.get("HAR_STRICT", "1").lower() not in ("0", "false", "no")
+        return cls(mode, directory=os.environ.get("HAR_DIR", "hars"), strict=strict)
+
+    def path_for(self, test_name: str) -> str:
+        """Return the HAR file used by a test, e.g. hars/TestLandingPage/test_navigation_menu.har"""
+        return os.path.join(self.directory, *test_name.split("/")) + ".har"
+
+    def route_options(self, test_name: str) -> Optional[Dict]:
+        """Return route_from_har keyword arguments for a test, or None to go live"""
+        path = self.path_for(test_name)
+        options = {"url": self.url_pattern} if self.url_pattern else {}
+
+        if self.mode == "record":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # The HAR is written when the context closes
+            options.update(update=True, update_content="embed", update_mode="full")
+            return dict(options, path=path)
+
+        if not os.path.exists(path):
+            if self.strict:
+                raise FileNotFoundError(f"No recorded HAR for {test_name}: {path} (run with --record first)")
+            return None
+
+        # Strict replay fails requests that were never recorded, lenient lets them hit the network
+        options.update(not_found="abort" if self.strict else "fallback")
+        return dict(options, path=path)
+
+    def attach(self, context, test_name: str):
+        """Route a sync BrowserContext through the test's HAR"""
+        options = self.route_options(test_name)
+        if options:
+            context.route_from_har(**options)
+
+    async def attach_async(self, context, test_name: str):
+        """Route an async BrowserContext through the test's HAR"""
+        options = self.route_options(test_name)
+        if options:
+            await context.route_from_har(**options)
@@ -0,0 +1,167 @@
+"""
+Interaction Latency Profiler for FriendFilter.com page objects
+Wraps page-object actions and records the long tasks and event-to-next-paint latency each one caused
+"""
+
+import time
+from typing import Callable, Dict, List
+
+from page_objects import BasePage
+
+
+# Installs the observers once per document and returns a mark to filter entries by.
+# Event Timing only sees trusted input, which the page objects' click()/fill() primitives produce.
+START_SCRIPT = """
+() => {
+    if (!window.__interactionProfiler) {
+        const state = {events: [], longtasks: []};
+        const supported = PerformanceObserver.supportedEntryTypes || [];
+        state.supported = {event: supported.includes("event"), longtask: supported.includes("longtask")};
+        if (state.supported.event) {
+            new PerformanceObserver(list => {
+                for (const entry of list.getEntries()) {
+                    state.events.push({
+                        name: entry.name,
+                        start: entry.startTime,
+                        processing_start: entry.processingStart,
+                        processing_end: entry.processingEnd,
+                        duration: entry.duration,
+                        interaction_id: entry.interactionId || 0,
+                    });
+                }
+            }).observe({type: "event", durationThreshold: 16});
+        }
+        if (state.supported.longtask) {
+            new PerformanceObserver(list => {
+                for (const entry of list.getEntries()) state.longtasks.push({start: entry.startTime, duration: entry.duration});
+            }).observe({type: "longtask"});
+        }
+        window.__interactionProfiler = state;
+    }
+    return performance.now();
+}
+"""
+
+# Null when the action navigated away (the new document has no observers)
+COLLECT_SCRIPT = """
+async (mark) => {
+    const state = window.__interactionProfiler;
+    if (!state) return null;
+    // Event Timing entries are queued after the next paint, so let two frames and a task pass
+    await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    await new Promise(resolve => setTimeout(resolve, 50));
+    return {
+        supported: state.supported,
+        events: state.events.filter(entry => entry.start >= mark),
+        longtasks: state.longtasks.filter(task => task.start + task.duration >= mark),
+    };
+}
+"""
+
+ACTION_PREFIXES = ("click_", "select_", "toggle_", "filter_", "search_", "submit_", "fill_")
+
+
+def summarize_call(observed: Dict) -> Dict:
+    """Worst interaction and long-task totals for one action call"""
+    interactions = {}
+    for event in observed["events"]:
+        if event["interaction_id"]:
+            worst = interactions.get(event["interaction_id"])
+            if worst is None or event["duration"] > worst["duration"]:
+                interactions[event["interaction_id"]] = event
+    worst = max(interactions.values(), key=lambda event: event["duration"], default=None)
+    longtasks = [task["duration"] for task in observed["longtasks"]]
+    return {
+        "latency": worst["duration"] if worst else None,
+        "input_delay": round(worst["processing_start"] - worst["start"], 1) if worst else None,
+        "processing": round(worst["processing_end"] - worst["processing_start"], 1) if worst else None,
+        "presentation_delay": (
+            round(worst["start"] + worst["duration"] - worst["processing_end"], 1) if worst else None
+        ),
+        "event": worst["name"] if worst else None,
+        "longtasks": len(longtasks),
+        "longest_task": max(longtasks, default=0),
+        "blocking_time": round(sum(max(0, duration - 50) for duration in longtasks), 1),
+    }
+
+
+class InteractionProfiler:
+    """Records per-action interaction latency for page objects on one page"""
+
+    def __init__(self, page):
+        self.page = page
+        self.calls: List[Dict] = []
+        self._depth = 0
+
+    def wrap(self, page_object):
+        """Profile every action method (click_*, select_*, toggle_*, ...) of a page object"""
+        for name in dir(type(page_object)):
+            # BasePage primitives are the building blocks of actions, not actions themselves
+            if not name.startswith(ACTION_PREFIXES) or hasattr(BasePage, name):
+                continue
+            method = getattr(page_object, name)
+            if callable(method):
+                setattr(page_object, name, self._wrap_method(f"{type(page_object).__name__}.{name}", method))
+        return page_object
+
+    def _wrap_method(self, action: str, method: Callable) -> Callable:
+        def profiled(*args, **kwargs):
+            # Only the outermost action is measured when one action calls another
+            if self._depth:
+                return method(*args, **kwargs)
+            self._depth += 1
+            try:
+                return self.measure(action, method, *args, **kwargs)
+            finally:
+                self._depth -= 1
+        return profiled
+
+    def measure(self, action: str, method: Callable, *args, **kwargs):
+        """Run one action and record what the browser observed"""
+        mark = self.page.evaluate(START_SCRIPT)
+        started = time.perf_counter()
+        result = method(*args, **kwargs)
+        wall_time = round((time.perf_counter() - started) * 1000, 1)
+        try:
+            observed = self.page.evaluate(COLLECT_SCRIPT, mark)
+        except Exception:
+            observed = None
+
+        call = {"action": action, "wall_ms": wall_time, "navigated": observed is None}
+        call.update(summarize_call(observed or {"events": [], "longtasks": []}))
+        self.calls.append(call)
+        return result
+
+    def table(self) -> List[Dict]:
+        """Per-action rows: call count, INP-style latency (p98 of calls) and long-task totals"""
+        rows = {}
+        for call in self.calls:
+            rows.setdefault(call["action"], []).append(call)
+
+        table = []
+        for action, calls in rows.items():
+            latencies = sorted(call["latency"] for call in calls if call["latency"] is not None)
+            table.append({
+                "action": action,
+                "calls": len(calls),
+                "inp": latencies[min(len(latencies) - 1, int(len(latencies) * 0.98))] if latencies else None,
+                "median_latency": latencies[len(latencies) // 2] if latencies else None,
+                "longtasks": sum(call["longtasks"] for call in calls),
+                "longest_task": max(call["longest_task"] for call in calls),
+                "blocking_time": round(sum(call["blocking_time"] for call in calls), 1),
+                "navigated": sum(1 for call in calls if call["navigated"]),
+            })
+        table.sort(key=lambda row: row["inp"] or 0, reverse=True)
+        return table
+
+
+def format_interaction_table(table: List[Dict]) -> str:
+    """Text table of per-action interaction latency"""
+    lines = [f"   {'action':<40}{'calls':>6}{'INP':>8}{'p50':>8}{'long':>6}{'TBT':>8}"]
+    for row in table:
+        inp = f"{row['inp']:.0f}" if row["inp"] is not None else "-"
+        median = f"{row['median_latency']:.0f}" if row["median_latency"] is not None else "-"
+        lines.append(
+            f"   {row['action']:<40}{row['calls']:>6}{inp:>8}{median:>8}{row['longtasks']:>6}{row['blocking_time']:>8.0f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Page Load Benchmark for FriendFilter.com
+Samples each page N times cold and warm, reports percentiles and confidence intervals,
+and fails only on statistically significant regressions against a stored baseline
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from typing import Dict, List, Optional
+
+from playwright.sync_api import sync_playwright
+
+from fixture_server import FixtureServer
+from page_objects import DEFAULT_BASE_URL
+from performance_metrics import collect_metrics, metric_value
+
+
+BENCHMARK_PAGES = ["/", "/pricing", "/dashboard"]
+BENCHMARK_METRICS = [
+    "navigation.ttfb",
+    "navigation.dom_content_loaded",
+    "navigation.load",
+    "paint.first_contentful_paint",
+    "lcp",
+]
+DEFAULT_BASELINE_FILE = "benchmark_baseline.json"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of a sample list"""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def median_confidence_interval(samples: List[float], confidence: float = 0.95, resamples: int = 2000) -> List[float]:
+    """Bootstrap confidence interval for the median (seeded so reports are reproducible)"""
+    rng = random.Random(1234)
+    medians = sorted(
+        percentile([rng.choice(samples) for _ in samples], 50) for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    return [round(percentile(medians, tail * 100), 1), round(percentile(medians, (1 - tail) * 100), 1)]
+
+
+def summarize_samples(samples: List[float]) -> Dict:
+    """p50/p90/p99 plus the median's confidence interval"""
+    return {
+        "n": len(samples),
+        "p50": round(percentile(samples, 50), 1),
+        "p90": round(percentile(samples, 90), 1),
+        "p99": round(percentile(samples, 99), 1),
+        "ci95": median_confidence_interval(samples),
+    }
+
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """One-sided p-value that current tends to be larger than baseline (normal approximation)"""
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+
+    # Average ranks across ties
+    ranks = [0.0] * len(combined)
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        i = j + 1
+
+    n1, n2 = len(current), len(baseline)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if sd == 0:
+        return 1.0
+    z = (u - mean - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def holm_adjust(p_values: List[float]) -> List[float]:
+    """Holm-Bonferroni adjusted p-values, in the input order (controls the family-wise error rate)"""
+    order = sorted(range(len(p_values)), key=lambda index: p_values[index])
+    adjusted = [1.0] * len(p_values)
+    running_max = 0.0
+    for rank, index in enumerate(order):
+        running_max = max(running_max, min(1.0, (len(p_values) - rank) * p_values[index]))
+        adjusted[index] = running_max
+    return adjusted
+
+
+def sample_page(browser, url: str, runs: int, warm: bool) -> Dict[str, List[float]]:
+    """Navigate runs times and collect each metric's samples"""
+    samples = {metric: [] for metric in BENCHMARK_METRICS}
+
+    def record(page):
+        metrics = collect_metrics(page)
+        for metric in BENCHMARK_METRICS:
+            value = metric_value(metrics, metric)
+            if value is not None:
+                samples[metric].append(value)
+
+    if warm:
+        # One context whose first visit primes the HTTP cache and is not counted
+        context = browser.new_context(viewport={'width': 1920, 'height': 1080})
+        page = context.new_page()
+        page.goto(url)
+        for _ in range(runs):
+            page.goto(url)
+            record(page)
+        context.close()
+    else:
+        # A fresh context per run starts with an empty cache and no connections
+        for _ in range(runs):
+            context = browser.new_context(viewport={'width': 1920, 'height': 1080})
+            page = context.new_page()
+            page.goto(url)
+            record(page)
+            context.close()
+
+    return samples
+
+
+def run_benchmark(base_url: str, runs: int = 10, pages: Optional[List[str]] = None,
+                  browser_type: str = "chromium", headless: bool = True) -> Dict:
+    """Sample every page cold and warm; returns {page: {mode: {metric: samples}}}"""
+    samples = {}
+    with sync_playwright() as p:
+        browser = getattr(p, browser_type).launch(headless=headless)
+        try:
+            for path in pages or BENCHMARK_PAGES:
+                print(f"⏱️  {path}: {runs} cold + {runs} warm navigations")
+                samples[path] = {
+                    "cold": sample_page(browser, f"{base_url}{path}", runs, warm=False),
+                    "warm": sample_page(browser, f"{base_url}{path}", runs, warm=True),
+                }
+        finally:
+            browser.close()
+    return samples
+
+
+def compare_to_baseline(samples: Dict, baseline: Dict, alpha: float = 0.05, min_change: float = 0.05) -> List[str]:
+    """Regressions where the median grew by min_change and the shift is significant at alpha
+
+    Every page x mode x metric is one test of the same family, so p-values are Holm-adjusted across all of
+    them; otherwise a run with no real change would usually flag something.
+    """
+    compared = []
+    for path, modes in samples.items():
+        for mode, metrics in modes.items():
+            for metric, current in metrics.items():
+                previous = baseline.get(path, {}).get(mode, {}).get(metric, [])
+                if len(current) < 3 or len(previous) < 3:
+                    continue
+                current_median = percentile(current, 50)
+                previous_median = percentile(previous, 50)
+                change = (current_median - previous_median) / previous_median if previous_median else 0.0
+                p_value = mann_whitney_greater(current, previous)
+                compared.append((path, mode, metric, previous_median, current_median, change, p_value))
+
+    adjusted = holm_adjust([entry[-1] for entry in compared])
+    regressions = []
+    for (path, mode, metric, previous_median, current_median, change, _), p_value in zip(compared, adjusted):
+        if change > min_change and p_value < alpha:
+            regressions.append(
+                f"{path} [{mode}] {metric}: p50 {previous_median:.1f} → {current_median:.1f}ms "
+                f"(+{change * 100:.1f}%, Holm-adjusted p={p_value:.4f})"
+            )
+    return regressions
+
+
+def print_report(samples: Dict):
+    """Print percentile tables for every page and cache mode"""
+    for path, modes in samples.items():
+        for mode, metrics in modes.items():
+            print(f"\n📄 {path} [{mode}]")
+            print(f"   {'metric':<32}{'n':>4}{'p50':>10}{'p90':>10}{'p99':>10}   95% CI (p50)")
+            for metric, values in metrics.items():
+                if not values:
+                    continue
+                stats = summarize_samples(values)
+                print(
+                    f"   {metric:<32}{stats['n']:>4}{stats['p50']:>10}{stats['p90']:>10}{stats['p99']:>10}"
+                    f"   [{stats['ci95'][0]}, {stats['ci95'][1]}]"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FriendFilter.com page loads")
+    parser.add_argument("--runs", type=int, default=10, help="Navigations per page and cache mode")
+    parser.add_argument("--pages", nargs="+", default=BENCHMARK_PAGES, help="Paths to benchmark")
+    parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], default="chromium")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--local-server", action="store_true", help="Benchmark the bundled fixture server")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE, help="Baseline samples file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Family-wise significance level for regressions")
+    parser.add_argument("--min-change", type=float, default=0.05, help="Ignore median shifts below this fraction")
+    parser.add_argument("--output", help="Also write the raw samples to this JSON file")
+    args = parser.parse_args()
+
+    fixture_server = FixtureServer() if args.local_server else None
+    base_url = fixture_server.start() if fixture_server else args.base_url.rstrip("/")
+
+    print("🚀 FriendFilter.com Load Benchmark")
+    print("=" * 40)
+    try:
+        samples = run_benchmark(base_url, args.runs, args.pages, args.browser, headless=not args.headed)
+    finally:
+        if fixture_server:
+            fixture_server.stop()
+
+    print_report(samples)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(samples, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(samples, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(samples, baseline, args.alpha, args.min_change)
+    if regressions:
+        print("\n❌ Significant regressions:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+
+    print("\n✅ No statistically significant regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
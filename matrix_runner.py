@@ -0,0 +1,147 @@
+"""
+Cross-browser Matrix Runner for FriendFilter.com
+Runs test classes in every browser engine x viewport cell at once, one process per cell, and aggregates per cell
+"""
+
+import contextlib
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import test_friendfilter_comprehensive as suite
+
+
+ENGINES = ["chromium", "firefox", "webkit"]
+
+
+def cell_name(browser: str, viewport: str) -> str:
+    """e.g. firefox@375x812"""
+    return f"{browser}@{viewport}"
+
+
+def _run_cell(settings: Dict, class_names: List[str], tests: Optional[List[str]], max_failures: Optional[int],
+              quarantine: List[str], workers: int, concurrency: int) -> Dict:
+    """Run the classes in one engine/viewport cell (inside its own process) and return its results"""
+    suite.FriendFilterTestSuite.configure(**settings)
+    test_classes = [getattr(suite, class_name) for class_name in class_names]
+    name = cell_name(settings["default_browser"], settings["viewport"])
+
+    # Cells run side by side, so each one's console output is kept as an artifact instead of interleaving
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        print(f"🧮 Cell {name}")
+        try:
+            results = suite.run_test_classes(
+                test_classes, use_browser_pool=True, workers=workers, tests=tests, max_failures=max_failures,
+                quarantine=quarantine, concurrency=concurrency
+            )
+            error = None
+        except Exception as e:
+            results, error = {}, str(e)
+    wall_time = round(time.perf_counter() - started, 3)
+
+    log = suite.FriendFilterTestSuite.artifact_store().put(
+        output.getvalue().encode("utf-8"), "log", f"matrix/{name}", "stdout", ext="txt"
+    )
+    return {"results": results, "wall_time": wall_time, "error": error, "log": log["path"]}
+
+
+def run_matrix(test_classes: List, browsers: List[str], viewports: List[str], max_parallel: Optional[int] = None,
+               tests: Optional[List[str]] = None, max_failures: Optional[int] = None, quarantine: List[str] = (),
+               workers: int = 1, concurrency: int = 0) -> Dict[str, Dict]:
+    """Run every browser x viewport cell concurrently; returns cell name -> results and timing
+
+    max_failures, quarantine, workers and concurrency apply within each cell.
+    """
+    base_settings = suite.FriendFilterTestSuite.current_settings()
+    cells = [(browser, viewport) for browser in browsers for viewport in viewports]
+    print(f"\n🧮 Running {len(cells)} cells ({', '.join(cell_name(*cell) for cell in cells)}) in parallel...")
+
+    matrix = {}
+    started = time.perf_counter()
+    # Spawned processes start clean, so every cell launches its own engine at the same time
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_parallel or len(cells), mp_context=context) as executor:
+        futures = {}
+        for browser, viewport in cells:
+            settings = dict(base_settings, default_browser=browser, viewport=viewport, compatibility_engines=[browser])
+            # Classes pinned to other engines (e.g. CDP-based ones) are left out of this cell
+            class_names = [
+                test_class.__name__ for test_class in test_classes if suite.supports_engine(test_class, browser)
+            ]
+            cell_tests = tests if tests is None else [test for test in tests if test.split(".")[0] in class_names]
+            futures[executor.submit(
+                _run_cell, settings, class_names, cell_tests, max_failures, list(quarantine), workers, concurrency
+            )] = cell_name(browser, viewport)
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                matrix[name] = future.result()
+            except Exception as e:
+                # The cell's process died (e.g. the engine isn't installed and took it down)
+                matrix[name] = {"results": {}, "wall_time": None, "error": f"cell error: {e}", "log": None}
+            cell = summarize_cell(matrix[name])
+            status = "✅" if not cell["failed"] and not cell["error"] else "❌"
+            print(f"  {status} {name}: {cell['passed']} passed, {cell['failed']} failed"
+                  + (f", {cell['quarantined']} quarantined failures" if cell["quarantined"] else "")
+                  + (f" ({cell['wall_time']:.1f}s)" if cell["wall_time"] is not None else f" - {cell['error']}"))
+
+    total_wall = round(time.perf_counter() - started, 3)
+    matrix_order = {cell_name(*cell): index for index, cell in enumerate(cells)}
+    ordered = dict(sorted(matrix.items(), key=lambda item: matrix_order[item[0]]))
+    print(f"⏱️  Matrix finished in {total_wall:.1f}s "
+          f"(cells summed {sum(cell['wall_time'] or 0 for cell in ordered.values()):.1f}s)")
+    return ordered
+
+
+def summarize_cell(cell: Dict) -> Dict:
+    """Pass/fail counts and timing for one cell; quarantined failures are counted apart and don't fail it"""
+    results = [result for class_results in cell["results"].values() for result in class_results]
+    passed, failed, quarantined = suite.count_outcomes(results)
+    return {
+        "tests": len(results),
+        "passed": passed,
+        "failed": failed,
+        "quarantined": quarantined,
+        "test_time": round(sum(result.get("duration") or 0 for result in results), 3),
+        "wall_time": cell["wall_time"],
+        "error": cell["error"],
+    }
+
+
+def cell_specific_failures(matrix: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Tests that failed in some cells but passed in others: test -> failing cells"""
+    outcomes: Dict[str, Dict[str, str]] = {}
+    for name, cell in matrix.items():
+        for class_name, class_results in cell["results"].items():
+            for result in class_results:
+                if result.get("quarantined"):
+                    continue
+                outcomes.setdefault(f"{class_name}.{result['test']}", {})[name] = result["status"]
+    return {
+        test: sorted(name for name, status in statuses.items() if status == "FAILED")
+        for test, statuses in outcomes.items()
+        if "FAILED" in statuses.values() and "PASSED" in statuses.values()
+    }
+
+
+def format_matrix(matrix: Dict[str, Dict], root: str = "artifacts") -> str:
+    """Per-cell table plus the tests whose outcome depends on the cell"""
+    lines = [f"   {'cell':<26}{'tests':>6}{'passed':>8}{'failed':>8}{'quar.':>7}{'wall':>9}{'in tests':>10}  log"]
+    for name, cell in matrix.items():
+        summary = summarize_cell(cell)
+        wall = f"{summary['wall_time']:.1f}s" if summary["wall_time"] is not None else "-"
+        log = f"{root}/{cell['log']}" if cell["log"] else summary["error"]
+        lines.append(
+            f"   {name:<26}{summary['tests']:>6}{summary['passed']:>8}{summary['failed']:>8}{summary['quarantined']:>7}"
+            f"{wall:>9}{summary['test_time']:>9.1f}s  {log}"
+        )
+    differing = cell_specific_failures(matrix)
+    if differing:
+        lines.append("   Cell-specific failures:")
+        for test, cells in sorted(differing.items()):
+            lines.append(f"   ❌ {test}: {', '.join(cells)}")
+    return "\n".join(lines)
@@ -0,0 +1,165 @@
+"""
+Memory Soak for the FriendFilter.com dashboard
+Repeats search/filter cycles in one page, samples heap and DOM counters over CDP and fits a growth slope
+"""
+
+import json
+from typing import Dict, List, Optional
+
+
+SOAK_QUERIES = ["a", "friend", "1", ""]
+SOAK_FILTERS = ["Active", "Archived", "All"]
+
+
+class MemorySampler:
+    """Heap size and DOM node / listener counts for one page via CDP (Chromium only)"""
+
+    def __init__(self, context, page):
+        self.session = context.new_cdp_session(page)
+        self.session.send("HeapProfiler.enable")
+
+    def collect_garbage(self):
+        """Force a full GC so samples measure retained memory only"""
+        self.session.send("HeapProfiler.collectGarbage")
+
+    def sample(self, force_gc: bool = True) -> Dict:
+        """Current JS heap and DOM counters"""
+        if force_gc:
+            self.collect_garbage()
+        heap = self.session.send("Runtime.getHeapUsage")
+        counters = self.session.send("Memory.getDOMCounters")
+        return {
+            "heap_used": heap["usedSize"],
+            "heap_total": heap["totalSize"],
+            "documents": counters["documents"],
+            "nodes": counters["nodes"],
+            "listeners": counters["jsEventListeners"],
+        }
+
+    def heap_snapshot(self) -> Dict:
+        """Take a heap snapshot and return it parsed"""
+        chunks = []
+
+        def on_chunk(event):
+            chunks.append(event["chunk"])
+
+        self.session.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+        try:
+            self.session.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        finally:
+            self.session.remove_listener("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+        return json.loads("".join(chunks))
+
+    def close(self):
+        """Detach the CDP session"""
+        try:
+            self.session.detach()
+        except Exception:
+            pass
+
+
+def constructor_sizes(snapshot: Dict) -> Dict[str, Dict]:
+    """Count and self size of every constructor (or node type) in a heap snapshot"""
+    meta = snapshot["snapshot"]["meta"]
+    fields = meta["node_fields"]
+    type_names = meta["node_types"][0]
+    type_offset, name_offset, size_offset = fields.index("type"), fields.index("name"), fields.index("self_size")
+    strings = snapshot["strings"]
+    nodes = snapshot["nodes"]
+
+    sizes: Dict[str, Dict] = {}
+    for i in range(0, len(nodes), len(fields)):
+        node_type = type_names[nodes[i + type_offset]]
+        # Objects are named after their constructor; group other nodes by type, e.g. (closure)
+        name = strings[nodes[i + name_offset]] if node_type in ("object", "native") else f"({node_type})"
+        entry = sizes.setdefault(name, {"count": 0, "self_size": 0})
+        entry["count"] += 1
+        entry["self_size"] += nodes[i + size_offset]
+    return sizes
+
+
+def diff_constructors(before: Dict[str, Dict], after: Dict[str, Dict], limit: int = 10) -> List[Dict]:
+    """Constructors whose retained size grew the most between two snapshots"""
+    growth = []
+    for name, entry in after.items():
+        previous = before.get(name, {"count": 0, "self_size": 0})
+        size_delta = entry["self_size"] - previous["self_size"]
+        if size_delta > 0:
+            growth.append({
+                "constructor": name,
+                "count_delta": entry["count"] - previous["count"],
+                "size_delta": size_delta,
+            })
+    growth.sort(key=lambda item: item["size_delta"], reverse=True)
+    return growth[:limit]
+
+
+def linear_slope(xs: List[float], ys: List[float]) -> float:
+    """Least-squares slope of ys against xs"""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def run_cycle(dashboard, iteration: int):
+    """One search/filter/All cycle on a DashboardPage"""
+    dashboard.search_connections(SOAK_QUERIES[iteration % len(SOAK_QUERIES)])
+    for filter_type in SOAK_FILTERS:
+        dashboard.filter_connections(filter_type)
+        dashboard.wait_for_network_idle("**/api/**", idle_ms=100)
+
+
+def run_soak(dashboard, sampler: MemorySampler, iterations: int = 200, sample_every: int = 20,
+             snapshots: bool = False) -> Dict:
+    """Repeat dashboard cycles, sampling after a forced GC every sample_every iterations"""
+    # A first cycle warms caches and lazy code so it isn't mistaken for growth
+    run_cycle(dashboard, 0)
+    samples = [dict(sampler.sample(), iteration=0)]
+    before = constructor_sizes(sampler.heap_snapshot()) if snapshots else None
+
+    for iteration in range(1, iterations + 1):
+        run_cycle(dashboard, iteration)
+        if iteration % sample_every == 0 or iteration == iterations:
+            samples.append(dict(sampler.sample(), iteration=iteration))
+
+    retained = diff_constructors(before, constructor_sizes(sampler.heap_snapshot())) if snapshots else None
+    return {"samples": samples, "retained": retained}
+
+
+def analyze_soak(samples: List[Dict], max_heap_slope: float = 1024.0, min_growth: float = 0.1) -> Dict:
+    """Fit growth slopes (per iteration) and decide whether the heap is leaking"""
+    iterations = [sample["iteration"] for sample in samples]
+    slopes = {
+        key: round(linear_slope(iterations, [sample[key] for sample in samples]), 2)
+        for key in ("heap_used", "nodes", "listeners")
+    }
+    first, last = samples[0]["heap_used"], samples[-1]["heap_used"]
+    growth = (last - first) / first if first else 0.0
+    # Both a steady per-iteration climb and a real net increase, so GC noise doesn't count
+    leaking = len(samples) >= 3 and slopes["heap_used"] > max_heap_slope and growth > min_growth
+    return {
+        "slopes": slopes,
+        "heap_growth": round(growth, 3),
+        "heap_start": first,
+        "heap_end": last,
+        "leaking": leaking,
+    }
+
+
+def format_soak(analysis: Dict, retained: Optional[List[Dict]] = None) -> str:
+    """Summary of a soak run"""
+    slopes = analysis["slopes"]
+    lines = [
+        f"🧠 Heap {analysis['heap_start'] / 1024:.0f} → {analysis['heap_end'] / 1024:.0f} KB "
+        f"({analysis['heap_growth'] * 100:+.1f}%), slope {slopes['heap_used']:.0f} B/iter, "
+        f"nodes {slopes['nodes']:+.2f}/iter, listeners {slopes['listeners']:+.2f}/iter"
+    ]
+    for item in retained or []:
+        lines.append(f"   {item['constructor']:<40} +{item['count_delta']:>6} objects  +{item['size_delta'] / 1024:.1f} KB")
+    return "\n".join(lines)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Network Waterfall and Page Weight for FriendFilter.com pages
+Records every request made while a page object loads and summarizes bytes, parties, blocking and caching
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright.sync_api import sync_playwright
+
+from page_objects import DEFAULT_BASE_URL, DashboardPage, LandingPage, PricingPage
+from performance_metrics import check_budgets
+from resource_blocking import site_of
+
+
+WATERFALL_PAGES = {"/": LandingPage, "/pricing": PricingPage, "/dashboard": DashboardPage}
+
+# One evaluate: decoded sizes and cache hints from Resource Timing, plus render-blocking resources
+PAGE_RESOURCES_SCRIPT = """
+() => {
+    const entries = {};
+    for (const entry of performance.getEntriesByType("navigation").concat(performance.getEntriesByType("resource"))) {
+        entries[entry.name] = {
+            transfer: entry.transferSize,
+            encoded: entry.encodedBodySize,
+            decoded: entry.decodedBodySize,
+            blocking: entry.renderBlockingStatus || null,
+        };
+    }
+
+    // Fallback for engines without renderBlockingStatus: head stylesheets and classic sync scripts
+    const blocking = [];
+    for (const link of document.querySelectorAll('head link[rel="stylesheet"]')) {
+        const media = link.getAttribute("media");
+        if (!link.disabled && (!media || media === "all" || matchMedia(media).matches)) blocking.push(link.href);
+    }
+    for (const script of document.querySelectorAll("head script[src]")) {
+        if (!script.async && !script.defer && script.type !== "module") blocking.push(script.src);
+    }
+    return {entries: entries, blocking: blocking};
+}
+"""
+
+
+class NetworkWaterfall:
+    """Collects request/response events for one page"""
+
+    def __init__(self, page, base_url: str):
+        self.page = page
+        self.first_party = site_of(urlparse(base_url).hostname or "")
+        self.requests: List = []
+        self.responses: Dict = {}
+        self.finished = set()
+        self.failed: Dict = {}
+        self._listening = False
+
+    def start(self):
+        """Begin listening to the page's network events"""
+        self.page.on("request", self._on_request)
+        self.page.on("response", self._on_response)
+        self.page.on("requestfinished", self._on_finished)
+        self.page.on("requestfailed", self._on_failed)
+        self._listening = True
+        return self
+
+    def stop(self):
+        """Stop listening; already-collected events are kept"""
+        if self._listening:
+            self.page.remove_listener("request", self._on_request)
+            self.page.remove_listener("response", self._on_response)
+            self.page.remove_listener("requestfinished", self._on_finished)
+            self.page.remove_listener("requestfailed", self._on_failed)
+            self._listening = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _on_request(self, request):
+        self.requests.append(request)
+
+    def _on_response(self, response):
+        self.responses[id(response.request)] = response
+
+    def _on_finished(self, request):
+        self.finished.add(id(request))
+
+    def _on_failed(self, request):
+        self.failed[id(request)] = request.failure
+
+    def report(self) -> Dict:
+        """Build the waterfall; call after stop() once the page has loaded"""
+        sizes = {}
+        for request in self.requests:
+            if id(request) in self.finished:
+                try:
+                    sizes[id(request)] = request.sizes()
+                except Exception:
+                    pass
+        return self._build(self.page.evaluate(PAGE_RESOURCES_SCRIPT), sizes)
+
+    def _build(self, page_resources: Dict, sizes: Dict) -> Dict:
+        """Combine the recorded events, Playwright sizes and Resource Timing into one report"""
+        entries = page_resources.get("entries", {})
+        blocking_fallback = set(page_resources.get("blocking", []))
+        origin_time = min((r.timing["startTime"] for r in self.requests if r.timing.get("startTime", -1) > 0),
+                          default=0)
+
+        rows = []
+        for request in self.requests:
+            response = self.responses.get(id(request))
+            timing = request.timing or {}
+            entry = entries.get(request.url, {})
+            size = sizes.get(id(request), {})
+            host = urlparse(request.url).hostname or ""
+
+            compressed = size.get("responseBodySize", 0) + size.get("responseHeadersSize", 0)
+            decoded = entry.get("decoded") or size.get("responseBodySize", 0)
+            status = response.status if response else None
+            # Zero transfer with a body means memory/disk cache; 304 means a revalidated cache entry
+            cached = bool(
+                status == 304
+                or (response and response.from_service_worker)
+                or (entry.get("transfer") == 0 and (entry.get("decoded") or 0) > 0)
+            )
+            if entry.get("blocking"):
+                render_blocking = entry["blocking"] == "blocking"
+            else:
+                render_blocking = request.url in blocking_fallback
+
+            start = timing.get("startTime", -1)
+            rows.append({
+                "url": request.url,
+                "method": request.method,
+                "type": request.resource_type,
+                "status": status,
+                "failed": self.failed.get(id(request)),
+                "first_party": bool(host) and site_of(host) == self.first_party,
+                "render_blocking": render_blocking,
+                "cached": cached,
+                "compressed_bytes": compressed,
+                "decoded_bytes": decoded,
+                "start_ms": round(start - origin_time, 1) if start > 0 else None,
+                "ttfb_ms": _timing_delta(timing, "requestStart", "responseStart"),
+                "duration_ms": timing.get("responseEnd") if timing.get("responseEnd", -1) >= 0 else None,
+            })
+
+        rows.sort(key=lambda row: row["start_ms"] if row["start_ms"] is not None else float("inf"))
+        return {"requests": rows, "summary": summarize_rows(rows)}
+
+
+def _timing_delta(timing: Dict, start_key: str, end_key: str) -> Optional[float]:
+    """Difference between two Playwright timing marks, or None when either is missing"""
+    start, end = timing.get(start_key, -1), timing.get(end_key, -1)
+    return round(end - start, 1) if start >= 0 and end >= 0 else None
+
+
+def summarize_rows(rows: List[Dict]) -> Dict:
+    """Page weight totals for a waterfall"""
+    third_party = [row for row in rows if not row["first_party"]]
+    cacheable = [row for row in rows if row["status"] is not None]
+    by_type = {}
+    for row in rows:
+        bucket = by_type.setdefault(row["type"], {"requests": 0, "compressed_bytes": 0, "decoded_bytes": 0})
+        bucket["requests"] += 1
+        bucket["compressed_bytes"] += row["compressed_bytes"]
+        bucket["decoded_bytes"] += row["decoded_bytes"]
+    ends = [row["start_ms"] + row["duration_ms"] for row in rows
+            if row["start_ms"] is not None and row["duration_ms"] is not None]
+    return {
+        "requests": len(rows),
+        "failed_requests": sum(1 for row in rows if row["failed"]),
+        "compressed_bytes": sum(row["compressed_bytes"] for row in rows),
+        "decoded_bytes": sum(row["decoded_bytes"] for row in rows),
+        "third_party_requests": len(third_party),
+        "third_party_bytes": sum(row["compressed_bytes"] for row in third_party),
+        "render_blocking": sum(1 for row in rows if row["render_blocking"]),
+        "cache_hit_ratio": round(sum(1 for row in cacheable if row["cached"]) / len(cacheable), 3) if cacheable else 0.0,
+        "span_ms": round(max(ends), 1) if ends else None,
+        "by_type": by_type,
+    }
+
+
+def record_load(page_object) -> Dict:
+    """Load a page object (LandingPage, PricingPage, DashboardPage, ...) and return its waterfall"""
+    with NetworkWaterfall(page_object.page, page_object.base_url) as waterfall:
+        page_object.load()
+        page_object.page.wait_for_load_state("load")
+        page_object.wait_for_network_idle(idle_ms=250)
+    return waterfall.report()
+
+
+def format_waterfall(report: Dict, label: str = "", width: int = 40, limit: int = 15) -> str:
+    """Compact text summary: totals, then the first limit requests as a bar chart"""
+    summary = report["summary"]
+    lines = [
+        f"🌊 {label or 'Page'}: {summary['requests']} requests, "
+        f"{summary['compressed_bytes'] / 1024:.1f} KB transferred / {summary['decoded_bytes'] / 1024:.1f} KB decoded, "
+        f"3rd-party {summary['third_party_requests']} ({summary['third_party_bytes'] / 1024:.1f} KB), "
+        f"render-blocking {summary['render_blocking']}, cache hits {summary['cache_hit_ratio'] * 100:.0f}%"
+    ]
+    span = summary["span_ms"] or 1
+    for row in report["requests"][:limit]:
+        start = row["start_ms"] or 0
+        duration = row["duration_ms"] or 0
+        offset = int(start / span * width)
+        bar = " " * offset + "█" * max(1, int(duration / span * width))
+        flags = ("B" if row["render_blocking"] else " ") + ("C" if row["cached"] else " ") + (" " if row["first_party"] else "3")
+        name = urlparse(row["url"]).path[-30:] or "/"
+        lines.append(f"   {flags} {row['type'][:10]:<10} {name:<30} {row['compressed_bytes'] / 1024:>7.1f} KB |{bar:<{width}}|")
+    if limit and len(report["requests"]) > limit:
+        lines.append(f"   ... {len(report['requests']) - limit} more")
+    return "\n".join(lines)
+
+
+def weight_budget_violations(summary: Dict, budgets: Dict) -> List[str]:
+    """Check the weight.* entries of a merged budget (see performance_metrics.budgets_for)"""
+    weight_budgets = {path: limit for path, limit in budgets.items() if path.startswith("weight.")}
+    return check_budgets({"weight": summary}, weight_budgets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record network waterfalls for FriendFilter.com pages")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--output", default="waterfall.json", help="JSON report path")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args()
+
+    reports = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not args.headed)
+        try:
+            for path, page_class in WATERFALL_PAGES.items():
+                context = browser.new_context(viewport={'width': 1920, 'height': 1080})
+                reports[path] = record_load(page_class(context.new_page(), args.base_url))
+                context.close()
+                print(format_waterfall(reports[path], path))
+        finally:
+            browser.close()
+
+    with open(args.output, "w") as f:
+        json.dump(reports, f, indent=2)
+    print(f"\n💾 Waterfall JSON saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Batched DOM Audit for FriendFilter.com pages
+Collects images, meta tags and ARIA landmarks in one in-page evaluation so checks run in Python
+"""
+
+from typing import Dict, List, Optional
+
+
+LANDMARK_ROLES = ["main", "navigation", "banner", "contentinfo"]
+
+# Elements that carry a landmark role implicitly (header/footer only at the top level)
+IMPLICIT_LANDMARKS = {
+    "main": "main",
+    "navigation": "nav",
+    "banner": "body > header, body > div > header",
+    "contentinfo": "body > footer, body > div > footer",
+}
+
+AUDIT_SCRIPT = """
+([landmarkRoles, implicitLandmarks]) => {
+    const isVisible = element => {
+        const rect = element.getBoundingClientRect();
+        const style = getComputedStyle(element);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== "hidden";
+    };
+
+    // Byte sizes come from Resource Timing, keyed by absolute URL
+    const resourceBytes = {};
+    for (const entry of performance.getEntriesByType("resource")) {
+        resourceBytes[entry.name] = {
+            transfer: entry.transferSize || 0,
+            encoded: entry.encodedBodySize || 0,
+            decoded: entry.decodedBodySize || 0,
+        };
+    }
+
+    const images = Array.from(document.images).map(img => {
+        const rect = img.getBoundingClientRect();
+        const source = img.currentSrc || img.src;
+        const bytes = resourceBytes[source] || null;
+        return {
+            src: source,
+            alt: img.getAttribute("alt"),
+            loading: img.getAttribute("loading"),
+            complete: img.complete,
+            visible: isVisible(img),
+            natural_width: img.naturalWidth,
+            natural_height: img.naturalHeight,
+            rendered_width: Math.round(rect.width),
+            rendered_height: Math.round(rect.height),
+            transfer_bytes: bytes ? bytes.transfer : null,
+            encoded_bytes: bytes ? bytes.encoded : null,
+        };
+    });
+
+    const meta = {};
+    for (const tag of document.querySelectorAll("meta[name], meta[property]")) {
+        const key = tag.getAttribute("name") || tag.getAttribute("property");
+        if (!(key in meta)) meta[key] = tag.getAttribute("content");
+    }
+
+    const landmarks = {};
+    for (const role of landmarkRoles) {
+        const explicit = Array.from(document.querySelectorAll(`[role="${role}"]`));
+        const implicit = Array.from(document.querySelectorAll(implicitLandmarks[role]))
+            .filter(element => !element.hasAttribute("role"));
+        landmarks[role] = {
+            count: explicit.length,
+            visible: explicit.length > 0 && explicit.every(isVisible),
+            implicit_count: implicit.length,
+        };
+    }
+
+    return {
+        url: location.href,
+        title: document.title,
+        lang: document.documentElement.getAttribute("lang"),
+        images: images,
+        meta: meta,
+        landmarks: landmarks,
+    };
+}
+"""
+
+
+def audit_args() -> List:
+    """Arguments passed to AUDIT_SCRIPT: the landmark roles and the elements that imply them"""
+    return [LANDMARK_ROLES, IMPLICIT_LANDMARKS]
+
+
+def audit_page(page) -> Dict:
+    """Run the whole audit in a single round trip and return the report"""
+    return page.evaluate(AUDIT_SCRIPT, audit_args())
+
+
+def images_missing_alt(report: Dict) -> List[str]:
+    """Sources of images without an alt attribute (empty alt is fine for decorative images)"""
+    return [image["src"] for image in report["images"] if image["alt"] is None]
+
+
+def oversized_images(report: Dict, max_ratio: float = 2.0) -> List[Dict]:
+    """Visible images whose intrinsic size is more than max_ratio times their rendered size"""
+    oversized = []
+    for image in report["images"]:
+        if not image["visible"] or not image["rendered_width"] or not image["rendered_height"]:
+            continue
+        ratio = max(
+            image["natural_width"] / image["rendered_width"],
+            image["natural_height"] / image["rendered_height"]
+        )
+        if ratio > max_ratio:
+            oversized.append(dict(image, ratio=round(ratio, 2)))
+    return oversized
+
+
+def meta_content(report: Dict, key: str) -> Optional[str]:
+    """Content of a meta tag by name or property, or None when the tag is absent"""
+    return report["meta"].get(key)
+
+
+def summarize_audit(report: Dict) -> Dict:
+    """Compact numbers worth keeping with a test result"""
+    known_bytes = [image["transfer_bytes"] for image in report["images"] if image["transfer_bytes"] is not None]
+    return {
+        "images": len(report["images"]),
+        "images_missing_alt": len(images_missing_alt(report)),
+        "oversized_images": len(oversized_images(report)),
+        "image_bytes": sum(known_bytes),
+        "meta_tags": len(report["meta"]),
+        "landmarks": {role: entry["count"] for role, entry in report["landmarks"].items()},
+    }
@@ -3,16 +3,113 @@ Page Object Models for FriendFilter.com
 This file contains reusable page objects for better test organization
 """
 
-from playwright.sync_api import Page, expect
-from typing import Optional
+import os
+import re
+import time
+import weakref
+from collections import deque
+from fnmatch import fnmatch
+from playwright.sync_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from typing import Dict, List, Optional, Union
+
+from artifact_store import ArtifactStore
+from async_bridge import expect
+from failure_capture import capture_for
+
+
+# Override with FRIENDFILTER_BASE_URL to point tests at a staging or local fixture server
+DEFAULT_BASE_URL = os.environ.get("FRIENDFILTER_BASE_URL", "https://friendfilter.com")
+
+# Resolves true once the DOM has gone quiet_ms without mutations, false if timeout_ms passes first
+DOM_SETTLED_SCRIPT = """
+([quietMs, timeoutMs]) => new Promise(resolve => {
+    let quietTimer;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(done, quietMs, true);
+    });
+    const giveUp = setTimeout(done, timeoutMs, false);
+    function done(settled) {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(giveUp);
+        resolve(settled);
+    }
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(done, quietMs, true);
+})
+"""
+
+
+TEXT_OR_DEFAULT_SCRIPT = """
+(elements, fallback) => elements.length ? elements[0].textContent : fallback
+"""
+
+ATTRIBUTE_OR_DEFAULT_SCRIPT = """
+(elements, [name, fallback]) => elements.length && elements[0].hasAttribute(name)
+    ? elements[0].getAttribute(name)
+    : fallback
+"""
+
+# One network tracker per page, shared by every page object built on it
+_NETWORK_ACTIVITY = weakref.WeakKeyDictionary()
+
+
+class NetworkActivity:
+    """In-flight request counts and recent request activity for one page"""
+    
+    def __init__(self, page: Page):
+        self.inflight = {}
+        self.recent = deque(maxlen=500)
+        page.on("request", self._on_request_started)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+    
+    def _on_request_started(self, request):
+        self.inflight[request.url] = self.inflight.get(request.url, 0) + 1
+        self.recent.append((time.perf_counter(), request.url))
+    
+    def _on_request_done(self, request):
+        remaining = self.inflight.get(request.url, 0) - 1
+        if remaining > 0:
+            self.inflight[request.url] = remaining
+        else:
+            self.inflight.pop(request.url, None)
+        self.recent.append((time.perf_counter(), request.url))
+
+
+def network_activity_for(page: Page) -> NetworkActivity:
+    """The page's network tracker, registering its listeners the first time"""
+    try:
+        activity = _NETWORK_ACTIVITY.get(page)
+        if activity is None:
+            activity = _NETWORK_ACTIVITY[page] = NetworkActivity(page)
+        return activity
+    except TypeError:
+        # Pages that can't be weakly referenced get a tracker of their own
+        return NetworkActivity(page)
 
 
 class BasePage:
     """Base page object with common functionality"""
     
-    def __init__(self, page: Page):
+    # How long act-if-present primitives wait for an element to show up and become actionable (ms)
+    present_timeout = 1000
+    
+    def __init__(self, page: Page, base_url: Optional[str] = None):
         self.page = page
-        self.base_url = "https://friendfilter.com"
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        
+        # Every condition wait is logged with how long it took
+        self.wait_log: List[Dict] = []
+        
+        # Network bookkeeping for wait_for_network_idle, shared with other page objects on this page
+        self._network = network_activity_for(page)
+        
+        # Actions land in the context's failure ring when failure capture is on
+        capture = capture_for(page)
+        if capture:
+            capture.wrap(self)
     
     def navigate_to(self, path: str = ""):
         """Navigate to a specific path on the website"""
@@ -24,9 +121,133 @@ class BasePage:
         """Wait for an element to be visible"""
         return self.page.wait_for_selector(selector, timeout=timeout)
     
-    def take_screenshot(self, name: str):
-        """Take a screenshot for debugging"""
-        self.page.screenshot(path=f"screenshots/{name}.png")
+    def wait_for_network_idle(self, url_pattern: Union[str, re.Pattern] = "**/*", idle_ms: int = 500,
+                              timeout: int = 10000) -> bool:
+        """Wait until no request matching url_pattern has been in flight for idle_ms"""
+        started = time.perf_counter()
+        deadline = started + timeout / 1000
+        
+        while True:
+            now = time.perf_counter()
+            busy = any(self._url_matches(url, url_pattern) for url in self._network.inflight)
+            last_activity = max(
+                (at for at, url in self._network.recent if self._url_matches(url, url_pattern)),
+                default=started - idle_ms / 1000
+            )
+            if not busy and (now - last_activity) * 1000 >= idle_ms:
+                return self._record_wait(f"network idle {url_pattern}", started, True)
+            if now >= deadline:
+                return self._record_wait(f"network idle {url_pattern}", started, False)
+            # Yield to the driver so request events are delivered while we wait
+            self.page.wait_for_timeout(min(50, (deadline - now) * 1000))
+    
+    def wait_for_dom_settled(self, quiet_ms: int = 300, timeout: int = 5000) -> bool:
+        """Wait until the DOM has gone quiet_ms without mutations"""
+        started = time.perf_counter()
+        try:
+            settled = self.page.evaluate(DOM_SETTLED_SCRIPT, [quiet_ms, timeout])
+        except PlaywrightError:
+            # A navigation replaced the document mid-wait, observe the new one
+            self.page.wait_for_load_state("domcontentloaded", timeout=timeout)
+            remaining = max(timeout - (time.perf_counter() - started) * 1000, quiet_ms)
+            settled = self.page.evaluate(DOM_SETTLED_SCRIPT, [quiet_ms, remaining])
+        return self._record_wait("dom settled", started, settled)
+    
+    def wait_for_element_state(self, selector: str, state: str = "visible", timeout: int = 5000) -> bool:
+        """Wait for an element to become attached, detached, visible or hidden"""
+        started = time.perf_counter()
+        try:
+            self.page.locator(selector).first.wait_for(state=state, timeout=timeout)
+            satisfied = True
+        except PlaywrightTimeoutError:
+            satisfied = False
+        return self._record_wait(f"{selector} {state}", started, satisfied)
+    
+    def wait_for_text_change(self, selector: str, previous_text: Optional[str] = None, timeout: int = 5000) -> bool:
+        """Wait for an element's text to differ from previous_text (its current text by default)"""
+        locator = self.page.locator(selector).first
+        if previous_text is None:
+            previous_text = locator.text_content() or ""
+        started = time.perf_counter()
+        try:
+            expect(locator).not_to_have_text(previous_text, timeout=timeout)
+            satisfied = True
+        except AssertionError:
+            satisfied = False
+        return self._record_wait(f"{selector} text change", started, satisfied)
+    
+    def wait_for_url_change(self, previous_url: Optional[str] = None, timeout: int = 5000) -> bool:
+        """Wait for the page to navigate away from previous_url (the current URL by default)"""
+        previous_url = previous_url or self.page.url
+        started = time.perf_counter()
+        try:
+            self.page.wait_for_url(lambda url: url != previous_url, timeout=timeout)
+            satisfied = True
+        except PlaywrightTimeoutError:
+            satisfied = False
+        return self._record_wait("url change", started, satisfied)
+    
+    def click_if_present(self, selector: str, index: int = 0) -> bool:
+        """Click the index-th match in one call, with actionability checks; returns whether it was clickable"""
+        try:
+            self.page.locator(selector).nth(index).click(timeout=self.present_timeout)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+    
+    def click_if_present_expecting_popup(self, selector: str, timeout: int = 10000):
+        """Click the first match and return the popup it opens, or None if not found"""
+        popups = []
+        
+        def on_popup(popup):
+            popups.append(popup)
+        
+        # Listen before clicking so a popup delivered with the click's response isn't missed
+        self.page.once("popup", on_popup)
+        if not self.click_if_present(selector):
+            self.page.remove_listener("popup", on_popup)
+            return None
+        return popups[0] if popups else self.page.wait_for_event("popup", timeout=timeout)
+    
+    def fill_if_present(self, selector: str, value: str) -> bool:
+        """Fill the first match in one call, with actionability checks; returns whether it was fillable"""
+        try:
+            self.page.locator(selector).first.fill(value, timeout=self.present_timeout)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+    
+    def text_or_default(self, selector: str, default: str = "") -> str:
+        """Text of the first match, or default when nothing matches"""
+        return self.page.locator(selector).evaluate_all(TEXT_OR_DEFAULT_SCRIPT, default)
+    
+    def attribute_or_default(self, selector: str, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Attribute of the first match, or default when nothing matches"""
+        return self.page.locator(selector).evaluate_all(ATTRIBUTE_OR_DEFAULT_SCRIPT, [name, default])
+    
+    def total_wait_time(self) -> float:
+        """Seconds spent in condition waits on this page so far"""
+        return round(sum(entry["waited"] for entry in self.wait_log), 3)
+    
+    def _record_wait(self, condition: str, started: float, satisfied: bool) -> bool:
+        """Log one condition wait and pass its outcome through"""
+        self.wait_log.append({
+            "condition": condition,
+            "waited": round(time.perf_counter() - started, 3),
+            "satisfied": bool(satisfied)
+        })
+        return bool(satisfied)
+    
+    def _url_matches(self, url: str, url_pattern: Union[str, re.Pattern]) -> bool:
+        """Match a URL against a glob (as in page.route) or a compiled regex"""
+        if isinstance(url_pattern, re.Pattern):
+            return bool(url_pattern.search(url))
+        return fnmatch(url, url_pattern)
+    
+    def take_screenshot(self, name: str, test: str = "adhoc", store: Optional[ArtifactStore] = None) -> Dict:
+        """Take a screenshot for debugging and keep it in the artifact store"""
+        store = store or ArtifactStore.from_env()
+        return store.put(self.page.screenshot(), "screenshot", test, name)
 
 
 class LandingPage(BasePage):
@@ -39,8 +260,8 @@ class LandingPage(BasePage):
     CTA_BUTTONS = 'text="Get Started", text="Start Free Trial"'
     FEATURES_SECTION = '.features, #features'
     
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        super().__init__(page, base_url)
     
     def load(self):
         """Load the landing page"""
@@ -49,23 +270,15 @@ class LandingPage(BasePage):
     
     def click_chrome_extension_button(self):
         """Click the Chrome extension installation button"""
-        button = self.page.locator(self.CHROME_EXTENSION_BUTTON)
-        if button.count() > 0:
-            with self.page.expect_popup() as popup_info:
-                button.click()
-            return popup_info.value
-        return None
+        return self.click_if_present_expecting_popup(self.CHROME_EXTENSION_BUTTON)
     
     def get_main_heading(self) -> str:
         """Get the main heading text"""
-        heading = self.page.locator(self.MAIN_HEADING)
-        return heading.text_content() if heading.count() > 0 else ""
+        return self.text_or_default(self.MAIN_HEADING, "")
     
-    def click_cta_button(self):
+    def click_cta_button(self) -> bool:
         """Click the main CTA button"""
-        cta = self.page.locator(self.CTA_BUTTONS).first
-        if cta.count() > 0:
-            cta.click()
+        return self.click_if_present(self.CTA_BUTTONS)
     
     def is_loaded(self) -> bool:
         """Check if the page is properly loaded"""
@@ -85,43 +298,32 @@ class AuthenticationPage(BasePage):
     FORGOT_PASSWORD_LINK = 'text="Forgot Password"'
     ERROR_MESSAGE = '.error, .alert-error, [role="alert"]'
     
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        super().__init__(page, base_url)
     
-    def fill_email(self, email: str):
+    def fill_email(self, email: str) -> bool:
         """Fill the email field"""
-        email_field = self.page.locator(self.EMAIL_INPUT)
-        if email_field.count() > 0:
-            email_field.fill(email)
+        return self.fill_if_present(self.EMAIL_INPUT, email)
     
-    def fill_password(self, password: str):
+    def fill_password(self, password: str) -> bool:
         """Fill the password field"""
-        password_field = self.page.locator(self.PASSWORD_INPUT)
-        if password_field.count() > 0:
-            password_field.fill(password)
+        return self.fill_if_present(self.PASSWORD_INPUT, password)
     
-    def fill_confirm_password(self, password: str):
+    def fill_confirm_password(self, password: str) -> bool:
         """Fill the confirm password field (for signup)"""
-        confirm_field = self.page.locator(self.CONFIRM_PASSWORD_INPUT)
-        if confirm_field.count() > 0:
-            confirm_field.fill(password)
+        return self.fill_if_present(self.CONFIRM_PASSWORD_INPUT, password)
     
-    def submit_form(self):
+    def submit_form(self) -> bool:
         """Submit the authentication form"""
-        submit_button = self.page.locator(self.LOGIN_BUTTON)
-        if submit_button.count() > 0:
-            submit_button.click()
+        return self.click_if_present(self.LOGIN_BUTTON)
     
-    def click_forgot_password(self):
+    def click_forgot_password(self) -> bool:
         """Click the forgot password link"""
-        link = self.page.locator(self.FORGOT_PASSWORD_LINK)
-        if link.count() > 0:
-            link.click()
+        return self.click_if_present(self.FORGOT_PASSWORD_LINK)
     
     def get_error_message(self) -> str:
         """Get any error message displayed"""
-        error = self.page.locator(self.ERROR_MESSAGE)
-        return error.text_content() if error.count() > 0 else ""
+        return self.text_or_default(self.ERROR_MESSAGE, "")
     
     def login(self, email: str, password: str):
         """Complete login flow"""
@@ -148,8 +350,8 @@ class PricingPage(BasePage):
     PREMIUM_PLAN = 'text="Premium", text="Pro", .premium-plan'
     BILLING_TOGGLE = '.billing-toggle, input[type="checkbox"]'
     
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        super().__init__(page, base_url)
     
     def load(self):
         """Load the pricing page"""
@@ -160,17 +362,13 @@ class PricingPage(BasePage):
         """Get the number of pricing plan cards"""
         return self.page.locator(self.PRICING_CARDS).count()
     
-    def select_plan(self, plan_index: int = 0):
+    def select_plan(self, plan_index: int = 0) -> bool:
         """Select a pricing plan by index"""
-        select_buttons = self.page.locator(self.SELECT_PLAN_BUTTONS)
-        if select_buttons.count() > plan_index:
-            select_buttons.nth(plan_index).click()
+        return self.click_if_present(self.SELECT_PLAN_BUTTONS, index=plan_index)
     
-    def toggle_billing_period(self):
+    def toggle_billing_period(self) -> bool:
         """Toggle between monthly/yearly billing"""
-        toggle = self.page.locator(self.BILLING_TOGGLE)
-        if toggle.count() > 0:
-            toggle.click()
+        return self.click_if_present(self.BILLING_TOGGLE)
 
 
 class DashboardPage(BasePage):
@@ -185,31 +383,28 @@ class DashboardPage(BasePage):
     WHITELIST_SECTION = '.whitelist, [data-testid="whitelist"]'
     SETTINGS_BUTTON = 'text="Settings", [data-testid="settings"]'
     
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        super().__init__(page, base_url)
     
     def load(self):
         """Load the dashboard page"""
         self.navigate_to("/dashboard")
         return self
     
-    def search_connections(self, query: str):
+    def search_connections(self, query: str) -> bool:
         """Search for connections"""
-        search_input = self.page.locator(self.SEARCH_INPUT)
-        if search_input.count() > 0:
-            search_input.fill(query)
-            search_input.press("Enter")
+        found = self.fill_if_present(self.SEARCH_INPUT, query)
+        if found:
+            self.page.locator(self.SEARCH_INPUT).first.press("Enter")
+        return found
     
-    def filter_connections(self, filter_type: str):
+    def filter_connections(self, filter_type: str) -> bool:
         """Filter connections by type (Active, Archived, All)"""
-        filter_button = self.page.locator(f'text="{filter_type}"')
-        if filter_button.count() > 0:
-            filter_button.click()
+        return self.click_if_present(f'text="{filter_type}"')
     
     def get_connections_count(self) -> str:
         """Get the connections count display"""
-        count_element = self.page.locator(self.CONNECTIONS_COUNT)
-        return count_element.text_content() if count_element.count() > 0 else "0"
+        return self.text_or_default(self.CONNECTIONS_COUNT, "0")
     
     def is_loaded(self) -> bool:
         """Check if dashboard is loaded"""
@@ -226,22 +421,16 @@ class ExtensionPage(BasePage):
     PRIVACY_INFO = '.privacy, text="Privacy"'
     INSTALLATION_STEPS = '.installation-steps, .setup-guide'
     
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        super().__init__(page, base_url)
     
     def click_chrome_store_link(self):
         """Click the Chrome Web Store link"""
-        link = self.page.locator(self.CHROME_WEB_STORE_LINK)
-        if link.count() > 0:
-            with self.page.expect_popup() as popup_info:
-                link.click()
-            return popup_info.value
-        return None
+        return self.click_if_present_expecting_popup(self.CHROME_WEB_STORE_LINK)
     
     def get_chrome_store_url(self) -> str:
         """Get the Chrome Web Store URL"""
-        link = self.page.locator(self.CHROME_WEB_STORE_LINK)
-        return link.get_attribute('href') if link.count() > 0 else ""
+        return self.attribute_or_default(self.CHROME_WEB_STORE_LINK, "href", "")
     
     def check_permissions_displayed(self) -> bool:
         """Check if permissions information is displayed"""
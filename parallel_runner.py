@@ -0,0 +1,66 @@
+"""
+Parallel Test Runner for FriendFilter.com
+Spreads test methods across a process pool, each worker owning its own Playwright driver
+"""
+
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import test_friendfilter_comprehensive as suite
+
+
+def _init_worker(settings: Dict):
+    """Give the worker process the parent's run settings and its own browser pool"""
+    suite.FriendFilterTestSuite.configure(**settings)
+    atexit.register(_close_worker_pool)
+
+
+def _close_worker_pool():
+    """Close the worker's pool when the process pool shuts it down"""
+    pool_report = suite.FriendFilterTestSuite.close_browser_pool()
+    if pool_report:
+        print(f"[worker {multiprocessing.current_process().name}] {pool_report}")
+
+
+def _run_task(class_name: str, method_name: str) -> Dict:
+    """Run a single test method inside a worker process"""
+    test_class = getattr(suite, class_name)
+    return suite.run_test_with_retries(test_class(), method_name)
+
+
+def run_parallel(tests: List[str], workers: int, use_browser_pool: bool = True,
+                 max_failures: Optional[int] = None) -> Dict[str, Dict]:
+    """Run ClassName.test_method ids on a pool of worker processes, starting them in the given order"""
+    settings = suite.FriendFilterTestSuite.current_settings()
+    settings["use_browser_pool"] = use_browser_pool
+
+    tasks = [tuple(test.split(".")) for test in tests]
+    print(f"\n🧵 Running {len(tasks)} tests on {workers} workers...")
+
+    finished = {}
+    # Spawned workers start clean instead of inheriting the parent's driver state
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(settings,)) as executor:
+        # Submission order is start order: longest-first here is LPT scheduling on the pool
+        futures = {executor.submit(_run_task, *task): task for task in tasks}
+        failures = 0
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            class_name, method_name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # A worker died (e.g. browser crash took the process down)
+                print(f"  ❌ {method_name} - FAILED: worker error: {str(e)}")
+                result = {"test": method_name, "status": "FAILED", "error": f"worker error: {str(e)}"}
+            finished[f"{class_name}.{method_name}"] = result
+            failures += result["status"] == "FAILED"
+            if max_failures and failures >= max_failures:
+                # Tests already running finish; queued ones never start
+                for pending in futures:
+                    pending.cancel()
+    return finished
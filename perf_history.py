@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Performance History for FriendFilter.com test runs
+Appends every run's test durations and page metrics to SQLite and flags change-points across runs
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+
+DEFAULT_HISTORY_DB = "perf_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    commit_sha TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    viewport TEXT NOT NULL,
+    profile TEXT NOT NULL DEFAULT 'none',
+    base_url TEXT,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results(test, run_id);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics(test, name, run_id);
+"""
+
+
+def current_commit() -> str:
+    """Commit under test: $GIT_COMMIT if set, else the checkout's HEAD"""
+    if os.environ.get("GIT_COMMIT"):
+        return os.environ["GIT_COMMIT"]
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten_metrics(metrics: Dict, prefix: str = "") -> Dict[str, float]:
+    """Flatten nested numeric metrics into dotted names (lists such as slowest resources are skipped)"""
+    flat = {}
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+class PerfHistory:
+    """SQLite store of per-test durations and metrics, one row set per run"""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_DB):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        if "profile" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE runs ADD COLUMN profile TEXT NOT NULL DEFAULT 'none'")
+
+    def close(self):
+        """Close the database"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_run(self, results: Dict, browser: str = "chromium", viewport: str = "1920x1080",
+                   profile: Optional[str] = None, base_url: Optional[str] = None,
+                   settings: Optional[Dict] = None, commit: Optional[str] = None) -> int:
+        """Append a results dict ({class: [result, ...]}) and return the new run id"""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, commit_sha, browser, viewport, profile, base_url, settings) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), commit or current_commit(), browser, viewport, profile or "none", base_url,
+                 json.dumps(settings or {}, default=str))
+            )
+            run_id = cursor.lastrowid
+            for class_name, class_results in results.items():
+                for result in class_results:
+                    test = f"{class_name}.{result['test']}"
+                    self.connection.execute(
+                        "INSERT INTO results (run_id, test, status, duration, error) VALUES (?, ?, ?, ?, ?)",
+                        (run_id, test, result["status"], result.get("duration"), result.get("error"))
+                    )
+                    # Every retry attempt, so flake rates can be computed across runs
+                    attempts = result.get("attempts") or [result]
+                    self.connection.executemany(
+                        "INSERT INTO attempts (run_id, test, attempt, status, duration) VALUES (?, ?, ?, ?, ?)",
+                        [(run_id, test, number, attempt["status"], attempt.get("duration"))
+                         for number, attempt in enumerate(attempts, 1)]
+                    )
+                    self.connection.executemany(
+                        "INSERT INTO metrics (run_id, test, name, value) VALUES (?, ?, ?, ?)",
+                        [(run_id, test, name, value)
+                         for name, value in flatten_metrics(result.get("metrics") or {}).items()]
+                    )
+        return run_id
+
+    def runs(self, limit: int = 20) -> List[Dict]:
+        """Most recent runs with their pass counts, newest first"""
+        rows = self.connection.execute(
+            "SELECT runs.id, runs.started_at, runs.commit_sha, runs.browser, runs.viewport, runs.profile, "
+            "COUNT(results.test), SUM(results.status = 'PASSED') "
+            "FROM runs LEFT JOIN results ON results.run_id = runs.id "
+            "GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        keys = ["id", "started_at", "commit", "browser", "viewport", "profile", "tests", "passed"]
+        return [dict(zip(keys, row)) for row in rows]
+
+    def series(self, test: str, metric: str = "duration", browser: Optional[str] = None,
+               viewport: Optional[str] = None, profile: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Dict]:
+        """Oldest-first values of one test's duration or metric, optionally for one browser/viewport/profile"""
+        if metric == "duration":
+            query = ("SELECT runs.id, runs.commit_sha, results.duration FROM results "
+                     "JOIN runs ON runs.id = results.run_id "
+                     "WHERE results.test = ? AND results.status = 'PASSED' AND results.duration IS NOT NULL")
+            params = [test]
+        else:
+            query = ("SELECT runs.id, runs.commit_sha, metrics.value FROM metrics "
+                     "JOIN runs ON runs.id = metrics.run_id WHERE metrics.test = ? AND metrics.name = ?")
+            params = [test, metric]
+        if browser:
+            query += " AND runs.browser = ?"
+            params.append(browser)
+        if viewport:
+            query += " AND runs.viewport = ?"
+            params.append(viewport)
+        if profile:
+            query += " AND runs.profile = ?"
+            params.append(profile)
+        query += " ORDER BY runs.id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self.connection.execute(query, params).fetchall()
+        return [{"run": run_id, "commit": commit, "value": value} for run_id, commit, value in reversed(rows)]
+
+    def recent_durations(self, window: int = 10, browser: Optional[str] = None) -> Dict[str, List[float]]:
+        """Each test's durations over its last window runs, newest first, whatever the outcome"""
+        query = ("SELECT results.test, results.duration FROM results JOIN runs ON runs.id = results.run_id "
+                 "WHERE results.duration IS NOT NULL")
+        params = []
+        if browser:
+            query += " AND runs.browser = ?"
+            params.append(browser)
+        durations: Dict[str, List[float]] = {}
+        for test, duration in self.connection.execute(query + " ORDER BY runs.id DESC", params):
+            values = durations.setdefault(test, [])
+            if len(values) < window:
+                values.append(duration)
+        return durations
+
+    def recent_outcomes(self, window: int = 20) -> Dict[str, List[bool]]:
+        """Each test's pass (True) / fail (False) outcomes over its last window runs, newest first"""
+        outcomes: Dict[str, List[bool]] = {}
+        rows = self.connection.execute("SELECT test, status FROM results ORDER BY run_id DESC")
+        for test, status in rows:
+            values = outcomes.setdefault(test, [])
+            if len(values) < window:
+                values.append(status == "PASSED")
+        return outcomes
+
+    def flake_rates(self, window: int = 20) -> Dict[str, Dict]:
+        """Per test over its last window runs: how often it both failed and passed within a run or across runs"""
+        rows = self.connection.execute(
+            "SELECT test, run_id, SUM(status = 'PASSED'), COUNT(*), SUM(CASE WHEN attempt > 1 THEN duration END) "
+            "FROM attempts GROUP BY test, run_id ORDER BY run_id DESC"
+        )
+        rates: Dict[str, Dict] = {}
+        for test, _, passed, attempts, retry_time in rows:
+            entry = rates.setdefault(test, {"runs": 0, "flaky_runs": 0, "retries": 0, "retry_time": 0.0})
+            if entry["runs"] >= window:
+                continue
+            entry["runs"] += 1
+            entry["flaky_runs"] += 0 < passed < attempts
+            entry["retries"] += attempts - 1
+            entry["retry_time"] = round(entry["retry_time"] + (retry_time or 0.0), 3)
+
+        for test, (flips, pairs) in self.outcome_flips(window).items():
+            entry = rates.setdefault(test, {"runs": 0, "flaky_runs": 0, "retries": 0, "retry_time": 0.0})
+            entry["flips"] = flips
+            entry["flip_rate"] = round(flips / pairs, 3) if pairs and flips >= 2 else 0.0
+        for entry in rates.values():
+            entry.setdefault("flips", 0)
+            retry_rate = entry["flaky_runs"] / entry["runs"] if entry["runs"] else 0.0
+            entry["flake_rate"] = round(max(retry_rate, entry.get("flip_rate", 0.0)), 3)
+        return rates
+
+    def outcome_flips(self, window: int = 20) -> Dict[str, tuple]:
+        """Per test: (pass/fail changes between consecutive runs, consecutive run pairs) over its last window runs
+
+        Runs are only compared within one browser, viewport and profile. A single change is a regression or a
+        fix, so flake_rates only counts tests that changed outcome at least twice.
+        """
+        rows = self.connection.execute(
+            "SELECT results.test, runs.browser, runs.viewport, runs.profile, results.status "
+            "FROM results JOIN runs ON runs.id = results.run_id "
+            "WHERE results.status IN ('PASSED', 'FAILED') ORDER BY results.run_id DESC"
+        )
+        series: Dict[tuple, List[str]] = {}
+        for test, browser, viewport, profile, status in rows:
+            statuses = series.setdefault((test, browser, viewport, profile), [])
+            if len(statuses) < window:
+                statuses.append(status)
+        flips: Dict[str, tuple] = {}
+        for (test, *_), statuses in series.items():
+            changed, pairs = flips.get(test, (0, 0))
+            changed += sum(newer != older for newer, older in zip(statuses, statuses[1:]))
+            flips[test] = (changed, pairs + len(statuses) - 1)
+        return flips
+
+    def tracked_series(self) -> List[tuple]:
+        """Every (test, metric, browser, viewport, profile) combination with recorded values"""
+        durations = self.connection.execute(
+            "SELECT DISTINCT results.test, 'duration', runs.browser, runs.viewport, runs.profile "
+            "FROM results JOIN runs ON runs.id = results.run_id"
+        ).fetchall()
+        metrics = self.connection.execute(
+            "SELECT DISTINCT metrics.test, metrics.name, runs.browser, runs.viewport, runs.profile "
+            "FROM metrics JOIN runs ON runs.id = metrics.run_id"
+        ).fetchall()
+        return sorted(durations + metrics)
+
+    def change_points(self, threshold: float = 0.2, window: int = 5, metric: Optional[str] = None) -> List[Dict]:
+        """Series whose median over the last window runs moved more than threshold from the window before"""
+        flagged = []
+        for test, name, browser, viewport, profile in self.tracked_series():
+            if metric and name != metric:
+                continue
+            points = self.series(test, name, browser, viewport, profile, limit=window * 2)
+            values = [point["value"] for point in points]
+            if len(values) < window * 2:
+                continue
+            before = statistics.median(values[:window])
+            after = statistics.median(values[window:])
+            if not before:
+                continue
+            change = (after - before) / before
+            if abs(change) > threshold:
+                flagged.append({
+                    "test": test, "metric": name, "browser": browser, "viewport": viewport, "profile": profile,
+                    "before": round(before, 3), "after": round(after, 3), "change": round(change, 3),
+                })
+        return flagged
+
+
+def print_trend(points: List[Dict], test: str, metric: str):
+    """Print a series as a small text chart"""
+    print(f"📈 {test} · {metric}")
+    if not points:
+        print("   (no data)")
+        return
+    peak = max(point["value"] for point in points) or 1
+    for point in points:
+        bar = "█" * max(1, round(point["value"] / peak * 40))
+        print(f"   #{point['run']:<5} {point['commit']:<10} {point['value']:>10.3f} {bar}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect FriendFilter.com performance history")
+    parser.add_argument("--db", default=DEFAULT_HISTORY_DB, help="History database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs_parser = commands.add_parser("runs", help="List recent runs")
+    runs_parser.add_argument("--limit", type=int, default=20)
+
+    trend_parser = commands.add_parser("trend", help="Show one test's duration or metric over time")
+    trend_parser.add_argument("test", help="ClassName.test_method")
+    trend_parser.add_argument("--metric", default="duration", help="duration or a dotted metric such as navigation.load")
+    trend_parser.add_argument("--browser")
+    trend_parser.add_argument("--viewport")
+    trend_parser.add_argument("--profile", help="Emulation profile, or 'none' for unthrottled runs")
+    trend_parser.add_argument("--last", type=int, default=30, help="Number of runs to show")
+
+    flaky_parser = commands.add_parser(
+        "flaky", help="List tests that passed on retry or flipped outcome across runs, by flake rate"
+    )
+    flaky_parser.add_argument("--window", type=int, default=20, help="Recent runs per test")
+
+    changes_parser = commands.add_parser("changes", help="Flag median shifts across recent runs")
+    changes_parser.add_argument("--threshold", type=float, default=20.0, help="Percent change to flag")
+    changes_parser.add_argument("--window", type=int, default=5, help="Runs on each side of the comparison")
+    changes_parser.add_argument("--metric", help="Only check this metric (default: all)")
+    args = parser.parse_args()
+
+    with PerfHistory(args.db) as history:
+        if args.command == "runs":
+            for run in history.runs(args.limit):
+                started = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["started_at"]))
+                print(f"#{run['id']:<5} {started}  {run['commit']:<10} {run['browser']:<9} "
+                      f"{run['viewport']:<10} {run['profile']:<16} {run['passed'] or 0}/{run['tests']} passed")
+        elif args.command == "flaky":
+            rates = sorted(history.flake_rates(args.window).items(), key=lambda item: item[1]["flake_rate"],
+                           reverse=True)
+            flaky = [(test, entry) for test, entry in rates if entry["flake_rate"]]
+            if not flaky:
+                print(f"✅ No test passed on retry or flipped outcome in its last {args.window} runs")
+            for test, entry in flaky:
+                print(f"{entry['flake_rate'] * 100:>5.1f}%  {entry['flaky_runs']}/{entry['runs']} runs flaky, "
+                      f"{entry['flips']} flips, {entry['retries']} retries, "
+                      f"{entry['retry_time']:.1f}s retrying  {test}")
+        elif args.command == "trend":
+            points = history.series(args.test, args.metric, args.browser, args.viewport, args.profile,
+                                    limit=args.last)
+            print_trend(points, args.test, args.metric)
+        else:
+            flagged = history.change_points(args.threshold / 100, args.window, args.metric)
+            if not flagged:
+                print(f"✅ No median shifts above {args.threshold:.0f}% over the last {args.window} runs")
+                return 0
+            print(f"⚠️  {len(flagged)} change-point(s) (last {args.window} runs vs the {args.window} before):")
+            for item in flagged:
+                print(f"   {item['test']} · {item['metric']} [{item['browser']} {item['viewport']} {item['profile']}]: "
+                      f"{item['before']} → {item['after']} ({item['change'] * 100:+.1f}%)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
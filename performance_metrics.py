@@ -0,0 +1,146 @@
+"""
+Browser-native Performance Metrics for FriendFilter.com
+Reads Navigation Timing, Resource Timing, Paint, LCP and layout-shift entries after a navigation
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+
+DEFAULT_BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "performance_budgets.json")
+
+# Times are milliseconds since navigation start, sizes are bytes, cls is unitless
+METRICS_SCRIPT = """
+async () => {
+    // loadEventEnd is only filled in after the load handlers return
+    if (document.readyState !== "complete") {
+        await new Promise(resolve => addEventListener("load", resolve, {once: true}));
+    }
+    await new Promise(resolve => setTimeout(resolve, 0));
+
+    const round = value => value === null || value === undefined ? null : Math.round(value * 10) / 10;
+    const supported = PerformanceObserver.supportedEntryTypes || [];
+
+    // Buffered observers hand back entries recorded before we started listening
+    const observe = type => new Promise(resolve => {
+        if (!supported.includes(type)) return resolve(null);
+        const entries = [];
+        const observer = new PerformanceObserver(list => entries.push(...list.getEntries()));
+        observer.observe({type: type, buffered: true});
+        setTimeout(() => { observer.disconnect(); resolve(entries); }, 50);
+    });
+    const [lcpEntries, shiftEntries] = await Promise.all([
+        observe("largest-contentful-paint"), observe("layout-shift")
+    ]);
+
+    const nav = performance.getEntriesByType("navigation")[0];
+    const navigation = nav ? {
+        dns: round(nav.domainLookupEnd - nav.domainLookupStart),
+        connect: round(nav.connectEnd - nav.connectStart),
+        tls: round(nav.secureConnectionStart > 0 ? nav.connectEnd - nav.secureConnectionStart : 0),
+        ttfb: round(nav.responseStart - nav.startTime),
+        response: round(nav.responseEnd - nav.responseStart),
+        dom_interactive: round(nav.domInteractive),
+        dom_content_loaded: round(nav.domContentLoadedEventEnd),
+        load: round(nav.loadEventEnd),
+        transfer_size: nav.transferSize,
+        encoded_body_size: nav.encodedBodySize,
+        decoded_body_size: nav.decodedBodySize,
+    } : null;
+
+    const paint = {};
+    for (const entry of performance.getEntriesByType("paint")) {
+        paint[entry.name.replace(/-/g, "_")] = round(entry.startTime);
+    }
+
+    const byType = {};
+    let transferBytes = 0;
+    const resourceEntries = performance.getEntriesByType("resource");
+    for (const entry of resourceEntries) {
+        const bucket = byType[entry.initiatorType] || (byType[entry.initiatorType] = {count: 0, transfer_bytes: 0});
+        bucket.count += 1;
+        bucket.transfer_bytes += entry.transferSize || 0;
+        transferBytes += entry.transferSize || 0;
+    }
+    const slowest = resourceEntries
+        .slice()
+        .sort((a, b) => b.duration - a.duration)
+        .slice(0, 5)
+        .map(entry => ({url: entry.name, duration: round(entry.duration), transfer_bytes: entry.transferSize}));
+
+    let cls = null;
+    if (shiftEntries) {
+        cls = 0;
+        for (const entry of shiftEntries) if (!entry.hadRecentInput) cls += entry.value;
+    }
+
+    return {
+        url: location.href,
+        navigation: navigation,
+        paint: paint,
+        lcp: lcpEntries && lcpEntries.length ? round(lcpEntries[lcpEntries.length - 1].startTime) : null,
+        cls: cls === null ? null : Math.round(cls * 10000) / 10000,
+        resources: {
+            count: resourceEntries.length,
+            transfer_bytes: transferBytes,
+            by_type: byType,
+            slowest: slowest,
+        },
+    };
+}
+"""
+
+
+def collect_metrics(page) -> Dict:
+    """Read the browser's own timing entries for the page's current document"""
+    return page.evaluate(METRICS_SCRIPT)
+
+
+def metric_value(metrics: Dict, path: str):
+    """Look up a dotted metric path such as navigation.load, or None if unavailable"""
+    value = metrics
+    for key in path.split("."):
+        if not isinstance(value, dict) or value.get(key) is None:
+            return None
+        value = value[key]
+    return value
+
+
+def load_budgets(path: Optional[str] = None) -> Dict:
+    """Load per-metric budgets: a "default" section plus optional per-path overrides"""
+    with open(path or DEFAULT_BUDGETS_FILE) as f:
+        return json.load(f)
+
+
+def budgets_for(budgets: Dict, url_path: str = "/", profile: Optional[str] = None) -> Dict:
+    """Merge the default budgets with overrides for a URL path, then for an emulation profile"""
+    merged = dict(budgets.get("default", {}))
+    merged.update(budgets.get("pages", {}).get(url_path, {}))
+    if profile:
+        merged.update(budgets.get("profiles", {}).get(profile, {}))
+    return merged
+
+
+def check_budgets(metrics: Dict, budgets: Dict) -> List[str]:
+    """Return a message for every metric over its budget (metrics the browser lacks are skipped)"""
+    violations = []
+    for path, limit in budgets.items():
+        value = metric_value(metrics, path)
+        if value is not None and value > limit:
+            violations.append(f"{path} = {value} (budget {limit})")
+    return violations
+
+
+def format_metrics(metrics: Dict) -> str:
+    """One-line summary of the headline metrics"""
+    parts = [
+        ("TTFB", metric_value(metrics, "navigation.ttfb"), "ms"),
+        ("FCP", metric_value(metrics, "paint.first_contentful_paint"), "ms"),
+        ("LCP", metric_value(metrics, "lcp"), "ms"),
+        ("DCL", metric_value(metrics, "navigation.dom_content_loaded"), "ms"),
+        ("Load", metric_value(metrics, "navigation.load"), "ms"),
+        ("CLS", metric_value(metrics, "cls"), ""),
+        ("Requests", metric_value(metrics, "resources.count"), ""),
+    ]
+    return ", ".join(f"{name} {value}{unit}" for name, value, unit in parts if value is not None)
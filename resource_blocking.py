@@ -0,0 +1,140 @@
+"""
+Resource Blocking for functional FriendFilter.com test categories
+Aborts images, fonts, media and third-party requests the assertions never look at, and tallies what was saved
+"""
+
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+
+# Policies name the resource types to abort everywhere and whether to abort every
+# third-party subresource. Documents are never blocked, so navigation and popups still work.
+BLOCKING_POLICIES = {
+    "functional": {
+        "resource_types": ["image", "media", "font"],
+        "third_party": True,
+    },
+}
+
+# Categories missing here (performance, accessibility, landing, pricing, browsers, errors, ...) load everything
+CATEGORY_POLICIES = {
+    "auth": "functional",
+    "dashboard": "functional",
+    "extension": "functional",
+    "forms": "functional",
+}
+
+# Typical transfer sizes used when a blocked URL was never seen loading in full
+ESTIMATED_BYTES = {
+    "image": 40000,
+    "media": 500000,
+    "font": 30000,
+    "stylesheet": 15000,
+    "script": 25000,
+    "xhr": 3000,
+    "fetch": 3000,
+}
+DEFAULT_ESTIMATED_BYTES = 5000
+
+
+def policy_for_category(category: Optional[str]) -> Optional[Dict]:
+    """Blocking policy for a test category, or None to load everything"""
+    name = CATEGORY_POLICIES.get(category)
+    return BLOCKING_POLICIES[name] if name else None
+
+
+def site_of(host: str) -> str:
+    """Registrable part of a host name (last two labels), e.g. www.friendfilter.com -> friendfilter.com"""
+    return ".".join(host.split(".")[-2:])
+
+
+class ResourceBlocker:
+    """context.route handler that aborts requests matching a policy and counts them"""
+
+    # Transfer sizes seen in full-loading tests, reused to price later blocked requests
+    known_sizes: Dict[str, int] = {}
+
+    def __init__(self, policy: Dict, base_url: str):
+        self.resource_types = set(policy.get("resource_types", []))
+        self.block_third_party = policy.get("third_party", False)
+        self.first_party = site_of(urlparse(base_url).hostname or "")
+        self.blocked: List[Dict] = []
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Whether the policy aborts this request"""
+        if resource_type == "document":
+            return False
+        if resource_type in self.resource_types:
+            return True
+        if self.block_third_party:
+            host = urlparse(url).hostname or ""
+            return bool(host) and site_of(host) != self.first_party
+        return False
+
+    def attach(self, context):
+        """Route every request in the context through the policy"""
+        context.route("**/*", self._handle)
+
+    def _handle(self, route):
+        if self._record_if_blocked(route.request):
+            route.abort("blockedbyclient")
+        else:
+            # fallback() rather than continue_() so HAR replay routes still see the request
+            route.fallback()
+
+    def _record_if_blocked(self, request) -> bool:
+        if not self.should_block(request.url, request.resource_type):
+            return False
+        self.blocked.append({"url": request.url, "type": request.resource_type})
+        return True
+
+    def stats(self) -> Dict:
+        """Blocked request counts per type and an estimate of the bytes they would have cost
+
+        known_bytes is the part of the estimate backed by a Content-Length seen in a full-loading test;
+        the rest is priced from typical sizes per resource type.
+        """
+        by_type = {}
+        estimated_bytes = known_bytes = 0
+        for item in self.blocked:
+            by_type[item["type"]] = by_type.get(item["type"], 0) + 1
+            if item["url"] in self.known_sizes:
+                known_bytes += self.known_sizes[item["url"]]
+            else:
+                estimated_bytes += ESTIMATED_BYTES.get(item["type"], DEFAULT_ESTIMATED_BYTES)
+        return {
+            "requests": len(self.blocked),
+            "by_type": by_type,
+            "estimated_bytes": estimated_bytes + known_bytes,
+            "known_bytes": known_bytes,
+        }
+
+    @classmethod
+    def learn_sizes(cls, context):
+        """Remember response sizes from a full-loading context so estimates use real numbers"""
+        # Content-Length is already in hand, unlike request.sizes() which costs a round trip
+        def on_response(response):
+            length = response.headers.get("content-length")
+            if length and length.isdigit():
+                cls.known_sizes[response.url] = int(length)
+        context.on("response", on_response)
+
+
+def format_blocking_report(results: Dict) -> Optional[str]:
+    """Run-wide totals of blocked requests, or None if nothing was blocked"""
+    requests = 0
+    estimated_bytes = known_bytes = 0
+    tests = 0
+    for class_results in results.values():
+        for result in class_results:
+            blocked = result.get("blocked")
+            if blocked:
+                tests += 1
+                requests += blocked["requests"]
+                estimated_bytes += blocked["estimated_bytes"]
+                known_bytes += blocked.get("known_bytes", 0)
+    if not requests:
+        return None
+    return (f"🚫 Resource blocking: {requests} requests aborted across {tests} tests, "
+            f"est. ~{estimated_bytes / 1024:.0f} KB not downloaded "
+            f"({known_bytes / 1024:.0f} KB from Content-Length seen in earlier tests, the rest typical sizes per type)")
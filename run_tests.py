@@ -5,74 +5,387 @@ Simplified script to run specific test categories or all tests
 """
 
 import argparse
+import os
 import sys
 from test_friendfilter_comprehensive import *
+from fixture_server import FixtureServer
+from emulation_profiles import PROFILES
+from perf_history import DEFAULT_HISTORY_DB, PerfHistory
+from resource_blocking import format_blocking_report
+from artifact_store import DEFAULT_ARTIFACT_DIR, DEFAULT_MAX_MB, new_run_id
+from matrix_runner import ENGINES, format_matrix, run_matrix
+from scheduler import (DEFAULT_MANIFEST, build_manifest, collect_tests, estimate_durations, failure_probabilities,
+                       load_durations, load_manifest, load_outcomes, load_quarantine, longest_first, parse_shard,
+                       risk_order, shard_tests)
 
 
-def run_specific_tests(test_category):
+TEST_MAPPING = {
+    "landing": TestLandingPage,
+    "auth": TestUserAuthentication,
+    "pricing": TestPricingPage,
+    "dashboard": TestDashboardFunctionality,
+    "extension": TestExtensionFeatures,
+    "forms": TestFormValidation,
+    "performance": TestPerformanceAndSEO,
+    "accessibility": TestAccessibility,
+    "browsers": TestCrossBrowserCompatibility,
+    "errors": TestErrorHandling,
+    "coverage": TestCodeCoverage,
+    "soak": TestMemorySoak,
+    "interactions": TestInteractionLatency,
+    "visual": TestVisualRegression
+}
+
+
+def run_specific_tests(test_category, use_browser_pool=True, workers=1, concurrency=0, tests=None,
+                       max_failures=None, quarantine=()):
     """Run tests for a specific category"""
-    test_mapping = {
-        "landing": TestLandingPage,
-        "auth": TestUserAuthentication,
-        "pricing": TestPricingPage,
-        "dashboard": TestDashboardFunctionality,
-        "extension": TestExtensionFeatures,
-        "forms": TestFormValidation,
-        "performance": TestPerformanceAndSEO,
-        "accessibility": TestAccessibility,
-        "browsers": TestCrossBrowserCompatibility,
-        "errors": TestErrorHandling
-    }
-    
-    if test_category not in test_mapping:
+    if test_category not in TEST_MAPPING:
         print(f"❌ Unknown test category: {test_category}")
-        print(f"Available categories: {', '.join(test_mapping.keys())}")
+        print(f"Available categories: {', '.join(TEST_MAPPING.keys())}")
         return
     
-    test_class = test_mapping[test_category]
-    print(f"🧪 Running {test_class.__name__} tests...")
-    
-    test_instance = test_class()
-    test_methods = [method for method in dir(test_instance) if method.startswith('test_')]
-    
-    passed = 0
-    failed = 0
+    test_class = TEST_MAPPING[test_category]
+    results = run_test_classes(
+        [test_class], use_browser_pool=use_browser_pool, workers=workers, tests=tests, max_failures=max_failures,
+        quarantine=quarantine, concurrency=concurrency
+    )
     
-    for method_name in test_methods:
-        try:
-            print(f"  ▶️  {method_name}")
-            method = getattr(test_instance, method_name)
-            method()
-            print(f"  ✅ {method_name} - PASSED")
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ {method_name} - FAILED: {str(e)}")
-            failed += 1
+    passed, failed, quarantined = count_outcomes(results.get(test_class.__name__, []))
     
-    print(f"\n📊 Results: {passed} passed, {failed} failed")
+    summary = f"\n📊 Results: {passed} passed, {failed} failed"
+    print(summary + (f", {quarantined} quarantined failures" if quarantined else ""))
+    return results
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run FriendFilter.com Playwright tests")
     parser.add_argument(
         "--category", 
-        choices=["landing", "auth", "pricing", "dashboard", "extension", "forms", 
-                "performance", "accessibility", "browsers", "errors", "all"],
+        choices=list(TEST_MAPPING.keys()) + ["all"],
         default="all",
         help="Test category to run"
     )
     parser.add_argument("--headless", action="store_true", help="Run tests in headless mode")
+    parser.add_argument("--no-pool", action="store_true", help="Launch a fresh browser for every test")
+    parser.add_argument(
+        "--pool-max-uses",
+        type=int,
+        default=50,
+        help="Recycle a pooled browser after this many tests"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Spread test methods across this many worker processes"
+    )
+    parser.add_argument(
+        "--async",
+        dest="concurrency",
+        type=int,
+        nargs="?",
+        const=8,
+        default=0,
+        metavar="CONTEXTS",
+        help="Run tests concurrently from one event loop, up to this many contexts in one browser (default 8)"
+    )
+    har_group = parser.add_mutually_exclusive_group()
+    har_group.add_argument("--record", action="store_true", help="Record each test's traffic to a HAR file")
+    har_group.add_argument("--replay", action="store_true", help="Serve each test's traffic from its recorded HAR")
+    parser.add_argument("--har-dir", default="hars", help="Directory holding the per-test HAR files")
+    parser.add_argument(
+        "--har-lenient",
+        action="store_true",
+        help="During replay, let unrecorded requests reach the network instead of failing them"
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Attach browser-reported performance metrics to every test result"
+    )
+    parser.add_argument("--budgets", help="Performance budget file (default: performance_budgets.json)")
+    parser.add_argument("--base-url", help="Site under test (default: $FRIENDFILTER_BASE_URL or friendfilter.com)")
+    parser.add_argument(
+        "--local-server",
+        action="store_true",
+        help="Start the bundled fixture server and test against it instead of the live site"
+    )
+    parser.add_argument("--server-latency-ms", type=int, default=0, help="Fixture server delay per page")
+    parser.add_argument("--server-api-latency-ms", type=int, default=0, help="Fixture server delay per /api call")
+    parser.add_argument("--server-payload-kb", type=int, default=0, help="Fixture server padding per page")
+    parser.add_argument(
+        "--profile",
+        choices=list(PROFILES.keys()),
+        help="Throttle network and/or CPU with a named emulation profile (Chromium only)"
+    )
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        help="Abort images, fonts, media and third-party requests in functional categories"
+    )
+    parser.add_argument("--soak-iterations", type=int, default=200, help="Dashboard cycles in the soak category")
+    parser.add_argument("--soak-sample-every", type=int, default=20, help="Cycles between heap samples")
+    parser.add_argument(
+        "--heap-snapshots",
+        action="store_true",
+        help="Diff heap snapshots before and after the soak to list the top retained constructors"
+    )
+    parser.add_argument("--visual-dir", default="visual", help="Directory holding visual baselines and diffs")
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="Overwrite visual baselines with this run's screenshots"
+    )
+    parser.add_argument("--artifact-dir", default=DEFAULT_ARTIFACT_DIR, help="Content-addressed artifact store root")
+    parser.add_argument(
+        "--artifact-max-mb",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        help="Evict least-recently-used artifacts beyond this size after the run"
+    )
+    parser.add_argument(
+        "--capture",
+        choices=["trace", "video"],
+        help="Keep a rolling in-memory trace per context (plus video with 'video') and save it only for failing tests"
+    )
+    parser.add_argument("--capture-max-actions", type=int, default=50, help="Entries kept in each failure ring")
+    parser.add_argument("--capture-max-kb", type=int, default=2048, help="Upper bound on trace bytes per context")
+    parser.add_argument(
+        "--capture-snapshots",
+        action="store_true",
+        help="Snapshot the DOM after every captured action, not only after failed ones"
+    )
+    parser.add_argument(
+        "--order",
+        choices=["class", "risk"],
+        default="class",
+        help="class: fixed order (longest-first on workers/shards); risk: likeliest-to-fail and cheapest first"
+    )
+    parser.add_argument("--max-failures", type=int, help="Stop starting new tests after K failures")
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=0,
+        help="Retry a failing test up to N times, each in a fresh context"
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=float,
+        default=300.0,
+        help="Seconds of retries allowed per process before failures are final"
+    )
+    parser.add_argument(
+        "--quarantine-threshold",
+        type=float,
+        default=0.2,
+        help="Flake rate at which a test is quarantined (run last, failures don't block)"
+    )
+    parser.add_argument("--quarantine-min-runs", type=int, default=5, help="Recorded runs needed before quarantining")
+    parser.add_argument("--no-quarantine", action="store_true", help="Run quarantined tests like any other")
+    parser.add_argument(
+        "--browsers",
+        help=f"Comma-separated engines ({', '.join(ENGINES)}, default chromium); more than one cell runs the matrix "
+             "in parallel. Without it, the browsers category checks every engine"
+    )
+    parser.add_argument(
+        "--viewports",
+        default="1920x1080",
+        help="Comma-separated WIDTHxHEIGHT viewports, e.g. 1920x1080,375x812"
+    )
+    parser.add_argument("--shard", help="Run only shard i of N (e.g. 2/4), as assigned by the shard manifest")
+    parser.add_argument(
+        "--shard-manifest",
+        default=DEFAULT_MANIFEST,
+        help="Manifest from 'scheduler.py plan' (planned from --history-db when missing)"
+    )
+    parser.add_argument("--history-db", default=DEFAULT_HISTORY_DB, help="SQLite file runs are appended to")
+    parser.add_argument("--no-history", action="store_true", help="Don't record this run in the history database")
     
     args = parser.parse_args()
+    # An explicit --browsers also narrows the compatibility check to those engines
+    args.compatibility_engines = args.browsers.split(",") if args.browsers else None
+    args.browsers = (args.browsers or "chromium").split(",")
+    args.viewports = args.viewports.split(",")
+    unknown = [browser for browser in args.browsers if browser not in ENGINES]
+    if unknown:
+        parser.error(f"unknown browser(s): {', '.join(unknown)} (choose from {', '.join(ENGINES)})")
+    for viewport in args.viewports:
+        try:
+            parse_viewport(viewport)
+        except ValueError:
+            parser.error(f"viewport must look like WIDTHxHEIGHT, got {viewport!r}")
+    if args.category in TEST_MAPPING:
+        test_class = TEST_MAPPING[args.category]
+        if not any(supports_engine(test_class, browser) for browser in args.browsers):
+            parser.error(f"--category {args.category} runs on {', '.join(test_class.engines)} only")
+    
+    fixture_server = None
+    if args.local_server:
+        fixture_server = FixtureServer(
+            latency_ms=args.server_latency_ms,
+            api_latency_ms=args.server_api_latency_ms,
+            payload_kb=args.server_payload_kb
+        )
+        args.base_url = fixture_server.start()
+        print(f"🧪 Using local fixture server at {args.base_url}")
+    if args.base_url:
+        FriendFilterTestSuite.configure(base_url=args.base_url.rstrip("/"))
+    
+    try:
+        run_selected_tests(args)
+    finally:
+        if fixture_server:
+            fixture_server.stop()
+
+
+def run_selected_tests(args):
+    """Run the tests chosen on the command line"""
+    har_mode = "record" if args.record else "replay" if args.replay else None
+    FriendFilterTestSuite.configure(
+        headless=args.headless,
+        pool_max_uses=args.pool_max_uses,
+        har_mode=har_mode,
+        har_dir=args.har_dir,
+        har_strict=not args.har_lenient,
+        collect_metrics=args.metrics,
+        budgets_file=args.budgets,
+        emulation_profile=args.profile,
+        block_resources=args.block_resources,
+        soak_iterations=args.soak_iterations,
+        soak_sample_every=args.soak_sample_every,
+        heap_snapshots=args.heap_snapshots,
+        visual_dir=args.visual_dir,
+        update_baselines=args.update_baselines,
+        artifact_dir=args.artifact_dir,
+        artifact_run_id=new_run_id(),
+        artifact_max_mb=args.artifact_max_mb,
+        capture=args.capture,
+        capture_max_actions=args.capture_max_actions,
+        capture_max_kb=args.capture_max_kb,
+        capture_snapshots=args.capture_snapshots,
+        retries=args.retries,
+        retry_budget=args.retry_budget,
+        default_browser=args.browsers[0],
+        compatibility_engines=args.compatibility_engines,
+        viewport=args.viewports[0]
+    )
+    # Page objects and the streaming tests pick the store up from the environment
+    os.environ["ARTIFACT_DIR"] = args.artifact_dir
+    os.environ["ARTIFACT_RUN_ID"] = FriendFilterTestSuite.artifact_run_id
     
     print("🚀 FriendFilter.com Test Runner")
     print("=" * 40)
+    if args.profile:
+        print(f"📶 Emulating {args.profile}")
+    if args.concurrency and args.workers > 1:
+        print("⚠️  --async runs every test in this process, ignoring --workers")
     
-    if args.category == "all":
-        results = run_comprehensive_tests()
-        return
+    test_classes = TEST_CLASSES if args.category == "all" else [TEST_MAPPING[args.category]]
+    tests = plan_tests(args, test_classes)
+    quarantine = [] if args.no_quarantine else load_quarantine(
+        args.history_db, args.quarantine_threshold, args.quarantine_min_runs
+    )
+    
+    if len(args.browsers) * len(args.viewports) > 1:
+        matrix = run_matrix(
+            test_classes, args.browsers, args.viewports, tests=tests, max_failures=args.max_failures,
+            quarantine=quarantine, workers=args.workers, concurrency=args.concurrency
+        )
+        print(f"\n{format_matrix(matrix, args.artifact_dir)}")
+        if not args.no_history:
+            for name, cell in matrix.items():
+                if cell["results"]:
+                    browser, viewport = name.split("@")
+                    record_history(args.history_db, cell["results"], browser, viewport)
+        # Each cell's results were reported and recorded above
+        results = {}
+    elif args.shard:
+        results = run_test_classes(
+            test_classes, use_browser_pool=not args.no_pool, workers=args.workers, tests=tests,
+            max_failures=args.max_failures, quarantine=quarantine, concurrency=args.concurrency
+        )
+        print_summary(results)
+    elif args.category == "all":
+        results = run_comprehensive_tests(
+            use_browser_pool=not args.no_pool, workers=args.workers, tests=tests, max_failures=args.max_failures,
+            quarantine=quarantine, concurrency=args.concurrency
+        )
+        print_summary(results)
+    else:
+        results = run_specific_tests(
+            args.category, use_browser_pool=not args.no_pool, workers=args.workers,
+            concurrency=args.concurrency, tests=tests, max_failures=args.max_failures,
+            quarantine=quarantine
+        )
+    
+    retry_report = format_retry_report(results or {})
+    if retry_report:
+        print(f"\n{retry_report}")
     
-    run_specific_tests(args.category)
+    blocking_report = format_blocking_report(results or {})
+    if blocking_report:
+        print(f"\n{blocking_report}")
+    
+    store = FriendFilterTestSuite.artifact_store()
+    artifact_report = store.format_report()
+    if artifact_report:
+        print(f"\n{artifact_report}")
+    evicted = store.evict()
+    if evicted["removed"]:
+        print(f"🧹 Evicted {evicted['removed']} old artifacts ({evicted['freed'] / 1024 / 1024:.1f} MB)")
+    
+    if results and not args.no_history:
+        record_history(args.history_db, results)
+
+
+def plan_tests(args, test_classes):
+    """This machine's tests in start order: riskiest first with --order risk, else longest first when run concurrently
+
+    None means every test in class order.
+    """
+    if not args.shard and args.workers <= 1 and not args.concurrency and args.order != "risk":
+        return None
+    tests = collect_tests(test_classes)
+    if args.shard:
+        try:
+            index, total = parse_shard(args.shard)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        if os.path.exists(args.shard_manifest):
+            manifest = load_manifest(args.shard_manifest)
+            if manifest["shards"] != total:
+                sys.exit(f"❌ {args.shard_manifest} plans {manifest['shards']} shards, not {total}")
+        else:
+            # Only consistent across machines if they all read the same history
+            print(f"⚠️  {args.shard_manifest} not found, planning {total} shards from {args.history_db}")
+            manifest = build_manifest(tests, total, args.history_db)
+        tests = shard_tests(manifest, index, tests)
+        print(f"🗂️  Shard {index}/{total}: {len(tests)} tests")
+    estimates = estimate_durations(tests, load_durations(args.history_db))
+    if args.order == "risk":
+        probabilities = failure_probabilities(tests, load_outcomes(args.history_db))
+        tests = risk_order(tests, estimates, probabilities)
+        print("🎯 Riskiest first: " + ", ".join(
+            f"{test} (p={probabilities[test]:.2f}, ~{estimates[test]['seconds']:.0f}s)" for test in tests[:3]
+        ))
+        return tests
+    # Starting the longest tests first keeps one slow test from finishing last on its own
+    return longest_first(tests, estimates)
+
+
+def record_history(path, results, browser=None, viewport=None):
+    """Append the run's durations and metrics to the performance history database"""
+    with PerfHistory(path) as history:
+        run_id = history.record_run(
+            results,
+            browser=browser or FriendFilterTestSuite.default_browser,
+            viewport=viewport or FriendFilterTestSuite.viewport,
+            base_url=FriendFilterTestSuite.base_url,
+            profile=FriendFilterTestSuite.emulation_profile,
+            settings=FriendFilterTestSuite.current_settings()
+        )
+    print(f"🗃️  Recorded run #{run_id} in {path}")
 
 
 if __name__ == "__main__":
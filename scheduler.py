@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Duration-aware Test Scheduler for FriendFilter.com
+Estimates each test's cost from run history and balances tests across workers or CI shards longest-first
+"""
+
+import argparse
+import heapq
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from perf_history import DEFAULT_HISTORY_DB, PerfHistory
+from test_friendfilter_comprehensive import collect_test_methods
+
+
+DEFAULT_MANIFEST = "shard_manifest.json"
+
+# Seconds assumed for a test no run has timed yet, when its class has no history either
+DEFAULT_ESTIMATE = 15.0
+
+# Weight of each older run when estimating failure probability (newest run weighs 1)
+FAILURE_DECAY = 0.8
+
+
+def test_id(class_name: str, method_name: str) -> str:
+    """Tests are identified as ClassName.test_method, as in the history database"""
+    return f"{class_name}.{method_name}"
+
+
+def collect_tests(test_classes: List) -> List[str]:
+    """Every test id of the given classes, in run order"""
+    return [test_id(test_class.__name__, method) for test_class in test_classes
+            for method in collect_test_methods(test_class)]
+
+
+def load_durations(history_path: str = DEFAULT_HISTORY_DB, window: int = 10) -> Dict[str, List[float]]:
+    """Recent durations per test, or nothing when there is no history yet"""
+    if not os.path.exists(history_path):
+        return {}
+    with PerfHistory(history_path) as history:
+        return history.recent_durations(window)
+
+
+def load_outcomes(history_path: str = DEFAULT_HISTORY_DB, window: int = 20) -> Dict[str, List[bool]]:
+    """Recent pass/fail outcomes per test, or nothing when there is no history yet"""
+    if not os.path.exists(history_path):
+        return {}
+    with PerfHistory(history_path) as history:
+        return history.recent_outcomes(window)
+
+
+def load_quarantine(history_path: str = DEFAULT_HISTORY_DB, threshold: float = 0.2, min_runs: int = 5,
+                    window: int = 20) -> List[str]:
+    """Tests whose flake rate over recent runs reached threshold (with at least min_runs runs of evidence)"""
+    if not os.path.exists(history_path):
+        return []
+    with PerfHistory(history_path) as history:
+        rates = history.flake_rates(window)
+    return sorted(test for test, entry in rates.items()
+                  if entry["runs"] >= min_runs and entry["flake_rate"] >= threshold)
+
+
+def estimate_durations(tests: List[str], durations: Dict[str, List[float]]) -> Dict[str, Dict]:
+    """Median recent duration per test; new tests get their class median, then the overall median"""
+    known = {test: statistics.median(values) for test, values in durations.items() if values}
+    by_class: Dict[str, List[float]] = {}
+    for test, value in known.items():
+        by_class.setdefault(test.split(".")[0], []).append(value)
+    overall = statistics.median(known.values()) if known else DEFAULT_ESTIMATE
+
+    estimates = {}
+    for test in tests:
+        class_values = by_class.get(test.split(".")[0])
+        if test in known:
+            estimates[test] = {"seconds": round(known[test], 3), "source": "history"}
+        elif class_values:
+            estimates[test] = {"seconds": round(statistics.median(class_values), 3), "source": "class"}
+        else:
+            estimates[test] = {"seconds": round(overall, 3), "source": "default" if not known else "overall"}
+    return estimates
+
+
+def longest_first(tests: List[str], estimates: Dict[str, Dict]) -> List[str]:
+    """Tests ordered by estimated duration, longest first (ties by name, so every machine agrees)"""
+    return sorted(tests, key=lambda test: (-estimates[test]["seconds"], test))
+
+
+def failure_probabilities(tests: List[str], outcomes: Dict[str, List[bool]],
+                          decay: float = FAILURE_DECAY) -> Dict[str, float]:
+    """Recency-weighted failure rate per test with a Laplace prior, so new tests start at 0.5"""
+    probabilities = {}
+    for test in tests:
+        failures = runs = 0.0
+        weight = 1.0
+        for passed in outcomes.get(test, []):
+            failures += weight * (not passed)
+            runs += weight
+            weight *= decay
+        probabilities[test] = round((failures + 1) / (runs + 2), 4)
+    return probabilities
+
+
+def risk_order(tests: List[str], estimates: Dict[str, Dict], probabilities: Dict[str, float]) -> List[str]:
+    """Most likely to fail per second of runtime first, which minimises the expected time to the first failure"""
+    return sorted(
+        tests,
+        key=lambda test: (-probabilities[test] / max(estimates[test]["seconds"], 0.1), test)
+    )
+
+
+def lpt_schedule(tests: List[str], estimates: Dict[str, Dict], shards: int) -> List[Dict]:
+    """Longest-processing-time-first: each test goes to the currently least loaded shard"""
+    heap: List[Tuple[float, int]] = [(0.0, index) for index in range(shards)]
+    assignments = [{"shard": index + 1, "estimate": 0.0, "tests": []} for index in range(shards)]
+    for test in longest_first(tests, estimates):
+        load, index = heapq.heappop(heap)
+        load += estimates[test]["seconds"]
+        assignments[index]["tests"].append(test)
+        assignments[index]["estimate"] = round(load, 3)
+        heapq.heappush(heap, (load, index))
+    return assignments
+
+
+def build_manifest(tests: List[str], shards: int, history_path: str = DEFAULT_HISTORY_DB,
+                   window: int = 10) -> Dict:
+    """Shard plan for the given tests, ready to be written as JSON"""
+    estimates = estimate_durations(tests, load_durations(history_path, window))
+    assignments = lpt_schedule(tests, estimates, shards)
+    total = sum(estimate["seconds"] for estimate in estimates.values())
+    sources: Dict[str, int] = {}
+    for estimate in estimates.values():
+        sources[estimate["source"]] = sources.get(estimate["source"], 0) + 1
+    return {
+        "created_at": time.time(),
+        "shards": shards,
+        "history": history_path,
+        "estimated_total": round(total, 3),
+        "makespan": max((shard["estimate"] for shard in assignments), default=0.0),
+        "lower_bound": round(max(total / shards, max((e["seconds"] for e in estimates.values()), default=0.0)), 3),
+        "estimate_sources": sources,
+        "estimates": {test: estimates[test]["seconds"] for test in tests},
+        "assignments": assignments,
+    }
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'2/4' -> (2, 4), shards numbered from 1"""
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {value!r}")
+    if not 1 <= index <= total:
+        raise ValueError(f"Shard index must be between 1 and {total}, got {index}")
+    return index, total
+
+
+def shard_tests(manifest: Dict, index: int, tests: List[str]) -> List[str]:
+    """This shard's tests from a manifest; tests the manifest doesn't know are dealt round-robin by name"""
+    current = set(tests)
+    planned = {test for shard in manifest["assignments"] for test in shard["tests"]}
+    selected = [test for test in manifest["assignments"][index - 1]["tests"] if test in current]
+    unplanned = sorted(current - planned)
+    selected += unplanned[index - 1::manifest["shards"]]
+    return selected
+
+
+def load_manifest(path: str) -> Dict:
+    """Read a manifest written by `scheduler.py plan`"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(manifest: Dict, path: str):
+    """Write a manifest atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def format_manifest(manifest: Dict) -> str:
+    """Per-shard load summary"""
+    sources = ", ".join(f"{count} {source}" for source, count in sorted(manifest["estimate_sources"].items()))
+    lines = [
+        f"🗂️  {manifest['shards']} shards, estimated makespan {manifest['makespan']:.1f}s "
+        f"(lower bound {manifest['lower_bound']:.1f}s, total {manifest['estimated_total']:.1f}s; estimates: {sources})"
+    ]
+    for shard in manifest["assignments"]:
+        lines.append(f"   shard {shard['shard']}: {len(shard['tests']):>3} tests, ~{shard['estimate']:.1f}s")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan FriendFilter.com test shards from run history")
+    parser.add_argument("--history-db", default=DEFAULT_HISTORY_DB, help="History database to read durations from")
+    parser.add_argument("--window", type=int, default=10, help="Recent runs per test to take the median of")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = commands.add_parser("plan", help="Write a shard manifest for run_tests.py --shard i/N")
+    plan_parser.add_argument("--shards", type=int, required=True)
+    plan_parser.add_argument("--category", default="all", help="Test category to plan (default: all)")
+    plan_parser.add_argument("--output", default=DEFAULT_MANIFEST)
+
+    estimates_parser = commands.add_parser("estimates", help="List per-test duration estimates, longest first")
+    estimates_parser.add_argument("--category", default="all")
+    args = parser.parse_args()
+
+    from run_tests import TEST_MAPPING, TEST_CLASSES
+    test_classes = TEST_CLASSES if args.category == "all" else [TEST_MAPPING[args.category]]
+    tests = collect_tests(test_classes)
+
+    if args.command == "plan":
+        manifest = build_manifest(tests, args.shards, args.history_db, args.window)
+        write_manifest(manifest, args.output)
+        print(format_manifest(manifest))
+        print(f"💾 Wrote {args.output}")
+    else:
+        estimates = estimate_durations(tests, load_durations(args.history_db, args.window))
+        for test in longest_first(tests, estimates):
+            print(f"{estimates[test]['seconds']:>9.2f}s  {estimates[test]['source']:<8} {test}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Persisted Login Sessions for the AceStreamz admin tests
+Logs in once, saves the context's storage state with an expiry, and reuses it in later runs
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from streaming_page_objects import LoginPage
+
+
+class SessionCache:
+    """Storage-state cache that starts new contexts already authenticated"""
+
+    def __init__(self, path: str = ".auth/acestreamz_admin.json", max_age_hours: float = 12.0):
+        self.path = path
+        self.max_age = max_age_hours * 3600
+        # SESSION_CACHE=0 forces a fresh login without deleting the saved state
+        self.enabled = os.environ.get("SESSION_CACHE", "1").lower() not in ("0", "false", "no")
+        self.used_saved_state = False
+
+    def load(self) -> Optional[Dict]:
+        """Return the saved storage state if it exists and has not expired"""
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - saved.get("saved_at", 0) > self.max_age:
+            return None
+        return saved.get("state")
+
+    async def save(self, context):
+        """Write the context's cookies and local storage with a timestamp"""
+        state = await context.storage_state()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        # The state holds live session cookies, so keep it private to the user
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump({"saved_at": time.time(), "state": state}, f)
+        os.replace(tmp_path, self.path)
+
+    def invalidate(self):
+        """Forget the saved state"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def new_context(self, browser, **context_options):
+        """Open a context, pre-authenticated when a fresh saved state exists"""
+        state = self.load()
+        self.used_saved_state = state is not None
+        if state is not None:
+            context_options["storage_state"] = state
+        return await browser.new_context(**context_options)
+
+    async def ensure_logged_in(self, page, email: str, password: str, remember_me: bool = True) -> bool:
+        """Log in on the current page unless the session is already valid; returns True if it logged in"""
+        login_page = LoginPage(page)
+        if not await login_page.is_login_required():
+            return False
+
+        if self.used_saved_state:
+            # The server rejected our saved cookies, start over with a clean session
+            print("⚠️  Saved session was rejected, logging in again")
+            self.invalidate()
+            await page.context.clear_cookies()
+            await page.reload()
+
+        await login_page.login(email, password, remember_me=remember_me)
+        if self.enabled:
+            await self.save(page.context)
+        return True
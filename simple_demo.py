@@ -7,6 +7,9 @@ Shows real-world testing scenarios for FriendFilter.com
 from playwright.sync_api import sync_playwright
 import time
 
+from artifact_store import ArtifactStore
+from page_objects import BasePage
+
 def run_practical_demo():
     """Run a practical demonstration of web testing"""
     
@@ -21,6 +24,7 @@ def run_practical_demo():
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         )
         page = context.new_page()
+        site = BasePage(page)
         
         try:
             # Test 1: Basic Page Loading
@@ -95,7 +99,7 @@ def run_practical_demo():
             
             for viewport in viewports:
                 page.set_viewport_size({'width': viewport['width'], 'height': viewport['height']})
-                time.sleep(0.5)  # Wait for responsive changes
+                site.wait_for_dom_settled()  # Wait for responsive changes
                 
                 body_visible = page.locator('body').is_visible()
                 chrome_button_visible = page.locator('a[href*="chrome"]').first.is_visible()
@@ -160,14 +164,15 @@ def run_practical_demo():
             print("\n📸 Test 8: Screenshot Capture")
             print("-" * 50)
             
-            page.screenshot(path="friendfilter_full_demo.png")
-            print("📸 Full page screenshot saved: friendfilter_full_demo.png")
+            store = ArtifactStore.from_env()
+            record = store.put(page.screenshot(), "screenshot", "simple_demo", "full_demo")
+            print(f"📸 Full page screenshot saved: {store.root}/{record['path']}")
             
             # Take screenshot of just the header
             header = page.locator('header').first
             if header.count() > 0:
-                header.screenshot(path="friendfilter_header.png")
-                print("📸 Header screenshot saved: friendfilter_header.png")
+                record = store.put(header.screenshot(), "screenshot", "simple_demo", "header")
+                print(f"📸 Header screenshot saved: {store.root}/{record['path']}")
             
             print("\n🎉 All tests completed successfully!")
             
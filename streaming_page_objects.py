@@ -5,6 +5,9 @@ class LoginPage:
     def __init__(self, page: Page):
         self.page = page
     
+    async def is_login_required(self) -> bool:
+        return await self.page.get_by_role("link", name="Log in").count() > 0
+    
     async def login(self, email: str, password: str, remember_me: bool = True):
         await self.page.get_by_role("link", name="Log in").click()
         await self.page.get_by_role("textbox", name="Email Email").fill(email)
@@ -1,47 +1,255 @@
 import pytest
-from playwright.sync_api import sync_playwright, expect
+from playwright.sync_api import sync_playwright
 import time
 import os
 from typing import Dict, List
 
+from browser_pool import BrowserPool
+from page_objects import AuthenticationPage, BasePage, DashboardPage, DEFAULT_BASE_URL, LandingPage, PricingPage
+from page_audit import audit_page, images_missing_alt, meta_content, summarize_audit
+from performance_metrics import budgets_for, check_budgets, collect_metrics, load_budgets
+from har_archive import HarArchive
+from network_waterfall import WATERFALL_PAGES, format_waterfall, record_load, weight_budget_violations
+from emulation_profiles import apply_profile
+from resource_blocking import ResourceBlocker, policy_for_category
+from code_coverage import CoverageRecorder, format_coverage
+from interaction_profiler import InteractionProfiler, format_interaction_table
+from memory_soak import MemorySampler, analyze_soak, format_soak, run_soak
+from visual_regression import VisualRegression, format_visual_result
+from artifact_store import ArtifactStore, new_run_id
+from failure_capture import FailureCapture, format_capture
+from async_bridge import expect
+
+
+def parse_viewport(value: str) -> Dict:
+    """'1920x1080' -> {'width': 1920, 'height': 1080}"""
+    width, height = value.lower().split("x")
+    return {"width": int(width), "height": int(height)}
+
 
 class FriendFilterTestSuite:
     """Comprehensive test suite for FriendFilter.com covering all use cases"""
     
+    # Category name from run_tests.py; decides the resource-blocking policy
+    category = None
+    
+    # Engines the class can run on (None: any); the matrix leaves other engines' cells out
+    engines = None
+    
+    # Run-wide settings shared by every test instance (see configure())
+    base_url = DEFAULT_BASE_URL
+    headless = False
+    default_browser = "chromium"
+    # Engines the compatibility check visits (None: every engine); a matrix cell checks only its own
+    compatibility_engines = None
+    viewport = "1920x1080"
+    use_browser_pool = False
+    pool_max_uses = 50
+    har_mode = None
+    har_dir = "hars"
+    har_strict = True
+    collect_metrics = False
+    budgets_file = None
+    emulation_profile = None
+    block_resources = False
+    soak_iterations = 200
+    soak_sample_every = 20
+    heap_snapshots = False
+    visual_dir = "visual"
+    update_baselines = False
+    artifact_dir = "artifacts"
+    artifact_run_id = None
+    artifact_max_mb = 500
+    capture = None
+    capture_max_actions = 50
+    capture_max_kb = 2048
+    capture_snapshots = False
+    retries = 0
+    retry_budget = 300.0
+    _browser_pool = None
+    _retry_time_used = 0.0
+    
     def __init__(self):
-        self.base_url = "https://friendfilter.com"
+        self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
+        self.base_page = None
+        self.current_test = None
+        self.browser_type = None
+        self.result_details = {}
+        self.cdp_session = None
+        self.resource_blocker = None
+        self.failure_capture = None
+        # Set by async_runner: the test then opens its context in the runner's shared browser
+        self.hub = None
+        self._pooled_browser = None
     
-    def setup_browser(self, headless=False, browser_type="chromium"):
-        """Initialize browser with specific configuration"""
-        self.playwright = sync_playwright().start()
-        
-        if browser_type == "chromium":
-            self.browser = self.playwright.chromium.launch(headless=headless)
-        elif browser_type == "firefox":
-            self.browser = self.playwright.firefox.launch(headless=headless)
-        elif browser_type == "webkit":
-            self.browser = self.playwright.webkit.launch(headless=headless)
+    @classmethod
+    def configure(cls, **settings):
+        """Apply run-wide settings to every test class"""
+        for name, value in settings.items():
+            if name.startswith("_") or not hasattr(FriendFilterTestSuite, name):
+                raise ValueError(f"Unknown suite setting: {name}")
+            setattr(FriendFilterTestSuite, name, value)
+    
+    @classmethod
+    def current_settings(cls) -> Dict:
+        """Return the run-wide settings so worker processes can reapply them"""
+        return {
+            name: value for name, value in vars(FriendFilterTestSuite).items()
+            if not name.startswith("_") and isinstance(value, (bool, int, float, str, list, dict, type(None)))
+        }
+    
+    @classmethod
+    def get_browser_pool(cls):
+        """Return the shared browser pool, creating it on first use"""
+        if not FriendFilterTestSuite.use_browser_pool:
+            return None
+        if FriendFilterTestSuite._browser_pool is None:
+            FriendFilterTestSuite._browser_pool = BrowserPool(max_uses=FriendFilterTestSuite.pool_max_uses)
+        return FriendFilterTestSuite._browser_pool
+    
+    @classmethod
+    def close_browser_pool(cls):
+        """Close the shared browser pool and return its final report"""
+        pool = FriendFilterTestSuite._browser_pool
+        if pool is None:
+            return None
+        FriendFilterTestSuite._browser_pool = None
+        pool.close()
+        return pool.format_report()
+    
+    def setup_browser(self, headless=None, browser_type=None):
+        """Initialize browser with specific configuration (engine-specific tests pass browser_type)"""
+        if headless is None:
+            headless = self.headless
+        browser_type = browser_type or self.default_browser
+        self.browser_type = browser_type
+        
+        if self.hub:
+            # Only the context belongs to this test, the browser is shared by every concurrent test
+            self.browser = self.hub.browser(browser_type)
+        elif self.get_browser_pool():
+            # Reuse the engine launched for earlier tests, only the context is new
+            self.browser = self.get_browser_pool().acquire(browser_type, headless)
+            self._pooled_browser = (browser_type, headless)
+        else:
+            self.playwright = sync_playwright().start()
+            
+            if browser_type == "chromium":
+                self.browser = self.playwright.chromium.launch(headless=headless)
+            elif browser_type == "firefox":
+                self.browser = self.playwright.firefox.launch(headless=headless)
+            elif browser_type == "webkit":
+                self.browser = self.playwright.webkit.launch(headless=headless)
         
         self.context = self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            viewport=parse_viewport(self.viewport),
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # Videos go to a scratch directory and are only kept if the test fails
+            record_video_dir=os.path.join(self.artifact_dir, "tmp", "video") if self.capture == "video" else None
         )
+        if self.capture:
+            self.failure_capture = FailureCapture(
+                self.context, self.capture_max_actions, self.capture_max_kb * 1024, snapshots=self.capture_snapshots
+            ).attach()
+        if self.har_mode:
+            HarArchive(self.har_mode, self.har_dir, self.har_strict).attach(self.context, self.artifact_name())
+        if self.block_resources:
+            policy = policy_for_category(self.category)
+            if policy:
+                # Registered after the HAR route so it sees requests first
+                self.resource_blocker = ResourceBlocker(policy, self.base_url)
+                self.resource_blocker.attach(self.context)
+            else:
+                ResourceBlocker.learn_sizes(self.context)
         self.page = self.context.new_page()
+        if self.emulation_profile:
+            self.cdp_session = apply_profile(self.context, self.page, self.emulation_profile, browser_type)
+            self.result_details["profile"] = self.emulation_profile if self.cdp_session else None
+        # Condition waits (network idle, DOM settled, ...) instead of fixed sleeps
+        self.base_page = BasePage(self.page, self.base_url)
+    
+    def artifact_name(self) -> str:
+        """Identify the running test as ClassName/method for per-test artifacts"""
+        return f"{type(self).__name__}/{self.current_test or 'adhoc'}"
+    
+    @classmethod
+    def artifact_store(cls) -> ArtifactStore:
+        """Content-addressed store for this run's screenshots, traces and videos"""
+        if FriendFilterTestSuite.artifact_run_id is None:
+            # Fixed here so worker processes (which get current_settings()) share one manifest
+            FriendFilterTestSuite.artifact_run_id = new_run_id()
+        return ArtifactStore(
+            FriendFilterTestSuite.artifact_dir,
+            run_id=FriendFilterTestSuite.artifact_run_id,
+            max_bytes=int(FriendFilterTestSuite.artifact_max_mb * 1024 * 1024)
+        )
+    
+    def capture_failure(self, error):
+        """Write the failure ring, screenshots and DOM while the context is still open"""
+        if not self.failure_capture:
+            return
+        try:
+            records = self.failure_capture.save(self.artifact_store(), self.artifact_name(), error)
+        except Exception as e:
+            print(f"  ⚠️  Failure capture failed: {e}")
+            return
+        print(format_capture(records, self.artifact_dir))
+        self.result_details.setdefault("artifacts", []).extend(records)
     
     def teardown_browser(self):
-        """Clean up browser resources"""
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        """Clean up browser resources (safe to call more than once)"""
+        crashed = False
+        if self.collect_metrics and self.page and "metrics" not in self.result_details:
+            try:
+                self.result_details["metrics"] = collect_metrics(self.page)
+            except Exception:
+                pass
+        if self.resource_blocker:
+            self.result_details["blocked"] = self.resource_blocker.stats()
+            self.resource_blocker = None
+        if self.base_page and self.base_page.wait_log:
+            self.result_details["wait_time"] = self.base_page.total_wait_time()
+            self.result_details["waits"] = self.base_page.wait_log
+        self.base_page = None
+        
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                crashed = True
+        self.context = None
+        self.page = None
+        self.cdp_session = None
+        
+        if self.failure_capture:
+            # Videos are finalised on context close; a passing test's are deleted
+            videos = self.failure_capture.finish(self.artifact_store(), self.artifact_name())
+            if videos:
+                print(format_capture(videos, self.artifact_dir))
+                self.result_details.setdefault("artifacts", []).extend(videos)
+            self.failure_capture = None
+        
+        if self._pooled_browser:
+            browser_type, headless = self._pooled_browser
+            self.get_browser_pool().release(browser_type, headless, crashed=crashed)
+            self._pooled_browser = None
+        elif not self.hub:
+            if self.browser:
+                self.browser.close()
+            if self.playwright:
+                self.playwright.stop()
+        self.browser = None
+        self.playwright = None
 
 
 class TestLandingPage(FriendFilterTestSuite):
     """Test cases for the main landing page"""
     
+    category = "landing"
+    
     def test_homepage_loads_successfully(self):
         """Test that the homepage loads without errors"""
         self.setup_browser()
@@ -93,7 +301,7 @@ class TestLandingPage(FriendFilterTestSuite):
             if nav_link.count() > 0:
                 expect(nav_link).to_be_visible()
                 nav_link.click()
-                self.page.wait_for_timeout(1000)
+                self.base_page.wait_for_dom_settled()
         
         self.teardown_browser()
     
@@ -127,6 +335,8 @@ class TestLandingPage(FriendFilterTestSuite):
 class TestUserAuthentication(FriendFilterTestSuite):
     """Test cases for user authentication flow"""
     
+    category = "auth"
+    
     def test_signup_form(self):
         """Test user signup functionality"""
         self.setup_browser()
@@ -217,6 +427,8 @@ class TestUserAuthentication(FriendFilterTestSuite):
 class TestPricingPage(FriendFilterTestSuite):
     """Test cases for pricing page functionality"""
     
+    category = "pricing"
+    
     def test_pricing_plans_display(self):
         """Test that pricing plans are displayed correctly"""
         self.setup_browser()
@@ -239,10 +451,11 @@ class TestPricingPage(FriendFilterTestSuite):
         # Look for plan selection buttons
         select_buttons = self.page.locator('text="Select Plan", text="Choose Plan", text="Get Started"')
         if select_buttons.count() > 0:
+            previous_url = self.page.url
             select_buttons.first.click()
             
             # Check if redirected to signup or payment
-            self.page.wait_for_timeout(2000)
+            self.base_page.wait_for_url_change(previous_url)
             current_url = self.page.url
             assert "signup" in current_url or "payment" in current_url or "checkout" in current_url
         
@@ -252,6 +465,8 @@ class TestPricingPage(FriendFilterTestSuite):
 class TestDashboardFunctionality(FriendFilterTestSuite):
     """Test cases for dashboard features (requires authentication)"""
     
+    category = "dashboard"
+    
     def test_dashboard_elements(self):
         """Test dashboard UI elements"""
         self.setup_browser()
@@ -289,7 +504,7 @@ class TestDashboardFunctionality(FriendFilterTestSuite):
             button = self.page.locator(button_text)
             if button.count() > 0:
                 button.click()
-                self.page.wait_for_timeout(1000)
+                self.base_page.wait_for_network_idle("**/api/**", idle_ms=250)
         
         self.teardown_browser()
     
@@ -304,7 +519,8 @@ class TestDashboardFunctionality(FriendFilterTestSuite):
             expect(search_input).to_be_visible()
             search_input.fill("test search")
             search_input.press("Enter")
-            self.page.wait_for_timeout(2000)
+            self.base_page.wait_for_network_idle("**/api/**", idle_ms=250)
+            self.base_page.wait_for_dom_settled()
         
         self.teardown_browser()
 
@@ -312,6 +528,8 @@ class TestDashboardFunctionality(FriendFilterTestSuite):
 class TestExtensionFeatures(FriendFilterTestSuite):
     """Test cases for Chrome extension specific features"""
     
+    category = "extension"
+    
     def test_extension_download_links(self):
         """Test extension download and installation links"""
         self.setup_browser()
@@ -342,6 +560,8 @@ class TestExtensionFeatures(FriendFilterTestSuite):
 class TestFormValidation(FriendFilterTestSuite):
     """Test cases for form validation and error handling"""
     
+    category = "forms"
+    
     def test_email_validation(self):
         """Test email field validation"""
         self.setup_browser()
@@ -377,7 +597,7 @@ class TestFormValidation(FriendFilterTestSuite):
                 submit_button.click()
                 
                 # Check for validation messages
-                self.page.wait_for_timeout(1000)
+                self.base_page.wait_for_dom_settled()
         
         self.teardown_browser()
 
@@ -385,17 +605,37 @@ class TestFormValidation(FriendFilterTestSuite):
 class TestPerformanceAndSEO(FriendFilterTestSuite):
     """Test cases for performance and SEO optimization"""
     
+    category = "performance"
+    
     def test_page_load_time(self):
         """Test page load performance"""
         self.setup_browser()
-        
-        start_time = time.time()
         self.page.goto(self.base_url)
-        self.page.wait_for_load_state("domcontentloaded")
-        end_time = time.time()
         
-        load_time = end_time - start_time
-        assert load_time < 5.0, f"Page load time too slow: {load_time}s"
+        # Use the browser's own timing entries rather than wall-clock around goto
+        metrics = collect_metrics(self.page)
+        self.result_details["metrics"] = metrics
+        
+        violations = check_budgets(metrics, budgets_for(load_budgets(self.budgets_file), "/", self.emulation_profile))
+        assert not violations, f"Performance budget exceeded: {'; '.join(violations)}"
+        
+        self.teardown_browser()
+    
+    def test_page_weight(self):
+        """Test request count and bytes of the key pages against size budgets"""
+        self.setup_browser()
+        budgets = load_budgets(self.budgets_file)
+        
+        violations = []
+        self.result_details["waterfall"] = {}
+        for path, page_class in WATERFALL_PAGES.items():
+            report = record_load(page_class(self.page, self.base_url))
+            self.result_details["waterfall"][path] = report["summary"]
+            print(format_waterfall(report, path, limit=0))
+            budgets_for_path = budgets_for(budgets, path, self.emulation_profile)
+            violations += [f"{path} {v}" for v in weight_budget_violations(report["summary"], budgets_for_path)]
+        
+        assert not violations, f"Page weight budget exceeded: {'; '.join(violations)}"
         
         self.teardown_browser()
     
@@ -403,20 +643,20 @@ class TestPerformanceAndSEO(FriendFilterTestSuite):
         """Test SEO meta tags presence"""
         self.setup_browser()
         self.page.goto(self.base_url)
+        report = audit_page(self.page)
         
-        # Check for essential meta tags
+        # Check for essential meta tags (by name or property)
         meta_tags = [
-            'meta[name="description"]',
-            'meta[property="og:title"]',
-            'meta[property="og:description"]',
-            'meta[name="viewport"]'
+            'description',
+            'og:title',
+            'og:description',
+            'viewport'
         ]
         
         for tag in meta_tags:
-            meta_element = self.page.locator(tag)
-            if meta_element.count() > 0:
-                content = meta_element.get_attribute('content')
-                assert content and len(content) > 0
+            content = meta_content(report, tag)
+            if content is not None:
+                assert len(content) > 0, f"Empty meta tag: {tag}"
         
         self.teardown_browser()
     
@@ -425,13 +665,13 @@ class TestPerformanceAndSEO(FriendFilterTestSuite):
         self.setup_browser()
         self.page.goto(self.base_url)
         
-        # Check all images have alt attributes
-        images = self.page.locator('img')
-        for i in range(images.count()):
-            img = images.nth(i)
-            alt_text = img.get_attribute('alt')
-            # Alt attribute should exist (can be empty for decorative images)
-            assert alt_text is not None
+        # Check all images have alt attributes, from one in-page audit
+        report = audit_page(self.page)
+        self.result_details["audit"] = summarize_audit(report)
+        
+        # Alt attribute should exist (can be empty for decorative images)
+        missing_alt = images_missing_alt(report)
+        assert not missing_alt, f"Images without alt attribute: {missing_alt}"
         
         self.teardown_browser()
 
@@ -439,6 +679,8 @@ class TestPerformanceAndSEO(FriendFilterTestSuite):
 class TestAccessibility(FriendFilterTestSuite):
     """Test cases for web accessibility compliance"""
     
+    category = "accessibility"
+    
     def test_keyboard_navigation(self):
         """Test keyboard navigation functionality"""
         self.setup_browser()
@@ -448,9 +690,9 @@ class TestAccessibility(FriendFilterTestSuite):
         focusable_elements = self.page.locator('a, button, input, select, textarea, [tabindex]')
         if focusable_elements.count() > 0:
             # Tab through elements
+            # keyboard.press returns once the key events are dispatched, so no delay is needed
             for i in range(min(5, focusable_elements.count())):
                 self.page.keyboard.press("Tab")
-                self.page.wait_for_timeout(200)
         
         self.teardown_browser()
     
@@ -460,17 +702,11 @@ class TestAccessibility(FriendFilterTestSuite):
         self.page.goto(self.base_url)
         
         # Check for ARIA landmarks
-        landmarks = [
-            '[role="main"]',
-            '[role="navigation"]',
-            '[role="banner"]',
-            '[role="contentinfo"]'
-        ]
+        report = audit_page(self.page)
         
-        for landmark in landmarks:
-            element = self.page.locator(landmark)
-            if element.count() > 0:
-                expect(element).to_be_visible()
+        for role, landmark in report["landmarks"].items():
+            if landmark["count"] > 0:
+                assert landmark["visible"], f'[role="{role}"] landmark is not visible'
         
         self.teardown_browser()
 
@@ -478,31 +714,22 @@ class TestAccessibility(FriendFilterTestSuite):
 class TestCrossBrowserCompatibility(FriendFilterTestSuite):
     """Test cases for cross-browser compatibility"""
     
-    def test_chromium_compatibility(self):
-        """Test functionality in Chromium-based browsers"""
-        self.setup_browser(browser_type="chromium")
-        self.page.goto(self.base_url)
-        expect(self.page.locator("body")).to_be_visible()
-        self.teardown_browser()
-    
-    def test_firefox_compatibility(self):
-        """Test functionality in Firefox"""
-        self.setup_browser(browser_type="firefox")
-        self.page.goto(self.base_url)
-        expect(self.page.locator("body")).to_be_visible()
-        self.teardown_browser()
+    category = "browsers"
     
-    def test_webkit_compatibility(self):
-        """Test functionality in WebKit (Safari)"""
-        self.setup_browser(browser_type="webkit")
-        self.page.goto(self.base_url)
-        expect(self.page.locator("body")).to_be_visible()
-        self.teardown_browser()
+    def test_engine_compatibility(self):
+        """Test basic functionality in every engine, or only the ones picked with --browsers"""
+        for browser_type in self.compatibility_engines or BrowserPool.SUPPORTED_ENGINES:
+            self.setup_browser(browser_type=browser_type)
+            self.page.goto(self.base_url)
+            expect(self.page.locator("body"), f"page body not visible in {browser_type}").to_be_visible()
+            self.teardown_browser()
 
 
 class TestErrorHandling(FriendFilterTestSuite):
     """Test cases for error handling and edge cases"""
     
+    category = "errors"
+    
     def test_404_error_handling(self):
         """Test 404 error page handling"""
         self.setup_browser()
@@ -528,67 +755,434 @@ class TestErrorHandling(FriendFilterTestSuite):
         self.teardown_browser()
 
 
-def run_comprehensive_tests():
-    """Run all test suites"""
-    test_classes = [
-        TestLandingPage,
-        TestUserAuthentication,
-        TestPricingPage,
-        TestDashboardFunctionality,
-        TestExtensionFeatures,
-        TestFormValidation,
-        TestPerformanceAndSEO,
-        TestAccessibility,
-        TestCrossBrowserCompatibility,
-        TestErrorHandling
-    ]
+class TestCodeCoverage(FriendFilterTestSuite):
+    """Test cases measuring shipped-but-unused JS and CSS (Chromium only)"""
     
-    results = {}
+    category = "coverage"
+    engines = ("chromium",)
     
-    for test_class in test_classes:
-        class_name = test_class.__name__
-        print(f"\n🧪 Running {class_name} tests...")
+    def measure_coverage(self, page_class, url_path: str, interact) -> Dict:
+        """Load a page object, run its interaction pass and return the coverage report"""
+        self.setup_browser()
+        recorder = CoverageRecorder(self.context, self.page).start()
+        try:
+            page_object = page_class(self.page, self.base_url)
+            page_object.load()
+            page_object.wait_for_network_idle(idle_ms=250)
+            interact(page_object)
+            page_object.wait_for_dom_settled()
+            report = recorder.take()
+        finally:
+            recorder.stop()
+        
+        print(format_coverage(report, self.current_test))
+        # Stored as metrics so the performance history tracks the unused bytes over time
+        self.result_details["metrics"] = {"coverage": report["totals"]}
+        self.result_details["coverage"] = report["resources"]
+        
+        budgets = budgets_for(load_budgets(self.budgets_file), url_path, self.emulation_profile)
+        violations = check_budgets({"coverage": report["totals"]}, budgets)
+        assert not violations, f"Coverage budget exceeded: {'; '.join(violations)}"
+        return report
+    
+    def test_landing_coverage(self):
+        """Test unused bytes on the landing page"""
+        def interact(landing):
+            landing.get_main_heading()
+            landing.is_loaded()
         
-        test_instance = test_class()
-        test_methods = [method for method in dir(test_instance) if method.startswith('test_')]
+        report = self.measure_coverage(LandingPage, "/", interact)
+        assert report["totals"]["js_bytes"] + report["totals"]["css_bytes"] > 0, "No JS or CSS was recorded"
         
-        class_results = []
+        self.teardown_browser()
+    
+    def test_pricing_coverage(self):
+        """Test unused bytes on the pricing page"""
+        def interact(pricing):
+            pricing.get_pricing_cards_count()
+            pricing.toggle_billing_period()
+            pricing.toggle_billing_period()
         
-        for method_name in test_methods:
-            try:
-                print(f"  ▶️  {method_name}")
-                method = getattr(test_instance, method_name)
-                method()
-                print(f"  ✅ {method_name} - PASSED")
-                class_results.append({"test": method_name, "status": "PASSED"})
-            except Exception as e:
-                print(f"  ❌ {method_name} - FAILED: {str(e)}")
-                class_results.append({"test": method_name, "status": "FAILED", "error": str(e)})
+        report = self.measure_coverage(PricingPage, "/pricing", interact)
+        assert report["totals"]["js_bytes"] + report["totals"]["css_bytes"] > 0, "No JS or CSS was recorded"
         
-        results[class_name] = class_results
+        self.teardown_browser()
     
-    return results
+    def test_dashboard_coverage(self):
+        """Test unused bytes on the dashboard after search and filter interactions"""
+        def interact(dashboard):
+            dashboard.search_connections("a")
+            for filter_type in ("Active", "Archived", "All"):
+                dashboard.filter_connections(filter_type)
+                dashboard.wait_for_network_idle("**/api/**", idle_ms=250)
+            dashboard.get_connections_count()
+        
+        report = self.measure_coverage(DashboardPage, "/dashboard", interact)
+        assert report["totals"]["js_bytes"] + report["totals"]["css_bytes"] > 0, "No JS or CSS was recorded"
+        
+        self.teardown_browser()
 
 
-if __name__ == "__main__":
-    print("🚀 Starting FriendFilter.com Comprehensive Test Suite")
-    print("=" * 60)
+class TestInteractionLatency(FriendFilterTestSuite):
+    """Test cases measuring long tasks and event-to-next-paint latency of page-object actions"""
     
-    results = run_comprehensive_tests()
+    category = "interactions"
+    
+    def check_interactions(self, profiler: InteractionProfiler):
+        """Report the per-action table and check it against the interaction budgets"""
+        table = profiler.table()
+        print(format_interaction_table(table))
+        self.result_details["interactions"] = table
+        self.result_details["metrics"] = {
+            "interaction": {row["action"]: {"inp": row["inp"], "blocking_time": row["blocking_time"]} for row in table}
+        }
+        
+        budgets = budgets_for(load_budgets(self.budgets_file), "/", self.emulation_profile)
+        violations = []
+        for row in table:
+            violations += [f"{row['action']} {v}" for v in check_budgets({"interaction": row}, budgets)]
+        assert not violations, f"Interaction budget exceeded: {'; '.join(violations)}"
+    
+    def test_pricing_interactions(self):
+        """Test responsiveness of billing toggles and plan selection"""
+        self.setup_browser()
+        profiler = InteractionProfiler(self.page)
+        pricing = profiler.wrap(PricingPage(self.page, self.base_url).load())
+        pricing.wait_for_network_idle(idle_ms=250)
+        
+        for _ in range(3):
+            pricing.toggle_billing_period()
+            pricing.wait_for_dom_settled(quiet_ms=100)
+        # Selecting a plan navigates away, so it goes last
+        pricing.select_plan(0)
+        
+        self.check_interactions(profiler)
+        self.teardown_browser()
+    
+    def test_dashboard_interactions(self):
+        """Test responsiveness of connection filters and search"""
+        self.setup_browser()
+        profiler = InteractionProfiler(self.page)
+        dashboard = profiler.wrap(DashboardPage(self.page, self.base_url).load())
+        dashboard.wait_for_network_idle(idle_ms=250)
+        
+        for _ in range(2):
+            for filter_type in ("Active", "Archived", "All"):
+                dashboard.filter_connections(filter_type)
+                dashboard.wait_for_network_idle("**/api/**", idle_ms=100)
+        dashboard.search_connections("friend")
+        dashboard.wait_for_network_idle("**/api/**", idle_ms=100)
+        
+        self.check_interactions(profiler)
+        self.teardown_browser()
+    
+    def test_auth_form_interactions(self):
+        """Test responsiveness of filling and submitting the login form"""
+        self.setup_browser()
+        profiler = InteractionProfiler(self.page)
+        auth = profiler.wrap(AuthenticationPage(self.page, self.base_url))
+        auth.navigate_to("/login")
+        
+        auth.fill_email("test@example.com")
+        auth.fill_password("password123")
+        auth.submit_form()
+        
+        self.check_interactions(profiler)
+        self.teardown_browser()
+
+
+class TestVisualRegression(FriendFilterTestSuite):
+    """Test cases comparing key pages with their stored screenshots"""
+    
+    category = "visual"
+    
+    # Content that changes between loads is painted over before comparing
+    DYNAMIC_SELECTORS = ['time', '[data-dynamic]', '.connections-count', 'iframe']
+    
+    def check_visual(self, name: str, full_page: bool = True):
+        """Compare the current page with its baseline for this browser and viewport"""
+        self.base_page.wait_for_network_idle(idle_ms=250)
+        self.base_page.wait_for_dom_settled()
+        visual = VisualRegression(self.visual_dir, update=self.update_baselines, store=self.artifact_store())
+        result = visual.check(
+            self.page, name, self.browser_type, full_page=full_page, mask_selectors=self.DYNAMIC_SELECTORS,
+            test=self.artifact_name()
+        )
+        print(format_visual_result(result))
+        self.result_details.setdefault("visual", []).append(result)
+        if result["status"] == "mismatch":
+            detail = result.get("reason") or f"{result['diff_ratio'] * 100:.3f}% of pixels"
+            raise AssertionError(f"{name} differs from its baseline ({detail})")
+        if result["status"] == "new" and not self.update_baselines:
+            # Nothing was compared, so a fresh baseline must not count as a pass
+            raise AssertionError(f"{name} has no baseline yet; wrote {result['baseline']}, review it and re-run")
+    
+    def test_landing_visual(self):
+        """Test the landing page against its baseline"""
+        self.setup_browser()
+        LandingPage(self.page, self.base_url).load()
+        self.check_visual("landing")
+        
+        self.teardown_browser()
+    
+    def test_pricing_visual(self):
+        """Test the pricing page against its baseline"""
+        self.setup_browser()
+        PricingPage(self.page, self.base_url).load()
+        self.check_visual("pricing")
+        
+        self.teardown_browser()
+    
+    def test_landing_mobile_visual(self):
+        """Test the landing page at a phone viewport against its baseline"""
+        self.setup_browser()
+        self.page.set_viewport_size({"width": 375, "height": 812})
+        LandingPage(self.page, self.base_url).load()
+        self.check_visual("landing-viewport", full_page=False)
+        
+        self.teardown_browser()
+
+
+class TestMemorySoak(FriendFilterTestSuite):
+    """Soak tests repeating dashboard interactions to catch memory leaks (Chromium only)"""
     
+    category = "soak"
+    engines = ("chromium",)
+    
+    def test_dashboard_memory_soak(self):
+        """Test that repeated search/filter cycles don't keep growing the heap"""
+        self.setup_browser()
+        dashboard = DashboardPage(self.page, self.base_url).load()
+        dashboard.wait_for_network_idle(idle_ms=250)
+        
+        sampler = MemorySampler(self.context, self.page)
+        try:
+            soak = run_soak(
+                dashboard, sampler, iterations=self.soak_iterations,
+                sample_every=self.soak_sample_every, snapshots=self.heap_snapshots
+            )
+        finally:
+            sampler.close()
+        
+        analysis = analyze_soak(soak["samples"])
+        print(format_soak(analysis, soak["retained"]))
+        self.result_details["memory"] = dict(analysis, samples=soak["samples"], retained=soak["retained"])
+        self.result_details["metrics"] = {
+            "memory": {"heap_slope": analysis["slopes"]["heap_used"], "heap_growth": analysis["heap_growth"]}
+        }
+        
+        assert not analysis["leaking"], (
+            f"Heap kept growing after forced GC: {analysis['slopes']['heap_used']:.0f} B/iteration, "
+            f"{analysis['heap_growth'] * 100:+.1f}% over {self.soak_iterations} cycles"
+        )
+        
+        self.teardown_browser()
+
+
+def collect_test_methods(test_class) -> List[str]:
+    """Return the names of the test methods defined on a test class"""
+    return [method for method in dir(test_class) if method.startswith('test_')]
+
+
+def supports_engine(test_class, browser: str) -> bool:
+    """Whether a test class can run on a browser engine"""
+    return not test_class.engines or browser in test_class.engines
+
+
+def run_test_method(test_instance, method_name: str) -> Dict:
+    """Run one test method, always releasing its browser, and time it"""
+    print(f"  ▶️  {method_name}")
+    test_instance.current_test = method_name
+    test_instance.result_details = {}
+    started = time.perf_counter()
+    try:
+        getattr(test_instance, method_name)()
+        result = {"test": method_name, "status": "PASSED"}
+        print(f"  ✅ {method_name} - PASSED")
+    except Exception as e:
+        result = {"test": method_name, "status": "FAILED", "error": str(e)}
+        print(f"  ❌ {method_name} - FAILED: {str(e)}")
+        test_instance.capture_failure(e)
+    finally:
+        # Tests only tear down on success, so make sure failures don't leak contexts
+        test_instance.teardown_browser()
+    result["duration"] = round(time.perf_counter() - started, 3)
+    result.update(test_instance.result_details)
+    return result
+
+
+def run_test_with_retries(test_instance, method_name: str) -> Dict:
+    """Run a test and retry failures, each attempt in a fresh context, within the retry count and time budget"""
+    result = run_test_method(test_instance, method_name)
+    attempts = [{"status": result["status"], "duration": result["duration"], "error": result.get("error")}]
+    retry_time = 0.0
+    while (result["status"] == "FAILED" and len(attempts) <= FriendFilterTestSuite.retries
+           and FriendFilterTestSuite._retry_time_used < FriendFilterTestSuite.retry_budget):
+        print(f"  🔁 Retrying {method_name} (attempt {len(attempts) + 1} of {FriendFilterTestSuite.retries + 1})")
+        result = run_test_method(test_instance, method_name)
+        attempts.append({"status": result["status"], "duration": result["duration"], "error": result.get("error")})
+        retry_time += result["duration"]
+        # The budget is per process, so each parallel worker has its own
+        FriendFilterTestSuite._retry_time_used += result["duration"]
+    
+    if len(attempts) > 1:
+        result["attempts"] = attempts
+        result["retry_time"] = round(retry_time, 3)
+        result["flaky"] = result["status"] == "PASSED"
+    return result
+
+
+TEST_CLASSES = [
+    TestLandingPage,
+    TestUserAuthentication,
+    TestPricingPage,
+    TestDashboardFunctionality,
+    TestExtensionFeatures,
+    TestFormValidation,
+    TestPerformanceAndSEO,
+    TestAccessibility,
+    TestCrossBrowserCompatibility,
+    TestErrorHandling,
+    TestInteractionLatency
+]
+
+
+def run_test_ids(test_classes: List, tests: List[str], use_browser_pool=True, workers=1, max_failures: int = None,
+                 concurrency: int = 0) -> Dict[str, Dict]:
+    """Run ClassName.test_method ids in the given order; returns the result of each test that ran"""
+    if concurrency:
+        from async_runner import run_concurrent
+        return run_concurrent(tests, concurrency, max_failures=max_failures)
+    if workers > 1:
+        from parallel_runner import run_parallel
+        return run_parallel(tests, workers, use_browser_pool=use_browser_pool, max_failures=max_failures)
+    
+    finished = {}
+    instances = {}
+    FriendFilterTestSuite.configure(use_browser_pool=use_browser_pool)
+    classes = {test_class.__name__: test_class for test_class in test_classes}
+    
+    failures = 0
+    current_class = None
+    try:
+        for test in tests:
+            if max_failures and failures >= max_failures:
+                break
+            class_name, method_name = test.split(".")
+            if class_name != current_class:
+                print(f"\n🧪 Running {class_name} tests...")
+                current_class = class_name
+            if class_name not in instances:
+                instances[class_name] = classes[class_name]()
+            finished[test] = run_test_with_retries(instances[class_name], method_name)
+            failures += finished[test]["status"] == "FAILED"
+    finally:
+        pool_report = FriendFilterTestSuite.close_browser_pool()
+        if pool_report:
+            print(f"\n{pool_report}")
+    return finished
+
+
+def run_test_classes(test_classes: List, use_browser_pool=True, workers=1, tests: List[str] = None,
+                     max_failures: int = None, quarantine: List[str] = (), concurrency: int = 0) -> Dict:
+    """Run the given test classes serially, across worker processes or as concurrent contexts in one browser
+
+    tests optionally lists the ClassName.test_method ids to run, in the order to start them.
+    max_failures stops starting new tests once that many have failed.
+    Quarantined tests run in a second pass after the others and their failures don't count.
+    """
+    if tests is None:
+        tests = [f"{test_class.__name__}.{method}" for test_class in test_classes
+                 for method in collect_test_methods(test_class)]
+    
+    # The retry budget is per run, even when one process runs several
+    FriendFilterTestSuite._retry_time_used = 0.0
+    
+    quarantined = [test for test in tests if test in quarantine]
+    tests = [test for test in tests if test not in quarantine]
+    finished = run_test_ids(test_classes, tests, use_browser_pool, workers, max_failures, concurrency)
+    
+    if len(finished) < len(tests):
+        print(f"\n⏹️  Stopped after {max_failures} failure(s): {len(tests) - len(finished)} tests not run")
+    elif quarantined:
+        print(f"\n🚧 {len(quarantined)} quarantined flaky tests run last and don't block:")
+        print("   " + ", ".join(quarantined))
+        lane = run_test_ids(test_classes, quarantined, use_browser_pool, workers, concurrency=concurrency)
+        for test, result in lane.items():
+            finished[test] = dict(result, quarantined=True)
+    
+    # Merge back in class/method order so the summary reads the same however tests were scheduled
+    results = {}
+    for test_class in test_classes:
+        for method_name in collect_test_methods(test_class):
+            test = f"{test_class.__name__}.{method_name}"
+            if test in finished:
+                results.setdefault(test_class.__name__, []).append(finished[test])
+    return results
+
+
+def run_comprehensive_tests(use_browser_pool=True, workers=1, tests: List[str] = None, max_failures: int = None,
+                            quarantine: List[str] = (), concurrency: int = 0):
+    """Run all test suites"""
+    return run_test_classes(
+        TEST_CLASSES, use_browser_pool=use_browser_pool, workers=workers, tests=tests, max_failures=max_failures,
+        quarantine=quarantine, concurrency=concurrency
+    )
+
+
+def count_outcomes(class_results: List[Dict]) -> tuple:
+    """(passed, failed, quarantined failures) for a list of results"""
+    passed = sum(1 for r in class_results if r["status"] == "PASSED")
+    quarantined = sum(1 for r in class_results if r["status"] == "FAILED" and r.get("quarantined"))
+    return passed, len(class_results) - passed - quarantined, quarantined
+
+
+def format_retry_report(results: Dict) -> str:
+    """What retries cost this run: attempts, recovered flaky tests and time spent on retries"""
+    retried = [(class_name, r) for class_name, class_results in results.items()
+               for r in class_results if r.get("attempts")]
+    if not retried:
+        return ""
+    retry_time = sum(r["retry_time"] for _, r in retried)
+    flaky = sum(1 for _, r in retried if r["flaky"])
+    lines = [
+        f"🔁 Retries: {sum(len(r['attempts']) - 1 for _, r in retried)} on {len(retried)} tests, "
+        f"{flaky} passed on retry (flaky), {retry_time:.1f}s spent retrying"
+    ]
+    for class_name, r in sorted(retried, key=lambda item: item[1]["retry_time"], reverse=True):
+        outcome = "flaky" if r["flaky"] else "still failing"
+        lines.append(f"   {class_name}.{r['test']}: {len(r['attempts'])} attempts, {r['retry_time']:.1f}s, {outcome}")
+    return "\n".join(lines)
+
+
+def print_summary(results: Dict):
+    """Print per-class and overall pass counts for a results dict"""
     print("\n" + "=" * 60)
     print("📊 TEST SUMMARY")
     print("=" * 60)
     
     total_tests = 0
     total_passed = 0
+    total_quarantined = 0
     
     for class_name, class_results in results.items():
-        passed = sum(1 for r in class_results if r["status"] == "PASSED")
-        failed = len(class_results) - passed
+        passed, failed, quarantined = count_outcomes(class_results)
         total_tests += len(class_results)
         total_passed += passed
+        total_quarantined += quarantined
         
-        print(f"{class_name}: {passed} passed, {failed} failed")
+        line = f"{class_name}: {passed} passed, {failed} failed"
+        print(line + (f", {quarantined} quarantined failures" if quarantined else ""))
     
-    print(f"\nOverall: {total_passed}/{total_tests} tests passed ({total_passed/total_tests*100:.1f}%)")
\ No newline at end of file
+    if total_tests:
+        print(f"\nOverall: {total_passed}/{total_tests} tests passed ({total_passed/total_tests*100:.1f}%)")
+    if total_quarantined:
+        print(f"🚧 {total_quarantined} quarantined tests failed (not blocking)")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting FriendFilter.com Comprehensive Test Suite")
+    print("=" * 60)
+    
+    results = run_comprehensive_tests()
+    print_summary(results)
@@ -1,6 +1,8 @@
 import asyncio
 import pytest
 from playwright.async_api import async_playwright, expect
+from har_archive import HarArchive
+from session_cache import SessionCache
 
 
 class TestStreamingAdmin:
@@ -8,7 +10,11 @@ class TestStreamingAdmin:
     async def setup_browser(self):
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(headless=False)
-        self.context = await self.browser.new_context()
+        self.session = SessionCache()
+        self.context = await self.session.new_context(self.browser)
+        har = HarArchive.from_env()
+        if har:
+            await har.attach_async(self.context, "streaming/test_streaming_admin")
         self.page = await self.context.new_page()
     
     async def teardown_browser(self):
@@ -23,17 +29,8 @@ class TestStreamingAdmin:
             # Navigate to admin panel
             await self.page.goto("https://acestreamz.com/admin")
             
-            # Click login link
-            await self.page.get_by_role("link", name="Log in").click()
-            
-            # Login with credentials
-            await self.page.get_by_role("textbox", name="Email Email").fill("mike@nightcoders.com")
-            await self.page.get_by_role("textbox", name="Password Password").fill("rismoM-rywryp-gisge1")
-            await self.page.get_by_role("checkbox", name="Remember me").check()
-            await self.page.get_by_role("button", name="Log in").click()
-            
-            # Accept terms/cookies
-            await self.page.get_by_role("button", name="Accept").click()
+            # Login and accept terms, unless the saved session is still valid
+            await self.session.ensure_logged_in(self.page, "mike@nightcoders.com", "rismoM-rywryp-gisge1")
             
             # Navigate to Backend
             await self.page.get_by_text("Backend").click()
@@ -1,6 +1,10 @@
 import asyncio
 from playwright.async_api import async_playwright, expect
 from streaming_page_objects import LoginPage, AdminDashboard, UserManagement
+from artifact_store import ArtifactStore
+from failure_capture import FailureCapture, format_capture
+from har_archive import HarArchive
+from session_cache import SessionCache
 
 
 class TestStreamingAdminImproved:
@@ -15,7 +19,12 @@ class TestStreamingAdminImproved:
     async def setup_browser(self, headless=False):
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(headless=headless)
-        self.context = await self.browser.new_context()
+        self.session = SessionCache()
+        self.context = await self.session.new_context(self.browser)
+        har = HarArchive.from_env()
+        if har:
+            await har.attach_async(self.context, "streaming/test_streaming_improved")
+        self.capture = FailureCapture(self.context).attach()
         self.page = await self.context.new_page()
         
         # Initialize page objects
@@ -32,9 +41,10 @@ class TestStreamingAdminImproved:
         await self.setup_browser()
         
         try:
-            # Navigate and login
+            # Navigate and login (reuses the saved session when it is still valid)
             await self.page.goto(self.base_url)
-            await self.login_page.login(
+            await self.session.ensure_logged_in(
+                self.page,
                 self.credentials["email"], 
                 self.credentials["password"]
             )
@@ -53,8 +63,10 @@ class TestStreamingAdminImproved:
             print("✅ Admin workflow test completed successfully")
             
         except Exception as e:
-            await self.page.screenshot(path="test_failure.png")
+            store = ArtifactStore.from_env()
+            records = await self.capture.save_async(store, "streaming/test_streaming_improved", e)
             print(f"❌ Test failed: {e}")
+            print(format_capture(records, store.root))
             raise
         
         finally:
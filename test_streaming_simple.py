@@ -1,11 +1,20 @@
 import asyncio
 from playwright.async_api import async_playwright
+from artifact_store import ArtifactStore
+from failure_capture import FailureCapture, format_capture
+from har_archive import HarArchive
+from session_cache import SessionCache
 
 
 async def test_streaming_admin():
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
+        session = SessionCache()
+        context = await session.new_context(browser)
+        har = HarArchive.from_env()
+        if har:
+            await har.attach_async(context, "streaming/test_streaming_simple")
+        capture = FailureCapture(context).attach()
         page = await context.new_page()
         
         try:
@@ -15,17 +24,11 @@ async def test_streaming_admin():
             await page.goto("https://acestreamz.com/admin")
             print("✅ Navigated to admin panel")
             
-            # Login
-            await page.get_by_role("link", name="Log in").click()
-            await page.get_by_role("textbox", name="Email Email").fill("mike@nightcoders.com")
-            await page.get_by_role("textbox", name="Password Password").fill("rismoM-rywryp-gisge1")
-            await page.get_by_role("checkbox", name="Remember me").check()
-            await page.get_by_role("button", name="Log in").click()
-            print("✅ Login completed")
-            
-            # Accept terms
-            await page.get_by_role("button", name="Accept").click()
-            print("✅ Terms accepted")
+            # Login (skipped when the saved session is still valid)
+            if await session.ensure_logged_in(page, "mike@nightcoders.com", "rismoM-rywryp-gisge1"):
+                print("✅ Login completed and terms accepted")
+            else:
+                print("✅ Reused saved login session")
             
             # Navigate to Backend
             await page.get_by_text("Backend").click()
@@ -52,8 +55,10 @@ async def test_streaming_admin():
             print("🎉 Test completed successfully!")
             
         except Exception as e:
-            await page.screenshot(path="test_failure.png")
+            store = ArtifactStore.from_env()
+            records = await capture.save_async(store, "streaming/test_streaming_simple", e)
             print(f"❌ Test failed: {e}")
+            print(format_capture(records, store.root))
             raise
         
         finally:
@@ -7,6 +7,9 @@ This demo runs with the browser visible so you can see Playwright working
 from playwright.sync_api import sync_playwright
 import time
 
+from artifact_store import ArtifactStore
+
+
 def visual_demo():
     """Run a visual demonstration with browser window open"""
     
@@ -142,8 +145,9 @@ def visual_demo():
             
             # Step 6: Take a screenshot
             print("📸 Step 6: Taking screenshot...")
-            page.screenshot(path="visual_demo_screenshot.png", full_page=True)
-            print("   ✅ Screenshot saved as 'visual_demo_screenshot.png'")
+            store = ArtifactStore.from_env()
+            record = store.put(page.screenshot(full_page=True), "screenshot", "visual_demo", "full_page")
+            print(f"   ✅ Screenshot saved as '{store.root}/{record['path']}'")
             time.sleep(2)
             
             # Step 7: Test form interactions (if any exist)
@@ -0,0 +1,186 @@
+"""
+Visual Regression for FriendFilter.com pages
+Compares in-memory screenshots with per-browser, per-viewport baselines using a byte-equality precheck and a NumPy pixel diff
+"""
+
+import io
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+from artifact_store import ArtifactStore, write_atomic
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # Optional: only the visual category needs them
+    np = None
+    Image = None
+
+
+# (x, y, width, height) rectangles ignored by the pixel diff
+Region = Tuple[int, int, int, int]
+
+
+def require_visual_dependencies():
+    """Fail with an install hint when NumPy or Pillow is missing"""
+    if np is None or Image is None:
+        raise RuntimeError("Visual regression needs NumPy and Pillow: python3 -m pip install numpy pillow")
+
+
+def decode_png(data: bytes):
+    """PNG bytes to an HxWx3 uint8 array"""
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGB"))
+
+
+def encode_png(pixels) -> bytes:
+    """HxWx3 uint8 array to PNG bytes"""
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def luminance(pixels):
+    """Per-pixel luma (BT.601) as float32"""
+    return pixels[..., 0] * 0.299 + pixels[..., 1] * 0.587 + pixels[..., 2] * 0.114
+
+
+def _neighbourhood_range(values):
+    """Min and max of each pixel's 3x3 neighbourhood, computed with shifted views"""
+    padded = np.pad(values, 1, mode="edge")
+    height, width = values.shape
+    shifted = np.stack([
+        padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3)
+    ])
+    return shifted.min(axis=0), shifted.max(axis=0)
+
+
+def diff_mask(actual, baseline, threshold: float = 0.1, antialiasing: bool = True,
+              mask_regions: Sequence[Region] = ()):
+    """Boolean HxW array of pixels that differ beyond threshold (0-1 of the channel range)"""
+    actual_f = actual.astype(np.float32)
+    baseline_f = baseline.astype(np.float32)
+    changed = np.abs(actual_f - baseline_f).max(axis=2) > threshold * 255
+
+    if antialiasing and changed.any():
+        # An anti-aliased edge pixel is an intermediate shade strictly between the darkest and brightest
+        # neighbours of the other image; a real change (text removed, colour swapped) hits an extreme
+        actual_y, baseline_y = luminance(actual_f), luminance(baseline_f)
+        baseline_min, baseline_max = _neighbourhood_range(baseline_y)
+        actual_min, actual_max = _neighbourhood_range(actual_y)
+        antialiased = (
+            ((actual_y > baseline_min) & (actual_y < baseline_max))
+            | ((baseline_y > actual_min) & (baseline_y < actual_max))
+        )
+        changed &= ~antialiased
+
+    for x, y, width, height in mask_regions:
+        changed[max(0, y):y + height, max(0, x):x + width] = False
+    return changed
+
+
+def render_diff(baseline, changed):
+    """Faded grayscale baseline with differing pixels painted red"""
+    faded = (luminance(baseline.astype(np.float32)) * 0.3 + 178).astype(np.uint8)
+    image = np.repeat(faded[..., None], 3, axis=2)
+    image[changed] = (255, 0, 0)
+    return image
+
+
+class VisualRegression:
+    """Screenshot comparisons against baselines stored per browser and viewport"""
+
+    def __init__(self, directory: str = "visual", threshold: float = 0.1, max_diff_ratio: float = 0.001,
+                 update: bool = False, store: Optional[ArtifactStore] = None):
+        self.directory = directory
+        self.threshold = threshold
+        self.max_diff_ratio = max_diff_ratio
+        self.update = update
+        self.store = store
+
+    def baseline_path(self, name: str, browser: str, viewport: Dict) -> str:
+        """e.g. visual/baselines/chromium/1920x1080/landing.png"""
+        return os.path.join(self.directory, "baselines", browser, f"{viewport['width']}x{viewport['height']}",
+                            f"{name}.png")
+
+    def diff_path(self, name: str, browser: str, viewport: Dict, kind: str = "diff") -> str:
+        """Where a failing comparison's actual/diff image goes"""
+        return os.path.join(self.directory, "diffs", browser, f"{viewport['width']}x{viewport['height']}",
+                            f"{name}.{kind}.png")
+
+    def capture(self, page, full_page: bool = False, mask_selectors: Sequence[str] = ()) -> bytes:
+        """Screenshot into memory; masked elements are painted over so dynamic content can't differ"""
+        return page.screenshot(
+            full_page=full_page,
+            animations="disabled",
+            caret="hide",
+            mask=[page.locator(selector) for selector in mask_selectors],
+        )
+
+    def check(self, page, name: str, browser: str = "chromium", full_page: bool = False,
+              mask_selectors: Sequence[str] = (), mask_regions: Sequence[Region] = (), test: str = "adhoc") -> Dict:
+        """Capture the page and compare it with its baseline (writing the baseline when there is none)"""
+        require_visual_dependencies()
+        viewport = page.viewport_size or {"width": 0, "height": 0}
+        actual = self.capture(page, full_page, mask_selectors)
+        baseline_path = self.baseline_path(name, browser, viewport)
+
+        if self.update or not os.path.exists(baseline_path):
+            status = "updated" if os.path.exists(baseline_path) else "new"
+            write_atomic(baseline_path, actual)
+            return {"name": name, "status": status, "baseline": baseline_path}
+
+        with open(baseline_path, "rb") as f:
+            baseline = f.read()
+        result = self.compare(actual, baseline, mask_regions)
+        result.update(name=name, baseline=baseline_path)
+
+        if result["status"] == "mismatch":
+            self._save_failure(actual, result.pop("diff_png", None), name, browser, viewport, test, result)
+        return result
+
+    def _save_failure(self, actual: bytes, diff_png: Optional[bytes], name: str, browser: str, viewport: Dict,
+                      test: str, result: Dict):
+        """Keep a mismatch's actual and diff images, in the artifact store when one is configured"""
+        if self.store is None:
+            write_atomic(self.diff_path(name, browser, viewport, "actual"), actual)
+            if diff_png:
+                write_atomic(self.diff_path(name, browser, viewport), diff_png)
+                result["diff"] = self.diff_path(name, browser, viewport)
+            return
+        label = f"{name}-{browser}-{viewport['width']}x{viewport['height']}"
+        self.store.put(actual, "screenshot", test, f"{label}.actual")
+        if diff_png:
+            record = self.store.put(diff_png, "screenshot", test, f"{label}.diff")
+            result["diff"] = os.path.join(self.store.root, record["path"])
+
+    def compare(self, actual: bytes, baseline: bytes, mask_regions: Sequence[Region] = ()) -> Dict:
+        """Compare two PNGs; the diff image is only rendered for mismatches"""
+        # Identical encodings of identical frames skip decoding entirely
+        if actual == baseline:
+            return {"status": "identical", "diff_ratio": 0.0}
+
+        actual_pixels, baseline_pixels = decode_png(actual), decode_png(baseline)
+        if actual_pixels.shape != baseline_pixels.shape:
+            return {"status": "mismatch", "reason": "size changed", "diff_ratio": 1.0,
+                    "size": list(actual_pixels.shape[:2]), "baseline_size": list(baseline_pixels.shape[:2])}
+
+        changed = diff_mask(actual_pixels, baseline_pixels, self.threshold, mask_regions=mask_regions)
+        ratio = float(changed.mean())
+        result = {"diff_pixels": int(changed.sum()), "diff_ratio": round(ratio, 6)}
+        if ratio <= self.max_diff_ratio:
+            result["status"] = "match"
+        else:
+            result["status"] = "mismatch"
+            result["diff_png"] = encode_png(render_diff(baseline_pixels, changed))
+        return result
+
+
+def format_visual_result(result: Dict) -> str:
+    """One line per comparison"""
+    icons = {"identical": "🟰", "match": "✅", "new": "🆕", "updated": "♻️ ", "mismatch": "❌"}
+    line = f"{icons.get(result['status'], '•')} {result['name']}: {result['status']}"
+    if "diff_ratio" in result and result["status"] != "identical":
+        line += f" ({result['diff_ratio'] * 100:.3f}% pixels)"
+    if result.get("diff"):
+        line += f" → {result['diff']}"
+    return line